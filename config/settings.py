@@ -3,9 +3,11 @@ Django settings for Meal Planner.
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -28,13 +30,63 @@ CSRF_TRUSTED_ORIGINS = [
 
 # API Keys
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+# Shared Anthropic client (recipes/services/ai_client.py)
+ANTHROPIC_MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "10"))
+ANTHROPIC_TIMEOUT = float(os.getenv("ANTHROPIC_TIMEOUT", "60"))
+ANTHROPIC_CONNECT_TIMEOUT = float(os.getenv("ANTHROPIC_CONNECT_TIMEOUT", "5"))
+ANTHROPIC_MAX_RETRIES = int(os.getenv("ANTHROPIC_MAX_RETRIES", "2"))
+# "stub" serves canned responses from a local server (tests, benchmarks)
+ANTHROPIC_TRANSPORT = os.getenv("ANTHROPIC_TRANSPORT", "")
+ANTHROPIC_STUB_LATENCY = float(os.getenv("ANTHROPIC_STUB_LATENCY", "0"))
 UNSPLASH_ACCESS_KEY = os.getenv("UNSPLASH_ACCESS_KEY", "")
 
+# Cache for AI recipe generation and URL import results (0 disables)
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", str(30 * 24 * 3600)))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "5000"))
+
+# Largest page URL import will download; anything beyond is ignored
+URL_IMPORT_MAX_BYTES = int(os.getenv("URL_IMPORT_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# Max concurrent Anthropic calls while generating a batch of recipes
+AI_GENERATION_CONCURRENCY = int(os.getenv("AI_GENERATION_CONCURRENCY", "4"))
+
+# Background jobs (manage.py run_workers)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_RETRY_BACKOFF = int(os.getenv("JOB_RETRY_BACKOFF", "10"))  # seconds, doubles
+# Workers touch their running jobs this often; a job untouched for
+# JOB_STALE_AFTER seconds lost its worker and is requeued
+JOB_HEARTBEAT_INTERVAL = int(os.getenv("JOB_HEARTBEAT_INTERVAL", "30"))
+JOB_STALE_AFTER = int(os.getenv("JOB_STALE_AFTER", "180"))
+
 # VAPID keys for push notifications
 VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY", "")
 VAPID_PUBLIC_KEY = os.getenv("VAPID_PUBLIC_KEY", "")
 VAPID_ADMIN_EMAIL = os.getenv("VAPID_ADMIN_EMAIL", "mailto:admin@mealplanner.app")
 
+# Dinner reminder dispatch (manage.py send_dinner_reminders)
+PUSH_WORKERS = int(os.getenv("PUSH_WORKERS", "8"))
+PUSH_TIMEOUT = float(os.getenv("PUSH_TIMEOUT", "10"))  # seconds per push service
+
+# Dinner reminder scheduler (manage.py reminder_scheduler)
+REMINDER_GRACE = int(os.getenv("REMINDER_GRACE", "1800"))  # still send if this late
+REMINDER_REFRESH_INTERVAL = int(os.getenv("REMINDER_REFRESH_INTERVAL", "3600"))
+
+# Log requests over their query budget (recipes/utils/queries.py)
+QUERY_BUDGET_LOGGING = os.getenv("QUERY_BUDGET_LOGGING", "False") == "True"
+QUERY_DUPLICATE_LIMIT = int(os.getenv("QUERY_DUPLICATE_LIMIT", "5"))
+
+# Server-Timing headers and on-demand request profiling (recipes/middleware.py).
+# Off by default in production: the header shows any client where time goes
+SERVER_TIMING = os.getenv("SERVER_TIMING", str(DEBUG)) == "True"
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")  # inside media storage
+
+# /metrics: SQLite file every process on the host adds its metrics to
+# (empty disables collection), and an optional bearer token for scrapers
+METRICS_DB = os.getenv("METRICS_DB", "")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
 
 # Application definition
 
@@ -53,10 +105,16 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Inactive unless QUERY_BUDGET_LOGGING; first, so session queries count
+    "recipes.middleware.QueryBudgetMiddleware",
+    # Inactive unless METRICS_DB is set
+    "recipes.middleware.MetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "recipes.middleware.ServerTimingMiddleware",
+    "recipes.middleware.HouseholdMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
@@ -66,7 +124,8 @@ ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Django templates, with rendering time reported in Server-Timing
+        "BACKEND": "recipes.utils.timing.TimedDjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -75,6 +134,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "recipes.context_processors.fragment_cache",
             ],
         },
     },
@@ -128,6 +188,9 @@ STATICFILES_DIRS = [BASE_DIR / "static"] if (BASE_DIR / "static").exists() else
 STATIC_ROOT = BASE_DIR / "staticfiles"
 if not DEBUG:
     STORAGES = {
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+        },
         "staticfiles": {
             "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
         },
@@ -138,6 +201,45 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
 
+# Cache shared by every process on the host: "file" (a folder at
+# CACHE_LOCATION, culled at most once a minute, see recipes.utils.cache) or
+# "db" (a table; run createcachetable), where every cache read is a query
+# on the main database. "locmem" is per process, so one worker's
+# invalidations never reach the others.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem" if DEBUG else "file")
+CACHE_BACKENDS = {
+    "file": (
+        "recipes.utils.cache.FileBasedCache",
+        os.path.join(tempfile.gettempdir(), "meal-planner-cache"),
+    ),
+    "db": ("django.core.cache.backends.db.DatabaseCache", "recipes_cache"),
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "meal-planner"),
+}
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}, not {CACHE_BACKEND!r}"
+    )
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND][0],
+        "LOCATION": os.getenv("CACHE_LOCATION", CACHE_BACKENDS[CACHE_BACKEND][1]),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "50000"))},
+    }
+}
+
+# Seconds to cache each user's household membership (0 disables). Only
+# enable with a cache shared by every worker, or invalidation won't reach them.
+HOUSEHOLD_CACHE_TIMEOUT = int(os.getenv("HOUSEHOLD_CACHE_TIMEOUT", "0"))
+
+# Seconds to keep rendered day cards, recipe cards and the template picker
+# (0 disables). Keys carry a per-household version, see recipes.utils.fragments.
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv("FRAGMENT_CACHE_TIMEOUT", "3600"))
+
+# Answer unchanged week, shop and recipe pages with 304 Not Modified, using
+# ETags built from the same versions (see recipes.utils.conditional)
+CONDITIONAL_GET = os.getenv("CONDITIONAL_GET", "True") == "True"
+
+
 # Default primary key field type
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -7,3 +7,6 @@ class RecipesConfig(AppConfig):
 
     def ready(self):
         import recipes.signals  # noqa: F401
+        from .services import job_handlers
+
+        job_handlers.register()
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.utils.functional import lazy
+
+from .utils.fragments import fragment_version
+
+
+def fragment_cache(request):
+    """Timeout and version for the templates' {% cache %} blocks.
+
+    The version is only looked up when a template uses it. Without a
+    household the timeout is 0, so nothing is cached.
+    """
+    household = getattr(request, "household", None)
+    if household is None or not settings.FRAGMENT_CACHE_TIMEOUT:
+        return {"fragment_timeout": 0, "fragment_version": ""}
+    return {
+        "fragment_timeout": settings.FRAGMENT_CACHE_TIMEOUT,
+        "fragment_version": lazy(fragment_version, str)(household.pk),
+    }
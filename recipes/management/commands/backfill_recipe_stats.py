@@ -0,0 +1,74 @@
+"""Management command to rebuild the denormalized recipe cooking stats.
+
+Recomputes every RecipeStats and UserRecipeStats row from CookingNote with
+grouped queries. Safe to re-run; use it after bulk edits that bypass the
+CookingNote signals.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+
+from recipes.models import CookingNote, RecipeStats, UserRecipeStats
+
+
+def _grouped_stats(*group_fields):
+    """Yield CookingStats values for CookingNote grouped by the given fields."""
+    latest = CookingNote.objects.filter(
+        **{field: OuterRef(field) for field in group_fields}
+    ).order_by("-cooked_date", "-pk")
+    rows = (
+        CookingNote.objects.order_by()
+        .values(*group_fields)
+        .annotate(
+            rating_sum=Sum("rating"),
+            rating_count=Count("rating"),
+            cook_count=Count("pk"),
+            last_cooked_date=Max("cooked_date"),
+            last_would_make_again=Subquery(latest.values("would_make_again")[:1]),
+        )
+    )
+    for row in rows.iterator():
+        rating_sum = row["rating_sum"] or 0
+        row["rating_sum"] = rating_sum
+        row["average_rating"] = (
+            rating_sum / row["rating_count"] if row["rating_count"] else None
+        )
+        yield row
+
+
+class Command(BaseCommand):
+    help = "Rebuild RecipeStats and UserRecipeStats from cooking notes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per bulk_create batch",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            RecipeStats.objects.all().delete()
+            UserRecipeStats.objects.all().delete()
+            recipe_stats = RecipeStats.objects.bulk_create(
+                (RecipeStats(**row) for row in _grouped_stats("recipe_id")),
+                batch_size=batch_size,
+            )
+            user_stats = UserRecipeStats.objects.bulk_create(
+                (
+                    UserRecipeStats(**row)
+                    for row in _grouped_stats("recipe_id", "user_id")
+                ),
+                batch_size=batch_size,
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt stats for {len(recipe_stats)} recipe(s) "
+                f"and {len(user_stats)} user/recipe pair(s)."
+            )
+        )
@@ -0,0 +1,225 @@
+"""Management command to benchmark the app's main pages and HTMX endpoints.
+
+Seeds a deterministic dataset (or uses one created by DatasetSeeder with
+--dataset), then times each scenario as a logged-in household member. It
+reports p50/p95/p99 latency, query counts and allocated memory. Everything
+runs in a transaction that is rolled back, so benchmarks never leave data
+behind. Save a run with --output and pass it as --baseline on another
+commit to compare the two.
+"""
+
+import json
+import platform
+import subprocess
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from recipes.utils.benchmark import (
+    SCENARIOS,
+    BenchmarkContext,
+    compare,
+    dataset_user,
+    run_scenario,
+)
+from recipes.utils.seeding import DatasetSeeder
+
+BENCHMARK_PREFIX = "bench"
+
+
+class Command(BaseCommand):
+    help = "Benchmark key pages against a seeded dataset."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenarios",
+            nargs="*",
+            choices=list(SCENARIOS),
+            default=list(SCENARIOS),
+            help="Scenarios to run (default: all)",
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=50, help="Timed requests per scenario"
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=5, help="Untimed requests sent first"
+        )
+        parser.add_argument(
+            "--recipes", type=int, default=200, help="Recipes per seeded household"
+        )
+        parser.add_argument(
+            "--households", type=int, default=1, help="Households to seed"
+        )
+        parser.add_argument(
+            "--members", type=int, default=2, help="Members per seeded household"
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed for the dataset"
+        )
+        parser.add_argument(
+            "--dataset",
+            metavar="PREFIX",
+            help="Benchmark an existing seeded dataset instead of seeding one",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file")
+        parser.add_argument(
+            "--baseline", help="Compare against results saved with --output"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Percent slowdown counted as a regression",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error if any metric regressed",
+        )
+        parser.add_argument(
+            "--format", choices=["table", "json"], default="table", help="Output"
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+
+        # Let the test client in, and render {% static %} without a manifest
+        overrides = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            STORAGES={
+                **settings.STORAGES,
+                "staticfiles": {
+                    "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+                },
+            },
+        )
+        with overrides, transaction.atomic():
+            results = self.run(options)
+            transaction.set_rollback(True)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+
+        rows = (
+            compare(results["scenarios"], baseline["scenarios"], options["threshold"])
+            if baseline
+            else []
+        )
+
+        if options["format"] == "json":
+            self.stdout.write(json.dumps({**results, "comparison": rows}, indent=2))
+        else:
+            self.write_table(results)
+            if baseline:
+                self.write_comparison(rows, baseline["meta"])
+
+        regressions = [row for row in rows if row["regressed"]]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} metric(s) regressed.")
+
+    def run(self, options):
+        if options["dataset"]:
+            found = dataset_user(options["dataset"])
+            if found is None:
+                raise CommandError(f"No dataset with prefix {options['dataset']!r}.")
+            dataset = {"prefix": options["dataset"]}
+        else:
+            dataset = {
+                "seed": options["seed"],
+                "households": options["households"],
+                "members": options["members"],
+                "recipes": options["recipes"],
+            }
+            self.stdout.write("Seeding benchmark dataset...")
+            DatasetSeeder(seed=options["seed"], prefix=BENCHMARK_PREFIX).seed(
+                households=options["households"],
+                members=options["members"],
+                recipes=options["recipes"],
+            )
+            found = dataset_user(BENCHMARK_PREFIX)
+
+        user, household = found
+        ctx = BenchmarkContext(user, household)
+        client = Client()
+        client.force_login(user)
+
+        scenarios = {}
+        for name in options["scenarios"]:
+            self.stdout.write(f"Running {name}...")
+            scenarios[name] = run_scenario(
+                client,
+                SCENARIOS[name][1],
+                ctx,
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+            )
+
+        return {
+            "meta": {
+                "commit": self.git_commit(),
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "dataset": dataset,
+            },
+            "scenarios": scenarios,
+        }
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                cwd=settings.BASE_DIR,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    def write_table(self, results):
+        meta = results["meta"]
+        self.stdout.write(
+            f"\nCommit {meta['commit'] or '?'} on {meta['database']}, "
+            f"dataset {meta['dataset']}"
+        )
+        header = (
+            f"{'scenario':<16}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'queries':>9}{'peak KiB':>10}  status"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, result in results["scenarios"].items():
+            t = result["time_ms"]
+            q = result["queries"]
+            queries = (
+                str(q["max"]) if q["min"] == q["max"] else f"{q['min']}-{q['max']}"
+            )
+            self.stdout.write(
+                f"{name:<16}{t['p50']:>9.1f}{t['p95']:>9.1f}{t['p99']:>9.1f}"
+                f"{queries:>9}{result['memory_kib']['peak']:>10.1f}  "
+                f"{','.join(map(str, result['status_codes']))}"
+            )
+
+    def write_comparison(self, rows, baseline_meta):
+        self.stdout.write(f"\nCompared with {baseline_meta.get('commit') or '?'}:")
+        for row in rows:
+            line = (
+                f"  {row['scenario']:<16}{row['metric']:<18}"
+                f"{row['before']:>10.1f} -> {row['after']:<10.1f}"
+                f"{row['change_pct']:+.1f}%"
+            )
+            if row["regressed"]:
+                self.stdout.write(self.style.ERROR(line + "  REGRESSION"))
+            else:
+                self.stdout.write(line)
@@ -0,0 +1,31 @@
+"""Management command to rebuild the recipe full-text search index.
+
+Regenerates every RecipeSearchDocument from the recipes and their
+structured ingredients; the database-side index follows automatically.
+Use it after bulk edits that bypass the model signals.
+"""
+
+from django.core.management.base import BaseCommand
+
+from recipes.models import Recipe, refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the recipe full-text search documents."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Recipes to reindex per batch",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        recipe_ids = list(Recipe.objects.order_by("pk").values_list("pk", flat=True))
+
+        for start in range(0, len(recipe_ids), batch_size):
+            refresh_search_documents(recipe_ids[start : start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {len(recipe_ids)} recipe(s)."))
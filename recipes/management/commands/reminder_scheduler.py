@@ -0,0 +1,51 @@
+"""Management command to run the dinner reminder scheduler.
+
+Keeps every user's next reminder in memory and sends each one at its
+reminder_time until SIGTERM/SIGINT. Reminders are logged in ReminderLog,
+so restarting the process (or also running send_dinner_reminders) never
+sends a user a second reminder the same day.
+"""
+
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes.services.reminder_scheduler import ReminderScheduler
+
+
+class Command(BaseCommand):
+    help = "Run the dinner reminder scheduler."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=30.0,
+            help="Seconds between checks for preference changes",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send the reminders due now and exit",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.VAPID_PRIVATE_KEY or not settings.VAPID_PUBLIC_KEY:
+            self.stdout.write(
+                self.style.WARNING("VAPID keys not configured. Skipping.")
+            )
+            return
+
+        scheduler = ReminderScheduler(poll_interval=options["poll_interval"])
+        if options["once"]:
+            sent = scheduler.tick()
+        else:
+            stop_event = threading.Event()
+            if threading.current_thread() is threading.main_thread():
+                for sig in (signal.SIGTERM, signal.SIGINT):
+                    signal.signal(sig, lambda *_: stop_event.set())
+            sent = scheduler.run(stop_event)
+
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} dinner reminders"))
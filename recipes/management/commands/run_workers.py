@@ -0,0 +1,79 @@
+"""Management command to run the background job workers.
+
+Starts JOB_WORKERS threads that claim and run queued jobs (AI generation,
+URL imports, recipe batches) until SIGTERM/SIGINT, finishing the job in
+hand before exiting. Jobs left running by a crashed worker are requeued
+once they miss their heartbeats (see JobService.work).
+"""
+
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from recipes.services import JobService
+
+
+class Command(BaseCommand):
+    help = "Run background job workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker threads (default: JOB_WORKERS)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"] or settings.JOB_WORKERS)
+        poll_interval = options["poll_interval"]
+        burst = options["burst"]
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        stop_event = threading.Event()
+
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, lambda *_: stop_event.set())
+
+        if workers == 1:
+            processed = JobService.work(f"{prefix}:0", stop_event, poll_interval, burst)
+        else:
+            counts = [0] * workers
+
+            def run(index):
+                try:
+                    counts[index] = JobService.work(
+                        f"{prefix}:{index}", stop_event, poll_interval, burst
+                    )
+                finally:
+                    connection.close()
+
+            threads = [
+                threading.Thread(target=run, args=(i,), name=f"job-worker-{i}")
+                for i in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                # join() with a timeout so the main thread still handles signals
+                while thread.is_alive():
+                    thread.join(timeout=1)
+            processed = sum(counts)
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)."))
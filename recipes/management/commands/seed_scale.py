@@ -0,0 +1,126 @@
+"""Management command to load a large synthetic dataset for scale testing.
+
+Generates households of members with recipes, structured ingredients, tags,
+cooking history, meal plan calendars, templates and shopping lists. The
+same --seed and sizes always produce the same data. Rows are written with
+bulk_create and committed one batch of households at a time.
+"""
+
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.utils.seeding import DatasetSeeder
+
+
+class Command(BaseCommand):
+    help = "Seed a large deterministic dataset for load and scale testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--households", type=int, default=100, help="Households to create"
+        )
+        parser.add_argument(
+            "--members", type=int, default=2, help="Users per household"
+        )
+        parser.add_argument(
+            "--recipes", type=int, default=200, help="Recipes per household"
+        )
+        parser.add_argument(
+            "--ingredients",
+            type=int,
+            default=8,
+            help="Structured ingredient lines per recipe",
+        )
+        parser.add_argument(
+            "--notes", type=int, default=2, help="Average cooking notes per recipe"
+        )
+        parser.add_argument(
+            "--plan-days",
+            type=int,
+            default=28,
+            help="Days of meal plans per household, half before today",
+        )
+        parser.add_argument(
+            "--shopping-items",
+            type=int,
+            default=20,
+            help="Shopping list items per household",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed for the dataset"
+        )
+        parser.add_argument(
+            "--prefix",
+            default="seed",
+            help="Username prefix identifying the dataset",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per bulk_create batch"
+        )
+        parser.add_argument(
+            "--password",
+            help="Password for every seeded user (default: unusable)",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete the existing dataset with this prefix first",
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if options["clear"]:
+            started = time.monotonic()
+            deleted = DatasetSeeder.clear(prefix)
+            self.stdout.write(
+                f"Deleted {deleted} {prefix!r} users and their data "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+        elif User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(
+                f"A dataset with prefix {prefix!r} already exists. "
+                "Use --clear to replace it or --prefix to seed another."
+            )
+
+        households = options["households"]
+        if households < 1:
+            return
+
+        started = time.monotonic()
+
+        def progress(done, total):
+            self.stdout.write(
+                f"  {done}/{total} households ({time.monotonic() - started:.1f}s)"
+            )
+
+        seeder = DatasetSeeder(
+            seed=options["seed"],
+            prefix=prefix,
+            batch_size=options["batch_size"],
+            password=options["password"],
+        )
+        seeder.seed(
+            households=households,
+            members=options["members"],
+            recipes=options["recipes"],
+            ingredients_per_recipe=options["ingredients"],
+            notes_per_recipe=options["notes"],
+            plan_days=options["plan_days"],
+            shopping_items=options["shopping_items"],
+            progress=progress,
+        )
+
+        elapsed = time.monotonic() - started
+        total = sum(seeder.counts.values())
+        for name, count in sorted(seeder.counts.items()):
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {total} rows in {elapsed:.1f}s "
+                f"({total / max(elapsed, 0.001):.0f} rows/s)"
+            )
+        )
+        if options["password"]:
+            self.stdout.write(f"Log in as {prefix}_000000_0 to browse the data.")
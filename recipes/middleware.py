@@ -0,0 +1,161 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .models.household import resolve_household
+from .utils import metrics
+from .utils.profiling import StackSampler
+from .utils.queries import QUERY_BUDGETS, QueryRecorder
+from .utils.timing import RequestTimer, timed
+
+logger = logging.getLogger(__name__)
+
+
+class HouseholdMiddleware:
+    """Attach the signed-in user's household to the request as request.household.
+
+    Resolved once per request (one select_related query, or a cache hit), so
+    views don't each pay for user.household_membership.household.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with timed("household"):
+            request.household = resolve_household(request.user)
+        return self.get_response(request)
+
+
+class QueryBudgetMiddleware:
+    """Log requests that go over their view's query budget or repeat a query.
+
+    Opt-in with QUERY_BUDGET_LOGGING. A warning is logged when a view in
+    QUERY_BUDGETS runs more queries than its budget, or when any request
+    runs the same SQL template more than QUERY_DUPLICATE_LIMIT times.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_LOGGING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.duplicate_limit = settings.QUERY_DUPLICATE_LIMIT
+
+    def __call__(self, request):
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        url_name = match.url_name if match else None
+        budget = QUERY_BUDGETS.get(url_name)
+        over_budget = budget is not None and recorder.count > budget
+        repeated = recorder.duplicates(self.duplicate_limit + 1)
+        if over_budget or repeated:
+            problem = (
+                f"over its budget of {budget}" if over_budget else "repeats queries"
+            )
+            logger.warning(
+                "%s %s (%s) %s: %s",
+                request.method,
+                request.path,
+                url_name,
+                problem,
+                recorder.report(self.duplicate_limit + 1),
+            )
+        return response
+
+
+class ServerTimingMiddleware:
+    """Report where each request's time went, and profile requests on demand.
+
+    With SERVER_TIMING on, every response gets a Server-Timing header with
+    the time spent on db, template, household, ai and http-out, plus the
+    total, for the browser's network panel.
+
+    With PROFILING_ENABLED on, a staff user can send an X-Profile header (or
+    a profile=1 cookie) to sample that request's stacks. The samples are
+    saved as a folded-stack file under PROFILE_DIR in media storage, and
+    the response's X-Profile-Output header names the file.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING and not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sampler = StackSampler() if self.wants_profile(request) else None
+        with RequestTimer() as timer:
+            if sampler is None:
+                response = self.get_response(request)
+            else:
+                with sampler:
+                    response = self.get_response(request)
+
+        if sampler is not None:
+            response["X-Profile-Output"] = self.save_profile(request, sampler)
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = timer.header()
+        return response
+
+    @staticmethod
+    def wants_profile(request) -> bool:
+        if not settings.PROFILING_ENABLED:
+            return False
+        if "X-Profile" not in request.headers and request.COOKIES.get("profile") != "1":
+            return False
+        return request.user.is_staff
+
+    @staticmethod
+    def save_profile(request, sampler) -> str:
+        name = (
+            f"{timezone.now():%Y%m%d-%H%M%S}-{request.method.lower()}-"
+            f"{slugify(request.path) or 'root'}.folded"
+        )
+        return default_storage.save(
+            f"{settings.PROFILE_DIR}/{name}", ContentFile(sampler.folded())
+        )
+
+
+class MetricsMiddleware:
+    """Record each request's latency and query count for /metrics.
+
+    Requests are labelled with their URL name, or "unmatched" for 404s
+    that no URL pattern matched.
+    """
+
+    def __init__(self, get_response):
+        if not metrics.store.enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count_query))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name if match else None) or "unmatched"
+        metrics.REQUEST_DURATION.observe(
+            duration, view=view, method=request.method, status=response.status_code
+        )
+        metrics.REQUEST_QUERIES.observe(queries, view=view)
+        return response
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0022_fix_ingredient_categories"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="household",
+            name="shopping_fingerprint",
+            field=models.CharField(
+                blank=True,
+                help_text="Hash of the meals the generated shopping list was last built from",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,140 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+
+
+def _grouped_stats(CookingNote, *group_fields):
+    latest = CookingNote.objects.filter(
+        **{field: OuterRef(field) for field in group_fields}
+    ).order_by("-cooked_date", "-pk")
+    rows = (
+        CookingNote.objects.order_by()
+        .values(*group_fields)
+        .annotate(
+            rating_sum=Sum("rating"),
+            rating_count=Count("rating"),
+            cook_count=Count("pk"),
+            last_cooked_date=Max("cooked_date"),
+            last_would_make_again=Subquery(latest.values("would_make_again")[:1]),
+        )
+    )
+    for row in rows.iterator():
+        rating_sum = row["rating_sum"] or 0
+        row["rating_sum"] = rating_sum
+        row["average_rating"] = (
+            rating_sum / row["rating_count"] if row["rating_count"] else None
+        )
+        yield row
+
+
+def backfill_stats(apps, schema_editor):
+    CookingNote = apps.get_model("recipes", "CookingNote")
+    RecipeStats = apps.get_model("recipes", "RecipeStats")
+    UserRecipeStats = apps.get_model("recipes", "UserRecipeStats")
+    RecipeStats.objects.bulk_create(
+        (RecipeStats(**row) for row in _grouped_stats(CookingNote, "recipe_id")),
+        batch_size=1000,
+    )
+    UserRecipeStats.objects.bulk_create(
+        (
+            UserRecipeStats(**row)
+            for row in _grouped_stats(CookingNote, "recipe_id", "user_id")
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0023_household_shopping_fingerprint"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeStats",
+            fields=[
+                ("rating_sum", models.PositiveIntegerField(default=0)),
+                ("rating_count", models.PositiveIntegerField(default=0)),
+                ("average_rating", models.FloatField(blank=True, null=True)),
+                ("cook_count", models.PositiveIntegerField(default=0)),
+                ("last_cooked_date", models.DateField(blank=True, null=True)),
+                ("last_would_make_again", models.BooleanField(blank=True, null=True)),
+                (
+                    "recipe",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="recipes.recipe",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Recipe stats",
+                "indexes": [
+                    models.Index(
+                        fields=["-average_rating"],
+                        name="recipes_rec_average_7edf4f_idx",
+                    ),
+                    models.Index(
+                        fields=["-cook_count"], name="recipes_rec_cook_co_a7b081_idx"
+                    ),
+                    models.Index(
+                        fields=["-last_cooked_date"],
+                        name="recipes_rec_last_co_68480e_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserRecipeStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rating_sum", models.PositiveIntegerField(default=0)),
+                ("rating_count", models.PositiveIntegerField(default=0)),
+                ("average_rating", models.FloatField(blank=True, null=True)),
+                ("cook_count", models.PositiveIntegerField(default=0)),
+                ("last_cooked_date", models.DateField(blank=True, null=True)),
+                ("last_would_make_again", models.BooleanField(blank=True, null=True)),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_stats",
+                        to="recipes.recipe",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recipe_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "User recipe stats",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "recipe"), name="unique_user_recipe_stats"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,145 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:23
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+
+SQLITE_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE recipes_recipe_fts USING fts5(
+        title,
+        body,
+        content='recipes_recipesearchdocument',
+        content_rowid='recipe_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER recipes_recipe_fts_insert
+    AFTER INSERT ON recipes_recipesearchdocument BEGIN
+        INSERT INTO recipes_recipe_fts(rowid, title, body)
+        VALUES (new.recipe_id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER recipes_recipe_fts_delete
+    AFTER DELETE ON recipes_recipesearchdocument BEGIN
+        INSERT INTO recipes_recipe_fts(recipes_recipe_fts, rowid, title, body)
+        VALUES ('delete', old.recipe_id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER recipes_recipe_fts_update
+    AFTER UPDATE ON recipes_recipesearchdocument BEGIN
+        INSERT INTO recipes_recipe_fts(recipes_recipe_fts, rowid, title, body)
+        VALUES ('delete', old.recipe_id, old.title, old.body);
+        INSERT INTO recipes_recipe_fts(rowid, title, body)
+        VALUES (new.recipe_id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS recipes_recipe_fts_insert",
+    "DROP TRIGGER IF EXISTS recipes_recipe_fts_delete",
+    "DROP TRIGGER IF EXISTS recipes_recipe_fts_update",
+    "DROP TABLE IF EXISTS recipes_recipe_fts",
+]
+
+POSTGRES_INDEX_SQL = [
+    """
+    ALTER TABLE recipes_recipesearchdocument
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A')
+        || setweight(to_tsvector('simple', body), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX recipes_recipesearchdocument_vector_gin
+    ON recipes_recipesearchdocument USING gin (search_vector)
+    """,
+]
+
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS recipes_recipesearchdocument_vector_gin",
+    "ALTER TABLE recipes_recipesearchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_INDEX_SQL)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_INDEX_SQL)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_DROP_SQL)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_DROP_SQL)
+
+
+def backfill_documents(apps, schema_editor):
+    Recipe = apps.get_model("recipes", "Recipe")
+    RecipeIngredient = apps.get_model("recipes", "RecipeIngredient")
+    RecipeSearchDocument = apps.get_model("recipes", "RecipeSearchDocument")
+
+    names = defaultdict(list)
+    for recipe_id, name in (
+        RecipeIngredient.objects.order_by("order", "pk")
+        .values_list("recipe_id", "ingredient__name")
+        .iterator()
+    ):
+        names[recipe_id].append(name)
+
+    RecipeSearchDocument.objects.bulk_create(
+        (
+            RecipeSearchDocument(
+                recipe_id=pk,
+                title=title,
+                body="\n".join([ingredients_text, *names[pk]]),
+            )
+            for pk, title, ingredients_text in Recipe.objects.values_list(
+                "pk", "title", "ingredients_text"
+            ).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0024_recipe_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeSearchDocument",
+            fields=[
+                (
+                    "recipe",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="recipes.recipe",
+                    ),
+                ),
+                ("title", models.TextField(blank=True)),
+                ("body", models.TextField(blank=True)),
+            ],
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_household_recipes(apps, schema_editor):
+    HouseholdMembership = apps.get_model("recipes", "HouseholdMembership")
+    HouseholdRecipe = apps.get_model("recipes", "HouseholdRecipe")
+    MealPlan = apps.get_model("recipes", "MealPlan")
+    Recipe = apps.get_model("recipes", "Recipe")
+
+    rows = {}
+    households = dict(
+        HouseholdMembership.objects.values_list("user_id", "household_id")
+    )
+    for recipe_id, user_id in Recipe.objects.filter(shared=True).values_list(
+        "pk", "user_id"
+    ):
+        household_id = households.get(user_id)
+        if household_id is not None:
+            rows[(household_id, recipe_id)] = {"shared": True, "planned": False}
+    for key in (
+        MealPlan.objects.order_by().values_list("household_id", "recipe_id").distinct()
+    ):
+        rows.setdefault(key, {"shared": False, "planned": False})["planned"] = True
+
+    HouseholdRecipe.objects.bulk_create(
+        (
+            HouseholdRecipe(household_id=household_id, recipe_id=recipe_id, **flags)
+            for (household_id, recipe_id), flags in rows.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0025_recipe_search_document"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HouseholdRecipe",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("shared", models.BooleanField(default=False)),
+                ("planned", models.BooleanField(default=False)),
+                (
+                    "household",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recipe_links",
+                        to="recipes.household",
+                    ),
+                ),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="household_links",
+                        to="recipes.recipe",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["household", "shared"],
+                        name="recipes_hou_househo_1bacc3_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("household", "recipe"), name="unique_household_recipe"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_household_recipes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0028_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AIResponseCache",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("kind", models.CharField(max_length=30)),
+                ("response", models.JSONField()),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_used_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("expires_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["last_used_at"], name="recipes_air_last_us_f8bd00_idx"
+                    ),
+                    models.Index(
+                        fields=["expires_at"], name="recipes_air_expires_f01f94_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -1,4 +1,11 @@
-from .cooking import CookingNote
+from .ai_cache import AIResponseCache
+from .cooking import (
+    CookingNote,
+    RecipeStats,
+    UserRecipeStats,
+    refresh_recipe_stats,
+)
+from .generation import GENERATION_STATUS_CHOICES, GenerationBatch
 from .household import (
     DayComment,
     Household,
@@ -6,6 +13,7 @@ from .household import (
     generate_household_code,
     get_household,
 )
+from .jobs import JOB_STATUS_CHOICES, Job
 from .managers import (
     MealPlanManager,
     MealPlanQuerySet,
@@ -17,7 +25,7 @@ from .meal_plan import (
     MealPlan,
     MealPlannerPreferences,
 )
-from .push import PushSubscription
+from .push import PushSubscription, ReminderLog
 from .recipe import (
     INGREDIENT_CATEGORY_CHOICES,
     SOURCE_CHOICES,
@@ -28,8 +36,14 @@ from .recipe import (
     RecipeIngredient,
     Tag,
 )
+from .search import (
+    RecipeSearchDocument,
+    get_search_backend,
+    refresh_search_documents,
+)
 from .shopping import ShoppingListItem
 from .template import MealPlanTemplate, MealPlanTemplateEntry
+from .visibility import HouseholdRecipe, refresh_household_recipes
 
 __all__ = [
     # Household models
@@ -49,6 +63,21 @@ __all__ = [
     "UNIT_CHOICES",
     # Cooking
     "CookingNote",
+    "RecipeStats",
+    "UserRecipeStats",
+    "refresh_recipe_stats",
+    # Search
+    "RecipeSearchDocument",
+    "get_search_backend",
+    "refresh_search_documents",
+    # Generation
+    "GENERATION_STATUS_CHOICES",
+    "GenerationBatch",
+    # AI response cache
+    "AIResponseCache",
+    # Background jobs
+    "JOB_STATUS_CHOICES",
+    "Job",
     # Shopping
     "ShoppingListItem",
     # Meal plan
@@ -57,6 +86,10 @@ __all__ = [
     "MealPlannerPreferences",
     # Push notifications
     "PushSubscription",
+    "ReminderLog",
+    # Visibility
+    "HouseholdRecipe",
+    "refresh_household_recipes",
     # Templates
     "MealPlanTemplate",
     "MealPlanTemplateEntry",
@@ -0,0 +1,27 @@
+from django.db import models
+from django.utils import timezone
+
+
+class AIResponseCache(models.Model):
+    """A cached AI result, addressed by a hash of everything that determines it.
+
+    Keys come from AICache.key(); rows expire after AI_CACHE_TTL seconds and
+    the least recently used are evicted beyond AI_CACHE_MAX_ENTRIES.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=30)
+    response = models.JSONField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["last_used_at"]),
+            models.Index(fields=["expires_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.key[:12]}"
@@ -1,5 +1,5 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
 
 
 class CookingNote(models.Model):
@@ -29,3 +29,113 @@ class CookingNote(models.Model):
 
     def __str__(self):
         return f"{self.recipe} on {self.cooked_date}"
+
+
+class CookingStats(models.Model):
+    """Denormalized CookingNote aggregates, kept current by refresh_recipe_stats."""
+
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(null=True, blank=True)
+    cook_count = models.PositiveIntegerField(default=0)
+    last_cooked_date = models.DateField(null=True, blank=True)
+    last_would_make_again = models.BooleanField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+
+class RecipeStats(CookingStats):
+    """Cooking stats for a recipe across every user's notes."""
+
+    recipe = models.OneToOneField(
+        "Recipe",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+
+    class Meta:
+        verbose_name_plural = "Recipe stats"
+        indexes = [
+            models.Index(fields=["-average_rating"]),
+            models.Index(fields=["-cook_count"]),
+            models.Index(fields=["-last_cooked_date"]),
+        ]
+
+    def __str__(self):
+        return f"Stats for {self.recipe}"
+
+
+class UserRecipeStats(CookingStats):
+    """Cooking stats for a recipe from a single user's notes."""
+
+    recipe = models.ForeignKey(
+        "Recipe",
+        on_delete=models.CASCADE,
+        related_name="user_stats",
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="recipe_stats"
+    )
+
+    class Meta:
+        verbose_name_plural = "User recipe stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "recipe"], name="unique_user_recipe_stats"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Stats for {self.recipe} by {self.user}"
+
+
+def _aggregate_notes(notes):
+    """Return CookingStats field values for a CookingNote queryset, or None if empty."""
+    totals = notes.aggregate(
+        rating_sum=models.Sum("rating"),
+        rating_count=models.Count("rating"),
+        cook_count=models.Count("pk"),
+        last_cooked_date=models.Max("cooked_date"),
+    )
+    if not totals["cook_count"]:
+        return None
+    rating_sum = totals["rating_sum"] or 0
+    rating_count = totals["rating_count"]
+    totals["rating_sum"] = rating_sum
+    totals["average_rating"] = rating_sum / rating_count if rating_count else None
+    totals["last_would_make_again"] = (
+        notes.order_by("-cooked_date", "-pk")
+        .values_list("would_make_again", flat=True)
+        .first()
+    )
+    return totals
+
+
+def _refresh_stats_row(model, lookup, notes):
+    values = _aggregate_notes(notes)
+    if values is None:
+        # No notes left (including when the recipe itself is being deleted)
+        model.objects.filter(**lookup).delete()
+        return None
+    stats, _ = model.objects.update_or_create(**lookup, defaults=values)
+    return stats
+
+
+def refresh_recipe_stats(recipe_id, user_id=None):
+    """Recompute RecipeStats (and the user's UserRecipeStats) from CookingNote rows.
+
+    Runs in a transaction so both rows always agree with the notes table.
+    Returns the RecipeStats row, or None if the recipe has no notes.
+    """
+    notes = CookingNote.objects.filter(recipe_id=recipe_id)
+    with transaction.atomic():
+        stats = _refresh_stats_row(RecipeStats, {"recipe_id": recipe_id}, notes)
+        if user_id is not None:
+            _refresh_stats_row(
+                UserRecipeStats,
+                {"recipe_id": recipe_id, "user_id": user_id},
+                notes.filter(user_id=user_id),
+            )
+    return stats
@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+GENERATION_STATUS_CHOICES = [
+    ("pending", "Pending"),
+    ("running", "Running"),
+    ("done", "Done"),
+]
+
+
+class GenerationBatch(models.Model):
+    """A batch of AI recipes requested from the generate flow.
+
+    BatchGenerationService fills it in the background; the progress page
+    only reads the counters and the recipes saved so far.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="generation_batches"
+    )
+    preferences = models.JSONField(default=dict, blank=True)
+    total = models.PositiveIntegerField()
+    completed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    status = models.CharField(
+        max_length=10, choices=GENERATION_STATUS_CHOICES, default="pending"
+    )
+    recipes = models.ManyToManyField("Recipe", blank=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "Generation batches"
+
+    def __str__(self):
+        return f"{self.total} recipes for {self.user} ({self.status})"
+
+    @property
+    def finished(self):
+        """Recipes attempted so far, whether saved or skipped."""
+        return self.completed + self.failed
+
+    @property
+    def is_done(self):
+        return self.status == "done"
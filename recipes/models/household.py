@@ -1,7 +1,9 @@
 import random
 import string
 
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
 from django.db.models import UniqueConstraint
 
@@ -22,6 +24,11 @@ class Household(models.Model):
         User, on_delete=models.SET_NULL, null=True, related_name="created_households"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    shopping_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the meals the generated shopping list was last built from",
+    )
 
     def save(self, *args, **kwargs):
         if not self.code:
@@ -71,3 +78,44 @@ def get_household(user):
         return user.household_membership.household
     except (HouseholdMembership.DoesNotExist, AttributeError):
         return None
+
+
+_MISSING = object()
+
+
+def household_cache_key(user_id):
+    return f"household-membership:{user_id}"
+
+
+def invalidate_household_cache(user_ids):
+    """Forget cached memberships for these users (no-op when caching is off)."""
+    if settings.HOUSEHOLD_CACHE_TIMEOUT:
+        cache.delete_many([household_cache_key(user_id) for user_id in user_ids])
+
+
+def resolve_household(user):
+    """Return the user's household, loading membership and household together.
+
+    Costs at most one query, or none when HOUSEHOLD_CACHE_TIMEOUT enables the
+    cache and the membership is cached. The result is also stored on
+    user.household_membership, so later get_household(user) calls are free.
+    """
+    if not user.is_authenticated:
+        return None
+
+    timeout = settings.HOUSEHOLD_CACHE_TIMEOUT
+    key = household_cache_key(user.pk)
+    membership = cache.get(key, _MISSING) if timeout else _MISSING
+    if membership is _MISSING:
+        membership = (
+            HouseholdMembership.objects.select_related("household")
+            .filter(user_id=user.pk)
+            .first()
+        )
+        if timeout:
+            cache.set(key, membership, timeout)
+
+    if membership is not None:
+        HouseholdMembership.user.field.set_cached_value(membership, user)
+    User.household_membership.related.set_cached_value(user, membership)
+    return membership.household if membership else None
@@ -1,5 +1,6 @@
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 
@@ -13,16 +14,38 @@ class RecipeQuerySet(models.QuerySet):
         )
 
     def with_stats(self):
-        """Annotate recipes with avg_rating and note_count to avoid N+1 queries."""
-        return self.annotate(
-            avg_rating=models.Avg("cooking_notes__rating"),
-            note_count=models.Count("cooking_notes"),
+        """Annotate recipes with avg_rating, note_count and last_cooked.
+
+        Reads the denormalized RecipeStats row instead of aggregating
+        cooking_notes, and selects it so average_rating/cook_count are free.
+        """
+        return self.select_related("stats").annotate(
+            avg_rating=F("stats__average_rating"),
+            note_count=Coalesce(F("stats__cook_count"), 0),
+            last_cooked=F("stats__last_cooked_date"),
         )
 
     def for_user(self, user):
         """Filter recipes for a specific user."""
         return self.filter(user=user)
 
+    def visible_to(self, user, household=None, include_planned=False):
+        """Filter recipes the user can see: their own plus those shared into
+        their household, and optionally those on the household's meal plan.
+
+        Reads the materialized HouseholdRecipe rows, so there's no join
+        through memberships or meal plans and no need for distinct().
+        """
+        access = Q(user=user)
+        if household is not None:
+            links = household.recipe_links.all()
+            if include_planned:
+                links = links.filter(Q(shared=True) | Q(planned=True))
+            else:
+                links = links.filter(shared=True)
+            access |= Q(pk__in=links.values("recipe_id"))
+        return self.filter(access)
+
     def favourited_by_user(self, user):
         """Filter recipes favourited by a specific user."""
         return self.filter(favourited_by=user)
@@ -32,12 +55,14 @@ class RecipeQuerySet(models.QuerySet):
         return self.filter(tags__id=tag_id)
 
     def search(self, query):
-        """Search recipes by title, ingredients text, or structured ingredient names."""
-        return self.filter(
-            Q(title__icontains=query)
-            | Q(ingredients_text__icontains=query)
-            | Q(recipe_ingredients__ingredient__name__icontains=query)
-        ).distinct()
+        """Full-text search over title, ingredients text and ingredient names.
+
+        Every word must match (as a prefix). Results are annotated with
+        search_rank, higher meaning more relevant; see get_search_backend.
+        """
+        from .search import get_search_backend
+
+        return get_search_backend(self.db).search(self, query)
 
 
 class RecipeManager(models.Manager):
@@ -55,6 +80,9 @@ class RecipeManager(models.Manager):
     def for_user(self, user):
         return self.get_queryset().for_user(user)
 
+    def visible_to(self, user, household=None, include_planned=False):
+        return self.get_queryset().visible_to(user, household, include_planned)
+
     def favourited_by_user(self, user):
         return self.get_queryset().favourited_by_user(user)
 
@@ -70,9 +98,9 @@ class MealPlanQuerySet(models.QuerySet):
 
     def with_related(self):
         """Optimize queries by prefetching related objects."""
-        return self.select_related("recipe", "recipe__user").prefetch_related(
-            "recipe__tags", "recipe__cooking_notes"
-        )
+        return self.select_related(
+            "recipe", "recipe__user", "recipe__stats"
+        ).prefetch_related("recipe__tags")
 
     def for_household(self, household):
         """Filter meal plans for a specific household."""
@@ -20,3 +20,31 @@ class PushSubscription(models.Model):
 
     def __str__(self):
         return f"Push sub for {self.user.username}"
+
+
+class ReminderLog(models.Model):
+    """A dinner reminder sent to a user, so each user gets at most one a day.
+
+    claimed_by identifies the dispatch run that inserted the row, letting
+    concurrent runs tell which users they won.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="reminder_logs"
+    )
+    date = models.DateField()
+    claimed_by = models.CharField(max_length=32)
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"], name="unique_user_reminder_date"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date", "claimed_by"]),
+        ]
+
+    def __str__(self):
+        return f"Reminder for {self.user.username} on {self.date}"
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 
 from .managers import RecipeManager
@@ -192,17 +193,27 @@ class Recipe(models.Model):
         return prep + cook if (prep or cook) else None
 
     @property
-    def average_rating(self):
-        """Calculate average rating from cooking notes."""
-        notes = self.cooking_notes.exclude(rating__isnull=True)
-        if not notes.exists():
+    def cooking_stats(self):
+        """Return the denormalized RecipeStats row, or None if never cooked.
+
+        Use with_stats() / select_related("stats") to load it with the recipe.
+        """
+        try:
+            return self.stats
+        except ObjectDoesNotExist:
             return None
-        return notes.aggregate(avg=models.Avg("rating"))["avg"]
+
+    @property
+    def average_rating(self):
+        """Average rating from cooking notes (None if no rated notes)."""
+        stats = self.cooking_stats
+        return stats.average_rating if stats else None
 
     @property
     def cook_count(self):
         """Count how many times this recipe has been cooked."""
-        return self.cooking_notes.count()
+        stats = self.cooking_stats
+        return stats.cook_count if stats else 0
 
     @property
     def latest_note(self):
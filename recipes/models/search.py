@@ -0,0 +1,188 @@
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .recipe import Recipe, RecipeIngredient
+
+SEARCH_DOCUMENT_TABLE = "recipes_recipesearchdocument"
+SQLITE_FTS_TABLE = "recipes_recipe_fts"
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class RecipeSearchDocument(models.Model):
+    """Flattened searchable text for a recipe, kept current by refresh_search_documents.
+
+    The full-text index lives beside this table and is maintained by the
+    database itself: an FTS5 table plus triggers on SQLite, a generated
+    tsvector column with a GIN index on PostgreSQL (see migration 0025).
+    """
+
+    recipe = models.OneToOneField(
+        "Recipe",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    title = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"Search document for {self.recipe}"
+
+
+def _document_values(recipe_ids):
+    """Return {recipe_id: (title, body)} for the given recipes in two queries."""
+    names = defaultdict(list)
+    for recipe_id, name in (
+        RecipeIngredient.objects.filter(recipe_id__in=recipe_ids)
+        .order_by("order", "pk")
+        .values_list("recipe_id", "ingredient__name")
+    ):
+        names[recipe_id].append(name)
+
+    return {
+        pk: (title, "\n".join([ingredients_text, *names[pk]]))
+        for pk, title, ingredients_text in Recipe.objects.filter(
+            pk__in=recipe_ids
+        ).values_list("pk", "title", "ingredients_text")
+    }
+
+
+def refresh_search_documents(recipe_ids):
+    """Rebuild the RecipeSearchDocument rows for the given recipe ids.
+
+    Recipes that no longer exist simply lose their document.
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return
+    values = _document_values(recipe_ids)
+    with transaction.atomic():
+        RecipeSearchDocument.objects.filter(recipe_id__in=recipe_ids).delete()
+        RecipeSearchDocument.objects.bulk_create(
+            RecipeSearchDocument(recipe_id=pk, title=title, body=body)
+            for pk, (title, body) in values.items()
+        )
+
+
+def search_terms(query):
+    """Split a raw search string into lowercase word tokens."""
+    return TOKEN_RE.findall(query.lower())
+
+
+class SearchBackend:
+    """Base class for recipe search backends.
+
+    Subclasses implement match(), which filters a Recipe queryset to rows
+    matching every term and annotates it with a float search_rank (higher is
+    more relevant).
+    """
+
+    def search(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset.annotate(
+                search_rank=models.Value(0.0, output_field=models.FloatField())
+            ).none()
+        return self.match(queryset, terms)
+
+    def match(self, queryset, terms):
+        raise NotImplementedError
+
+
+class BasicSearchBackend(SearchBackend):
+    """Substring search for databases without a full-text index.
+
+    Matches every term against the title or body, with no ranking beyond
+    a constant search_rank so callers can order results uniformly.
+    """
+
+    def match(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(
+                models.Q(search_document__title__icontains=term)
+                | models.Q(search_document__body__icontains=term)
+            )
+        return queryset.annotate(
+            search_rank=models.Value(0.0, output_field=models.FloatField())
+        )
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """FTS5 search; every term is matched as a prefix so typeahead works."""
+
+    # bm25 column weights for (title, body)
+    WEIGHTS = (10.0, 1.0)
+
+    def match_expression(self, terms):
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def match(self, queryset, terms):
+        match = self.match_expression(terms)
+        pk_column = f'"{queryset.model._meta.db_table}"."id"'
+        weights = ", ".join(str(weight) for weight in self.WEIGHTS)
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s",
+                [match],
+            )
+        ).annotate(
+            # bm25 is lower-is-better; negate it so higher ranks sort first
+            search_rank=RawSQL(
+                f"SELECT -bm25({SQLITE_FTS_TABLE}, {weights}) "
+                f"FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {pk_column}",
+                [match],
+                output_field=models.FloatField(),
+            )
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector search against the GIN-indexed search_vector column."""
+
+    def tsquery(self, terms):
+        return " & ".join(f"{term}:*" for term in terms)
+
+    def match(self, queryset, terms):
+        tsquery = self.tsquery(terms)
+        pk_column = f'"{queryset.model._meta.db_table}"."id"'
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT recipe_id FROM {SEARCH_DOCUMENT_TABLE} "
+                "WHERE search_vector @@ to_tsquery('simple', %s)",
+                [tsquery],
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                "SELECT ts_rank(search_vector, to_tsquery('simple', %s)) "
+                f"FROM {SEARCH_DOCUMENT_TABLE} WHERE recipe_id = {pk_column}",
+                [tsquery],
+                output_field=models.FloatField(),
+            )
+        )
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend(using="default"):
+    """Return the search backend for a database alias.
+
+    settings.RECIPE_SEARCH_BACKEND (a dotted path) overrides the default,
+    which is picked from the database vendor.
+    """
+    backend_path = getattr(settings, "RECIPE_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+    vendor = connections[using].vendor
+    return VENDOR_BACKENDS.get(vendor, BasicSearchBackend)()
@@ -0,0 +1,79 @@
+from django.db import models, transaction
+
+from .household import HouseholdMembership
+from .meal_plan import MealPlan
+from .recipe import Recipe
+
+
+class HouseholdRecipe(models.Model):
+    """Materialized household -> recipe visibility, kept current by refresh_household_recipes.
+
+    A row exists while a recipe is shared into the household (its owner is a
+    member and it is marked shared) and/or assigned to one of the household's
+    meal plans. Owners always see their own recipes, so those aren't stored.
+    """
+
+    household = models.ForeignKey(
+        "Household", on_delete=models.CASCADE, related_name="recipe_links"
+    )
+    recipe = models.ForeignKey(
+        "Recipe", on_delete=models.CASCADE, related_name="household_links"
+    )
+    shared = models.BooleanField(default=False)
+    planned = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["household", "recipe"], name="unique_household_recipe"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["household", "shared"]),
+        ]
+
+    def __str__(self):
+        return f"{self.recipe} visible to {self.household}"
+
+
+def _visibility_rows(recipe_ids):
+    """Return {(household_id, recipe_id): {"shared", "planned"}} for the recipes."""
+    rows = {}
+    owners = list(
+        Recipe.objects.filter(pk__in=recipe_ids, shared=True).values_list(
+            "pk", "user_id"
+        )
+    )
+    owner_households = dict(
+        HouseholdMembership.objects.filter(
+            user_id__in={user_id for _, user_id in owners}
+        ).values_list("user_id", "household_id")
+    )
+    for recipe_id, user_id in owners:
+        household_id = owner_households.get(user_id)
+        if household_id is not None:
+            rows[(household_id, recipe_id)] = {"shared": True, "planned": False}
+
+    planned = (
+        MealPlan.objects.filter(recipe_id__in=recipe_ids)
+        .order_by()
+        .values_list("household_id", "recipe_id")
+        .distinct()
+    )
+    for key in planned:
+        rows.setdefault(key, {"shared": False, "planned": False})["planned"] = True
+    return rows
+
+
+def refresh_household_recipes(recipe_ids):
+    """Rebuild the HouseholdRecipe rows for the given recipe ids."""
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return
+    rows = _visibility_rows(recipe_ids)
+    with transaction.atomic():
+        HouseholdRecipe.objects.filter(recipe_id__in=recipe_ids).delete()
+        HouseholdRecipe.objects.bulk_create(
+            HouseholdRecipe(household_id=household_id, recipe_id=recipe_id, **flags)
+            for (household_id, recipe_id), flags in rows.items()
+        )
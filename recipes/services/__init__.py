@@ -12,9 +12,14 @@ from .ai_service import (
     AIServiceException,
     AIValidationError,
 )
+from .generation_service import BatchGenerationService
+from .ingredient_service import IngredientService
+from .job_service import JobService
 from .meal_plan_service import MealPlanService
 from .meal_planning_assistant import MealPlanningAssistantService
 from .recipe_service import RecipeService
+from .reminder_service import ReminderService
+from .shopping_service import ShoppingListService
 
 __all__ = [
     "RecipeService",
@@ -25,4 +30,9 @@ __all__ = [
     "AIValidationError",
     "AIAPIError",
     "MealPlanningAssistantService",
+    "ShoppingListService",
+    "BatchGenerationService",
+    "IngredientService",
+    "JobService",
+    "ReminderService",
 ]
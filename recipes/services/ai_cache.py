@@ -0,0 +1,155 @@
+"""
+AI Cache - Content-addressed cache for AI recipe results.
+
+This service encapsulates caching of slow, paid AI calls including:
+- Normalizing prompts and URLs so trivially different inputs share a result
+- Hashing kind, model, system prompt and input into the cache key, so a
+  prompt or model change never serves stale output
+- TTL expiry (AI_CACHE_TTL) and least-recently-used eviction beyond
+  AI_CACHE_MAX_ENTRIES
+"""
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import AIResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref"}
+
+
+class AICache:
+    """Service for caching AI responses by content hash."""
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """Collapse whitespace and case so equivalent prompts share a key."""
+        return " ".join(prompt.split()).casefold()
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Canonicalize a URL for use as a cache key.
+
+        Lowercases the scheme and host, drops the fragment, default ports,
+        trailing slashes and tracking parameters, and sorts the query.
+        """
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        if parts.port and parts.port != {"http": 80, "https": 443}.get(scheme):
+            host = f"{host}:{parts.port}"
+        query = sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not name.lower().startswith("utm_")
+            and name.lower() not in TRACKING_PARAMS
+        )
+        return urlunsplit(
+            (scheme, host, parts.path.rstrip("/") or "/", urlencode(query), "")
+        )
+
+    @staticmethod
+    def key(kind: str, model: str, system: str, value: str) -> str:
+        """SHA-256 of everything that determines the AI's answer."""
+        material = json.dumps([kind, model, system, value], ensure_ascii=False)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    @staticmethod
+    def get(key: str) -> Optional[dict]:
+        """Return the live cached response for key, recording the hit."""
+        now = timezone.now()
+        entry = (
+            AIResponseCache.objects.filter(key=key, expires_at__gt=now)
+            .values("pk", "response")
+            .first()
+        )
+        if entry is None:
+            return None
+        AIResponseCache.objects.filter(pk=entry["pk"]).update(
+            hits=F("hits") + 1, last_used_at=now
+        )
+        return entry["response"]
+
+    @staticmethod
+    def set(key: str, kind: str, response: dict) -> None:
+        """Store a response, then drop expired and least recently used rows."""
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=settings.AI_CACHE_TTL)
+        try:
+            AIResponseCache.objects.update_or_create(
+                key=key,
+                defaults={
+                    "kind": kind,
+                    "response": response,
+                    "last_used_at": now,
+                    "expires_at": expires_at,
+                },
+            )
+        except IntegrityError:
+            # Another worker stored the same key first; its answer is as good
+            return
+        AICache.evict()
+
+    @staticmethod
+    def evict() -> int:
+        """Delete expired rows and any beyond AI_CACHE_MAX_ENTRIES. Returns the count."""
+        deleted, _ = AIResponseCache.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        overflow = list(
+            AIResponseCache.objects.order_by("-last_used_at").values_list(
+                "pk", flat=True
+            )[settings.AI_CACHE_MAX_ENTRIES :]
+        )
+        if overflow:
+            deleted += AIResponseCache.objects.filter(pk__in=overflow).delete()[0]
+        return deleted
+
+    @staticmethod
+    def fetch(
+        kind: str,
+        model: str,
+        system: str,
+        value: str,
+        compute: Callable[[], dict],
+        use_cache: bool = True,
+    ) -> dict:
+        """
+        Return the cached response for the input, computing and storing it on a miss.
+
+        Args:
+            kind: Which AI operation this is (part of the key)
+            model: Model name (part of the key)
+            system: System prompt (part of the key)
+            value: Normalized input - prompt or URL
+            compute: Makes the AI call on a miss
+            use_cache: False to always call compute and skip storing, for
+                generation that must vary between calls
+
+        Returns:
+            The AI response dict
+        """
+        if not use_cache or settings.AI_CACHE_TTL <= 0:
+            return compute()
+
+        key = AICache.key(kind, model, system, value)
+        cached = AICache.get(key)
+        if cached is not None:
+            logger.debug(f"AI cache hit for {kind} {key[:12]}")
+            return cached
+
+        response = compute()
+        AICache.set(key, kind, response)
+        return response
@@ -0,0 +1,198 @@
+"""
+AI Client - Process-wide pooled Anthropic clients.
+
+This module encapsulates how the app talks to the Anthropic API including:
+- Creating one client per configuration, lazily, shared by every request
+  and worker thread so the HTTP connection pool and TLS sessions are reused
+- Pool size, timeouts and retry policy from the ANTHROPIC_* settings
+- A local stub server speaking the Messages API, selected with
+  ANTHROPIC_TRANSPORT="stub", for offline tests and benchmarks
+"""
+
+import copy
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anthropic
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_clients = {}
+_stub_server = None
+_lock = threading.Lock()
+
+STUB_RECIPE = {
+    "title": "Stub Tomato Pasta",
+    "description": "A canned recipe served by the local stub transport.",
+    "prep_time": 10,
+    "cook_time": 20,
+    "servings": 4,
+    "difficulty": "easy",
+    "ingredients": [
+        {
+            "name": "spaghetti",
+            "quantity": 400,
+            "unit": "g",
+            "category": "pantry",
+            "preparation_notes": "",
+        },
+        {
+            "name": "tomato",
+            "quantity": 4,
+            "unit": "piece",
+            "category": "produce",
+            "preparation_notes": "chopped",
+        },
+    ],
+    "steps": ["Boil the pasta.", "Simmer the tomatoes.", "Toss together."],
+}
+
+
+def get_client() -> anthropic.Anthropic:
+    """
+    Return the shared Anthropic client for the current settings.
+
+    Clients are thread-safe, so one per (API key, pool, timeout, retry)
+    configuration is created on first use and reused for the life of the
+    process.
+    """
+    base_url = None
+    if settings.ANTHROPIC_TRANSPORT == "stub":
+        base_url = get_stub_server().url
+
+    key = (
+        settings.ANTHROPIC_API_KEY,
+        base_url,
+        settings.ANTHROPIC_MAX_CONNECTIONS,
+        settings.ANTHROPIC_TIMEOUT,
+        settings.ANTHROPIC_CONNECT_TIMEOUT,
+        settings.ANTHROPIC_MAX_RETRIES,
+    )
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = _build_client(base_url)
+    return client
+
+
+def _build_client(base_url=None) -> anthropic.Anthropic:
+    limits = copy.copy(anthropic.DEFAULT_CONNECTION_LIMITS)
+    limits.max_connections = settings.ANTHROPIC_MAX_CONNECTIONS
+    limits.max_keepalive_connections = settings.ANTHROPIC_MAX_CONNECTIONS
+    timeout = anthropic.Timeout(
+        settings.ANTHROPIC_TIMEOUT, connect=settings.ANTHROPIC_CONNECT_TIMEOUT
+    )
+    return anthropic.Anthropic(
+        api_key=settings.ANTHROPIC_API_KEY,
+        base_url=base_url,
+        timeout=timeout,
+        max_retries=settings.ANTHROPIC_MAX_RETRIES,
+        http_client=anthropic.DefaultHttpxClient(limits=limits, timeout=timeout),
+    )
+
+
+def reset_clients() -> None:
+    """Close and forget every shared client (and the stub server)."""
+    global _stub_server
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        if _stub_server is not None:
+            _stub_server.stop()
+            _stub_server = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting.startswith("ANTHROPIC_"):
+        reset_clients()
+
+
+def get_stub_server() -> "StubAnthropicServer":
+    """Return the process-wide stub server, starting it on first use."""
+    global _stub_server
+    with _lock:
+        if _stub_server is None:
+            _stub_server = StubAnthropicServer(
+                latency=settings.ANTHROPIC_STUB_LATENCY
+            ).start()
+        return _stub_server
+
+
+class StubAnthropicServer:
+    """A localhost HTTP/1.1 server answering every Messages API call with a canned reply.
+
+    It keeps connections alive like the real API, so per-call overhead and
+    connection reuse can be measured without network access or API spend.
+    """
+
+    def __init__(self, text: str = None, latency: float = 0.0):
+        self.text = text if text is not None else json.dumps(STUB_RECIPE)
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self._httpd = None
+        self._counter_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubAnthropicServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._counter_lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                with stub._counter_lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                body = json.dumps(
+                    {
+                        "id": f"msg_stub_{stub.requests}",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": request.get("model", "stub"),
+                        "content": [{"type": "text", "text": stub.text}],
+                        "stop_reason": "end_turn",
+                        "stop_sequence": None,
+                        "usage": {"input_tokens": 0, "output_tokens": 0},
+                    }
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(
+            target=self._httpd.serve_forever, name="anthropic-stub", daemon=True
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -8,12 +8,23 @@ This service encapsulates all AI-related operations including:
 - API validation and error handling
 """
 
+import codecs
+import functools
+import json
 import re
-from typing import Tuple
+from contextlib import closing, contextmanager
+from typing import Iterator, List, Tuple
 
 import anthropic
 from django.conf import settings
 
+from ..models import Ingredient
+from ..utils import metrics
+from ..utils.structured_data import RecipePageParser
+from ..utils.timing import timed
+from .ai_cache import AICache
+from .ai_client import get_client
+
 
 class AIServiceException(Exception):
     """Base exception for AI service errors."""
@@ -39,12 +50,67 @@ class AIAPIError(AIServiceException):
     pass
 
 
+@contextmanager
+def _api_call(operation):
+    """Time one Anthropic call for Server-Timing and the AI latency histogram."""
+    with timed("ai"), metrics.AI_REQUEST_DURATION.time(operation=operation):
+        yield
+
+
+def _counts_errors(operation):
+    """Count the AIServiceExceptions an AI operation raises, by subclass."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except AIServiceException as e:
+                metrics.AI_ERRORS.inc(operation=operation, error=type(e).__name__)
+                raise
+
+        return wrapper
+
+    return decorator
+
+
 class AIService:
     """Service for AI recipe generation operations."""
 
     MAX_PROMPT_LENGTH = 500
     MODEL = "claude-haiku-4-5"
     TEMPERATURE = 0.7
+    # URL import: visible page text sent to the AI, and streaming read size
+    MAX_PAGE_TEXT = 5000
+    FETCH_CHUNK_SIZE = 16 * 1024
+
+    STRUCTURED_RECIPE_SYSTEM = (
+        "You are a helpful chef. Return recipes as JSON with this exact structure: "
+        '{"title": "...", "description": "...", "prep_time": 10, "cook_time": 30, '
+        '"servings": 4, "difficulty": "easy|medium|hard", '
+        '"ingredients": [{"name": "chicken breast", "quantity": 500, "unit": "g", '
+        '"category": "meat", "preparation_notes": "diced"}], '
+        '"steps": ["Step 1 text", "Step 2 text"]} '
+        '"unit" must be one of: "tsp", "tbsp", "cup", "ml", "l", "g", "kg", '
+        '"oz", "lb", "piece", "slice", "pinch", "handful", "bunch", "can", '
+        '"clove", or "" for items without a specific unit. '
+        '"name" must never be empty. '
+        "Return ONLY valid JSON, no markdown or extra text."
+    )
+    URL_IMPORT_SYSTEM = (
+        "Extract the recipe from this webpage content. Return JSON with this exact structure: "
+        '{"title": "...", "description": "...", "prep_time": 10, "cook_time": 30, '
+        '"servings": 4, "difficulty": "easy|medium|hard", '
+        '"ingredients": [{"name": "chicken breast", "quantity": 500, "unit": "g", '
+        '"category": "meat", "preparation_notes": "diced"}], '
+        '"steps": ["Step 1 text", "Step 2 text"]} '
+        '"unit" must be one of: "tsp", "tbsp", "cup", "ml", "l", "g", "kg", '
+        '"oz", "lb", "piece", "slice", "pinch", "handful", "bunch", "can", '
+        '"clove", or "" for items without a specific unit. '
+        '"name" must never be empty. '
+        "Return ONLY valid JSON. If no recipe is found, return "
+        '{"error": "No recipe found on this page."}'
+    )
 
     @staticmethod
     def validate_api_key() -> None:
@@ -91,6 +157,25 @@ class AIService:
         return cleaned_prompt
 
     @staticmethod
+    def validate_url(url: str) -> str:
+        """
+        Validate and clean a recipe URL.
+
+        Returns:
+            Cleaned URL string
+
+        Raises:
+            AIValidationError: If the URL is missing or not http(s)
+        """
+        if not url or not url.strip():
+            raise AIValidationError("Please provide a URL.")
+        url = url.strip()
+        if not url.startswith(("http://", "https://")):
+            raise AIValidationError("Please provide a valid URL.")
+        return url
+
+    @staticmethod
+    @_counts_errors("generate_recipe")
     def generate_recipe_from_prompt(prompt: str) -> str:
         """
         Generate a recipe using AI based on a user prompt.
@@ -120,15 +205,16 @@ class AIService:
         )
 
         try:
-            client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            response = client.messages.create(
-                model=AIService.MODEL,
-                max_tokens=4096,
-                system="You're a helpful chef assistant.",
-                messages=[
-                    {"role": "user", "content": full_prompt},
-                ],
-            )
+            client = get_client()
+            with _api_call("generate_recipe"):
+                response = client.messages.create(
+                    model=AIService.MODEL,
+                    max_tokens=4096,
+                    system="You're a helpful chef assistant.",
+                    messages=[
+                        {"role": "user", "content": full_prompt},
+                    ],
+                )
 
             content = next((b.text for b in response.content if b.type == "text"), "")
             if not content or not content.strip():
@@ -155,6 +241,7 @@ class AIService:
             raise AIAPIError("An unexpected error occurred. Please try again.")
 
     @staticmethod
+    @_counts_errors("surprise_recipe")
     def generate_surprise_recipe() -> str:
         """
         Generate a random surprise recipe using AI.
@@ -176,15 +263,16 @@ class AIService:
         )
 
         try:
-            client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            response = client.messages.create(
-                model=AIService.MODEL,
-                max_tokens=4096,
-                system="You're a helpful chef assistant.",
-                messages=[
-                    {"role": "user", "content": prompt},
-                ],
-            )
+            client = get_client()
+            with _api_call("surprise_recipe"):
+                response = client.messages.create(
+                    model=AIService.MODEL,
+                    max_tokens=4096,
+                    system="You're a helpful chef assistant.",
+                    messages=[
+                        {"role": "user", "content": prompt},
+                    ],
+                )
 
             content = next((b.text for b in response.content if b.type == "text"), "")
             if not content or not content.strip():
@@ -211,124 +299,191 @@ class AIService:
             raise AIAPIError("An unexpected error occurred. Please try again.")
 
     @staticmethod
-    def generate_structured_recipe(prompt, max_prompt_length=None):
-        """Generate a recipe with structured ingredients from AI."""
+    @_counts_errors("structured_recipe")
+    def generate_structured_recipe(prompt, max_prompt_length=None, use_cache=True):
+        """
+        Generate a recipe with structured ingredients from AI.
+
+        Identical prompts are answered from AICache; pass use_cache=False
+        where every call must produce a different recipe.
+        """
         AIService.validate_api_key()
         clean_prompt = AIService.validate_prompt(prompt, max_length=max_prompt_length)
 
-        client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-
-        response = client.messages.create(
-            model=AIService.MODEL,
-            max_tokens=4096,
-            system=(
-                "You are a helpful chef. Return recipes as JSON with this exact structure: "
-                '{"title": "...", "description": "...", "prep_time": 10, "cook_time": 30, '
-                '"servings": 4, "difficulty": "easy|medium|hard", '
-                '"ingredients": [{"name": "chicken breast", "quantity": 500, "unit": "g", '
-                '"category": "meat", "preparation_notes": "diced"}], '
-                '"steps": ["Step 1 text", "Step 2 text"]} '
-                '"unit" must be one of: "tsp", "tbsp", "cup", "ml", "l", "g", "kg", '
-                '"oz", "lb", "piece", "slice", "pinch", "handful", "bunch", "can", '
-                '"clove", or "" for items without a specific unit. '
-                '"name" must never be empty. '
-                "Return ONLY valid JSON, no markdown or extra text."
-            ),
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Create a family-friendly recipe using: {clean_prompt}",
-                },
-            ],
+        return AICache.fetch(
+            "structured_recipe",
+            AIService.MODEL,
+            AIService.STRUCTURED_RECIPE_SYSTEM,
+            AICache.normalize_prompt(clean_prompt),
+            lambda: AIService._request_structured_recipe(clean_prompt),
+            use_cache=use_cache,
         )
 
-        import json
+    @staticmethod
+    def _request_structured_recipe(clean_prompt):
+        try:
+            client = get_client()
+            with _api_call("structured_recipe"):
+                response = client.messages.create(
+                    model=AIService.MODEL,
+                    max_tokens=4096,
+                    system=AIService.STRUCTURED_RECIPE_SYSTEM,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": f"Create a family-friendly recipe using: {clean_prompt}",
+                        },
+                    ],
+                )
 
-        content = next((b.text for b in response.content if b.type == "text"), "")
-        content = content.strip()
-        # Strip markdown code fences if present
-        if content.startswith("```"):
-            content = content.split("\n", 1)[1] if "\n" in content else content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
+            content = next((b.text for b in response.content if b.type == "text"), "")
             content = content.strip()
+            # Strip markdown code fences if present
+            if content.startswith("```"):
+                content = content.split("\n", 1)[1] if "\n" in content else content[3:]
+                if content.endswith("```"):
+                    content = content[:-3]
+                content = content.strip()
 
-        return json.loads(content)
+            result = json.loads(content)
+            if not isinstance(result, dict):
+                raise AIAPIError("AI service returned an invalid recipe.")
+            return result
+        except json.JSONDecodeError:
+            raise AIAPIError("AI service returned an invalid recipe.")
+        except anthropic.AuthenticationError:
+            raise AIAPIError(
+                "AI service authentication failed. Please check the API configuration."
+            )
+        except anthropic.RateLimitError:
+            raise AIAPIError(
+                "AI service is currently busy. Please try again in a few minutes."
+            )
+        except anthropic.APIError:
+            raise AIAPIError(
+                "AI service is temporarily unavailable. Please try again later."
+            )
+        except AIServiceException:
+            raise
+        except Exception:
+            raise AIAPIError("An unexpected error occurred. Please try again.")
 
     @staticmethod
-    def import_recipe_from_url(url):
-        """Fetch a recipe URL, extract content, and parse with Claude."""
-        import json
+    @_counts_errors("import_url")
+    def import_recipe_from_url(url, use_cache=True):
+        """
+        Fetch a recipe URL and extract its recipe.
 
-        import requests as http_requests
+        Schema.org Recipe markup (JSON-LD or microdata) is used directly when
+        the page has it; otherwise the page text is parsed with Claude.
+        Results are cached by normalized URL, so a page imported by any
+        household is served without fetching or parsing it again.
+        """
+        url = AIService.validate_url(url)
+
+        return AICache.fetch(
+            "import_url",
+            AIService.MODEL,
+            AIService.URL_IMPORT_SYSTEM,
+            AICache.normalize_url(url),
+            lambda: AIService._import_recipe_from_url(url),
+            use_cache=use_cache,
+        )
 
-        # Validate URL
-        if not url or not url.strip():
-            raise AIValidationError("Please provide a URL.")
-        url = url.strip()
-        if not url.startswith(("http://", "https://")):
-            raise AIValidationError("Please provide a valid URL.")
+    @staticmethod
+    def stream_page(url: str) -> Iterator[str]:
+        """
+        Fetch a web page, yielding decoded text chunks as they arrive.
 
-        AIService.validate_api_key()
+        Reading stops at settings.URL_IMPORT_MAX_BYTES, and the connection
+        is released as soon as the caller stops iterating, so a huge page
+        never has to be held in memory.
+
+        Raises:
+            AIAPIError: If the page can't be fetched
+        """
+        import requests as http_requests
 
-        # Fetch page
         try:
-            resp = http_requests.get(
-                url,
-                timeout=15,
-                headers={"User-Agent": "Mozilla/5.0 (compatible; MealPlanner/1.0)"},
-            )
+            with timed("http-out"):
+                resp = http_requests.get(
+                    url,
+                    timeout=15,
+                    stream=True,
+                    headers={"User-Agent": "Mozilla/5.0 (compatible; MealPlanner/1.0)"},
+                )
+        except Exception:
+            raise AIAPIError("Couldn't access that URL. Please check it's correct.")
+        try:
             resp.raise_for_status()
         except Exception:
+            # Streamed, so the connection stays checked out until closed
+            resp.close()
             raise AIAPIError("Couldn't access that URL. Please check it's correct.")
 
-        # Strip HTML to text
-        html_content = resp.text
-        # Remove script, style, nav, footer, header tags and their content
-        for tag in ["script", "style", "nav", "footer", "header", "aside"]:
-            html_content = re.sub(
-                f"<{tag}[^>]*>.*?</{tag}>",
-                "",
-                html_content,
-                flags=re.DOTALL | re.IGNORECASE,
-            )
-        # Remove all remaining HTML tags
-        text = re.sub(r"<[^>]+>", " ", html_content)
-        # Collapse whitespace
-        text = re.sub(r"\s+", " ", text).strip()
-        # Truncate to 5000 chars
-        text = text[:5000]
+        # requests assumes ISO-8859-1 for text/* without a charset; pages
+        # without one are nearly always UTF-8
+        encoding = "utf-8"
+        if "charset=" in resp.headers.get("Content-Type", "").lower():
+            encoding = resp.encoding or encoding
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        remaining = settings.URL_IMPORT_MAX_BYTES
+        with closing(resp):
+            try:
+                for chunk in resp.iter_content(chunk_size=AIService.FETCH_CHUNK_SIZE):
+                    chunk = chunk[:remaining]
+                    remaining -= len(chunk)
+                    yield decoder.decode(chunk)
+                    if remaining <= 0:
+                        break
+            except http_requests.RequestException:
+                raise AIAPIError("Couldn't access that URL. Please check it's correct.")
+            yield decoder.decode(b"", final=True)
 
+    @staticmethod
+    def _import_recipe_from_url(url):
+        # One streaming pass collects both the recipe markup and the visible
+        # text for the AI fallback. Stop reading once a JSON-LD recipe turns up;
+        # otherwise keep going (up to the byte cap) since sites often put it
+        # at the end of the body, but visible text stops at MAX_PAGE_TEXT.
+        parser = RecipePageParser(max_text=AIService.MAX_PAGE_TEXT)
+        for chunk in AIService.stream_page(url):
+            parser.feed(chunk)
+            if parser.json_ld_recipe is not None:
+                break
+        parser.close()
+
+        # Most recipe sites embed schema.org markup; use it and skip the AI call
+        recipe = parser.recipe()
+        if recipe:
+            AIService.apply_known_categories(recipe["ingredients"])
+            return recipe
+
+        AIService.validate_api_key()
+
+        text = parser.text
         if len(text) < 50:
             raise AIValidationError("Couldn't find enough content on that page.")
 
         # Send to Claude
-        client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        client = get_client()
         try:
-            response = client.messages.create(
-                model=AIService.MODEL,
-                max_tokens=4096,
-                system=(
-                    "Extract the recipe from this webpage content. Return JSON with this exact structure: "
-                    '{"title": "...", "description": "...", "prep_time": 10, "cook_time": 30, '
-                    '"servings": 4, "difficulty": "easy|medium|hard", '
-                    '"ingredients": [{"name": "chicken breast", "quantity": 500, "unit": "g", '
-                    '"category": "meat", "preparation_notes": "diced"}], '
-                    '"steps": ["Step 1 text", "Step 2 text"]} '
-                    '"unit" must be one of: "tsp", "tbsp", "cup", "ml", "l", "g", "kg", '
-                    '"oz", "lb", "piece", "slice", "pinch", "handful", "bunch", "can", '
-                    '"clove", or "" for items without a specific unit. '
-                    '"name" must never be empty. '
-                    "Return ONLY valid JSON. If no recipe is found, return "
-                    '{"error": "No recipe found on this page."}'
-                ),
-                messages=[
-                    {
-                        "role": "user",
-                        "content": f"Extract the recipe from this webpage:\n\n{text}",
-                    }
-                ],
-            )
+            with _api_call("import_url"):
+                response = client.messages.create(
+                    model=AIService.MODEL,
+                    max_tokens=4096,
+                    system=AIService.URL_IMPORT_SYSTEM,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": f"Extract the recipe from this webpage:\n\n{text}",
+                        }
+                    ],
+                )
             content = next((b.text for b in response.content if b.type == "text"), "")
             # Strip markdown fences
             if content.startswith("```"):
@@ -356,6 +511,21 @@ class AIService:
         except Exception:
             raise AIAPIError("An unexpected error occurred. Please try again.")
 
+    @staticmethod
+    def apply_known_categories(ingredients: List[dict]) -> None:
+        """
+        Fill in shopping categories for ingredients parsed from recipe markup.
+
+        Schema.org has no ingredient categories, so names already in the
+        Ingredient table take their stored category; the rest stay "other".
+        """
+        names = {ing["name"] for ing in ingredients}
+        known = dict(
+            Ingredient.objects.filter(name__in=names).values_list("name", "category")
+        )
+        for ing in ingredients:
+            ing["category"] = known.get(ing["name"], ing["category"])
+
     @staticmethod
     def parse_generated_recipe(text: str) -> Tuple[str, str, str]:
         """
@@ -0,0 +1,210 @@
+"""
+Batch Generation Service - Generates a batch of AI recipes concurrently.
+
+This service encapsulates the generate flow's background work including:
+- Building a varied prompt for each recipe slot in the batch
+- Running up to AI_GENERATION_CONCURRENCY Anthropic calls at once
+- Persisting each recipe as soon as its call completes
+- Tracking progress on the GenerationBatch row for the status endpoint
+- Queueing the batch as a background job
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+
+from ..models import GenerationBatch, Job, Recipe, Tag
+from .ai_service import AIService, AIServiceException
+from .ingredient_service import IngredientService
+from .job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+
+class BatchGenerationService:
+    """Service for generating batches of AI recipes."""
+
+    PREFERENCE_KEYS = ["cuisines", "proteins", "dietary", "styles", "avoid"]
+    MAX_PROMPT_LENGTH = 2000
+
+    @staticmethod
+    def build_prompt(
+        preferences: dict, slot: int, total: int, avoid_titles: List[str]
+    ) -> str:
+        """
+        Build the prompt for one recipe in a batch.
+
+        Recipes are generated in parallel, so rather than asking the model to
+        vary from the previous result, each slot is assigned its own cuisine,
+        protein and style by rotating through the user's choices.
+
+        Args:
+            preferences: Dict of preference lists keyed by PREFERENCE_KEYS
+            slot: Zero-based position of this recipe in the batch
+            total: Number of recipes in the batch
+            avoid_titles: Existing recipe titles to steer away from
+
+        Returns:
+            Prompt string for AIService.generate_structured_recipe
+        """
+        cuisines = preferences.get("cuisines", [])
+        proteins = preferences.get("proteins", [])
+        dietary = preferences.get("dietary", [])
+        styles = preferences.get("styles", [])
+        avoid = preferences.get("avoid", [])
+
+        prompt_parts = [
+            "Generate a unique family-friendly dinner recipe.",
+            f"This is recipe {slot + 1} of {total} in a batch.",
+        ]
+        if cuisines:
+            prompt_parts.append(f"Cuisine: {cuisines[slot % len(cuisines)]}")
+        if proteins:
+            prompt_parts.append(f"Protein: {proteins[slot % len(proteins)]}")
+        if dietary:
+            prompt_parts.append(
+                f"Dietary requirements (must follow all): {', '.join(dietary)}"
+            )
+        if styles:
+            prompt_parts.append(f"Cooking style: {styles[slot % len(styles)]}")
+        if avoid:
+            prompt_parts.append(f"Must NOT contain: {', '.join(avoid)}")
+        if avoid_titles:
+            prompt_parts.append(
+                f"Must be different from: {', '.join(avoid_titles[-20:])}"
+            )
+        return "\n".join(prompt_parts)
+
+    @staticmethod
+    def save_generated_recipe(
+        user: User, data: dict, cuisines: List[str], fallback_title: str
+    ) -> Recipe:
+        """
+        Persist an AI recipe with its structured ingredients and cuisine tags.
+
+        Args:
+            user: Owner of the new recipe
+            data: Parsed JSON from AIService.generate_structured_recipe
+            cuisines: Cuisine names to tag the recipe with
+            fallback_title: Title to use if the AI didn't return one
+
+        Returns:
+            The saved Recipe
+        """
+        with transaction.atomic():
+            recipe = Recipe.objects.create(
+                user=user,
+                title=data.get("title", fallback_title),
+                description=data.get("description", ""),
+                prep_time=data.get("prep_time"),
+                cook_time=data.get("cook_time"),
+                servings=data.get("servings", 4),
+                difficulty=data.get("difficulty", "medium"),
+                source="ai",
+                is_ai_generated=True,
+                steps="\n".join(data.get("steps", [])),
+            )
+
+            IngredientService.save_recipe_ingredients(
+                recipe, data.get("ingredients", [])
+            )
+
+            for cuisine in cuisines:
+                tag, _ = Tag.objects.get_or_create(
+                    name=cuisine, defaults={"tag_type": "cuisine"}
+                )
+                recipe.tags.add(tag)
+        return recipe
+
+    @staticmethod
+    def run_batch(batch_id: int, concurrency: Optional[int] = None) -> GenerationBatch:
+        """
+        Generate every recipe in a batch, saving each one as it completes.
+
+        Only the Anthropic calls run on the pool's threads; all database work
+        stays on the calling thread, in completion order.
+
+        Args:
+            batch_id: The GenerationBatch to fill
+            concurrency: Max concurrent AI calls (defaults to
+                settings.AI_GENERATION_CONCURRENCY)
+
+        Returns:
+            The finished GenerationBatch
+        """
+        batch = GenerationBatch.objects.select_related("user").get(pk=batch_id)
+        concurrency = concurrency or settings.AI_GENERATION_CONCURRENCY
+        batches = GenerationBatch.objects.filter(pk=batch_id)
+        batches.update(status="running")
+
+        existing_titles = list(
+            Recipe.objects.filter(user=batch.user).values_list("title", flat=True)
+        )
+        prompts = [
+            BatchGenerationService.build_prompt(
+                batch.preferences, slot, batch.total, existing_titles
+            )
+            for slot in range(batch.total)
+        ]
+        cuisines = batch.preferences.get("cuisines", [])
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                futures = {
+                    pool.submit(
+                        AIService.generate_structured_recipe,
+                        prompt,
+                        max_prompt_length=BatchGenerationService.MAX_PROMPT_LENGTH,
+                        # Every batch must produce fresh recipes
+                        use_cache=False,
+                    ): slot
+                    for slot, prompt in enumerate(prompts)
+                }
+                for future in as_completed(futures):
+                    slot = futures[future]
+                    try:
+                        data = future.result()
+                        recipe = BatchGenerationService.save_generated_recipe(
+                            batch.user, data, cuisines, f"Recipe {slot + 1}"
+                        )
+                    except AIServiceException as e:
+                        logger.error(f"Recipe generation failed: {e}")
+                        batches.update(failed=F("failed") + 1)
+                        continue
+                    except Exception:
+                        # One bad recipe mustn't stop the rest of the batch
+                        logger.exception("Recipe generation failed")
+                        batches.update(failed=F("failed") + 1)
+                        continue
+                    batch.recipes.add(recipe)
+                    batches.update(completed=F("completed") + 1)
+        finally:
+            # The status page polls until the batch is done, so always get there
+            batches.update(status="done")
+
+        batch.refresh_from_db()
+        return batch
+
+    @staticmethod
+    def abandon_batch(batch_id: int) -> None:
+        """
+        Finish a batch whose job failed, counting its unfinished recipes as failed.
+
+        Otherwise the progress page would poll a batch that never finishes.
+        """
+        GenerationBatch.objects.filter(pk=batch_id).exclude(status="done").update(
+            status="done", failed=F("total") - F("completed")
+        )
+
+    @staticmethod
+    def start_batch(batch: GenerationBatch) -> Job:
+        """Queue the batch for the background workers (see job_handlers)."""
+        # Not retried as a whole: a rerun would duplicate the recipes saved so far
+        return JobService.enqueue(
+            "generation_batch", {"batch_id": batch.pk}, user=batch.user, max_attempts=1
+        )
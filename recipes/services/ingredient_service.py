@@ -0,0 +1,167 @@
+"""
+Ingredient Service - Persists a recipe's structured ingredient lines in bulk.
+
+This service encapsulates structured ingredient writes including:
+- Normalizing ingredient names, units, categories and quantities
+- Resolving every Ingredient row in one query and creating the missing ones
+  in a single insert
+- Diffing the desired lines against the recipe's stored RecipeIngredients
+  so an edit only writes the inserts, updates and deletes that changed
+"""
+
+import re
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+
+from ..models import Ingredient, Recipe, RecipeIngredient, refresh_search_documents
+from ..models.recipe import normalize_category
+from ..utils.units import normalize_unit
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+class IngredientService:
+    """Service for saving structured recipe ingredients."""
+
+    SYNCED_FIELDS = ["quantity", "unit", "preparation_notes", "order"]
+
+    @staticmethod
+    def normalize_name(name: Optional[str]) -> str:
+        """Lowercase an ingredient name and collapse its whitespace."""
+        return WHITESPACE_RE.sub(" ", name or "").strip().lower()
+
+    @staticmethod
+    def parse_quantity(value) -> Optional[Decimal]:
+        """Convert a form or AI quantity to a Decimal, or None if blank/invalid."""
+        if value is None or value == "":
+            return None
+        try:
+            quantity = Decimal(str(value).strip())
+        except (InvalidOperation, ValueError):
+            return None
+        if not quantity.is_finite() or not quantity:
+            return None
+        return quantity
+
+    @staticmethod
+    def resolve_ingredients(categories: Dict[str, str]) -> Dict[str, Ingredient]:
+        """
+        Fetch or create the Ingredient rows for a set of normalized names.
+
+        Existing rows are looked up in one query; missing names are inserted
+        in one bulk_create that ignores rows a concurrent writer got to first,
+        then read back. Existing ingredients keep their category.
+
+        Args:
+            categories: Map of normalized name to category for new rows
+
+        Returns:
+            Map of normalized name to Ingredient
+        """
+        if not categories:
+            return {}
+        names = list(categories)
+        ingredients = {i.name: i for i in Ingredient.objects.filter(name__in=names)}
+        missing = [name for name in names if name not in ingredients]
+        if missing:
+            Ingredient.objects.bulk_create(
+                [Ingredient(name=name, category=categories[name]) for name in missing],
+                ignore_conflicts=True,
+            )
+            ingredients.update(
+                (i.name, i) for i in Ingredient.objects.filter(name__in=missing)
+            )
+        return ingredients
+
+    @staticmethod
+    def save_recipe_ingredients(
+        recipe: Recipe, lines: Iterable[dict]
+    ) -> Dict[str, int]:
+        """
+        Bring a recipe's structured ingredients in line with the given lines.
+
+        Each line is a dict with name, quantity, unit, preparation_notes and
+        optionally category (used only when the ingredient is new). Lines with
+        a blank name are skipped. Stored rows are matched to lines by
+        ingredient, so an unchanged row is left alone and a moved or edited
+        one keeps its pk. The recipe's search document is rebuilt once.
+
+        Args:
+            recipe: The recipe whose ingredients to save
+            lines: Desired ingredient lines, in display order
+
+        Returns:
+            Dict of created/updated/deleted counts
+        """
+        # AI and imported lines aren't validated by a form; clamp them to
+        # the columns so one long value can't fail the whole save
+        name_length = Ingredient._meta.get_field("name").max_length
+        notes_length = RecipeIngredient._meta.get_field("preparation_notes").max_length
+        desired = []
+        categories = {}
+        for order, line in enumerate(lines):
+            name = IngredientService.normalize_name(line.get("name"))
+            name = name[:name_length].rstrip()
+            if not name:
+                continue
+            notes = (line.get("preparation_notes") or "").strip()
+            categories.setdefault(name, normalize_category(line.get("category")))
+            desired.append(
+                {
+                    "name": name,
+                    "quantity": IngredientService.parse_quantity(line.get("quantity")),
+                    "unit": normalize_unit(line.get("unit") or ""),
+                    "preparation_notes": notes[:notes_length].rstrip(),
+                    "order": order,
+                }
+            )
+
+        with transaction.atomic():
+            ingredients = IngredientService.resolve_ingredients(categories)
+
+            rows_by_ingredient = defaultdict(list)
+            for row in recipe.recipe_ingredients.order_by("order", "pk"):
+                rows_by_ingredient[row.ingredient_id].append(row)
+
+            to_create: List[RecipeIngredient] = []
+            to_update: List[RecipeIngredient] = []
+            for line in desired:
+                ingredient = ingredients[line.pop("name")]
+                matches = rows_by_ingredient.get(ingredient.pk)
+                if not matches:
+                    to_create.append(
+                        RecipeIngredient(recipe=recipe, ingredient=ingredient, **line)
+                    )
+                    continue
+
+                row = matches.pop(0)
+                changed = False
+                for field, value in line.items():
+                    if getattr(row, field) != value:
+                        setattr(row, field, value)
+                        changed = True
+                if changed:
+                    to_update.append(row)
+
+            stale_ids = [row.pk for rows in rows_by_ingredient.values() for row in rows]
+
+            if stale_ids:
+                RecipeIngredient.objects.filter(pk__in=stale_ids).delete()
+            if to_update:
+                RecipeIngredient.objects.bulk_update(
+                    to_update, IngredientService.SYNCED_FIELDS
+                )
+            if to_create:
+                RecipeIngredient.objects.bulk_create(to_create)
+            if to_create or to_update or stale_ids:
+                # bulk writes skip the per-row signals, so reindex once here
+                refresh_search_documents([recipe.pk])
+
+        return {
+            "created": len(to_create),
+            "updated": len(to_update),
+            "deleted": len(stale_ids),
+        }
@@ -0,0 +1,47 @@
+"""
+Job handlers - The background work behind the AI and URL-import endpoints.
+
+register() adds each handler to JobService; RecipesConfig.ready() calls it.
+Transient API failures are retried; validation and configuration errors are
+not. AIService wraps SDK and parsing errors in AIAPIError, so rate limits,
+overloads and timeouts reach retry_on, and its messages are written to be
+shown to the user.
+"""
+
+from ..models import Job
+from .ai_service import AIAPIError, AIService, AIServiceException
+from .generation_service import BatchGenerationService
+from .job_service import JobService
+
+
+def generate_recipe(job: Job) -> dict:
+    """Generate a structured recipe from payload['prompt'] for the recipe form."""
+    return AIService.generate_structured_recipe(job.payload["prompt"])
+
+
+def import_recipe_url(job: Job) -> dict:
+    """Fetch and parse the recipe at payload['url'] for the recipe form."""
+    return AIService.import_recipe_from_url(job.payload["url"])
+
+
+def generate_batch(job: Job) -> dict:
+    """Fill the GenerationBatch payload['batch_id']; errors are tracked per recipe."""
+    batch = BatchGenerationService.run_batch(job.payload["batch_id"])
+    return {"completed": batch.completed, "failed": batch.failed}
+
+
+def abandon_batch(job: Job) -> None:
+    """Finish the batch of a failed generation_batch job, so its page stops polling."""
+    BatchGenerationService.abandon_batch(job.payload["batch_id"])
+
+
+def register() -> None:
+    """Register every job kind's handler with JobService."""
+    for kind, handler in [
+        ("ai_generate_recipe", generate_recipe),
+        ("import_recipe_url", import_recipe_url),
+    ]:
+        JobService.handler(
+            kind, retry_on=(AIAPIError,), user_errors=(AIServiceException,)
+        )(handler)
+    JobService.handler("generation_batch", on_failure=abandon_batch)(generate_batch)
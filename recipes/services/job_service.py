@@ -0,0 +1,296 @@
+"""
+Job Service - A database-backed queue for slow background work.
+
+This service encapsulates the job subsystem including:
+- Registering handlers for each job kind
+- Enqueueing jobs from request handlers, which return immediately
+- Claiming jobs atomically so several workers can share the table
+- Retrying failed jobs with exponential backoff
+- Heartbeats on running jobs, and recovering jobs whose worker died
+- The worker loop run by `manage.py run_workers`
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Optional, Tuple, Type
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """Service for enqueueing and running background jobs."""
+
+    # kind -> (handler, exception types worth retrying, exception types
+    # whose messages are written for users, callback for a failed job)
+    HANDLERS = {}
+
+    # Shown instead of the message of any other exception, which may be
+    # a traceback detail or SDK internals; the full error is logged
+    UNEXPECTED_ERROR = "Something went wrong. Please try again."
+
+    @staticmethod
+    def handler(
+        kind: str,
+        retry_on: Tuple[Type[Exception], ...] = (),
+        user_errors: Tuple[Type[Exception], ...] = (),
+        on_failure: Optional[Callable[[Job], None]] = None,
+    ):
+        """
+        Register a function as the handler for a job kind.
+
+        The handler receives the Job and returns a JSON-serialisable result.
+        Exceptions in retry_on requeue the job with backoff until
+        max_attempts is reached; anything else fails it immediately.
+        Messages of exceptions in user_errors are stored on the job for the
+        status endpoint; any other failure stores UNEXPECTED_ERROR.
+        on_failure is called with the job once it has failed for good,
+        including when its worker died with no attempts left, to clean up
+        whatever the job left half done.
+        """
+
+        def register(func: Callable[[Job], object]):
+            JobService.HANDLERS[kind] = (func, retry_on, user_errors, on_failure)
+            return func
+
+        return register
+
+    @staticmethod
+    def enqueue(
+        kind: str,
+        payload: dict,
+        user: Optional[User] = None,
+        max_attempts: int = 3,
+    ) -> Job:
+        """
+        Queue a job for the workers.
+
+        Args:
+            kind: Name of a registered handler
+            payload: JSON input for the handler
+            user: Owner allowed to read the job's status
+            max_attempts: Total tries before the job is marked failed
+
+        Returns:
+            The queued Job
+        """
+        return Job.objects.create(
+            kind=kind, payload=payload, user=user, max_attempts=max_attempts
+        )
+
+    @staticmethod
+    def claim_next(worker_id: str) -> Optional[Job]:
+        """
+        Claim the oldest due job for this worker.
+
+        Claiming is a conditional UPDATE on status, so when two workers race
+        for the same row only one update matches and the other moves on.
+        """
+        now = timezone.now()
+        candidates = list(
+            Job.objects.filter(status="queued", run_after__lte=now)
+            .order_by("run_after", "pk")
+            .values_list("pk", flat=True)[:10]
+        )
+        for pk in candidates:
+            claimed = Job.objects.filter(pk=pk, status="queued").update(
+                status="running",
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+            if claimed:
+                return Job.objects.get(pk=pk)
+        return None
+
+    @staticmethod
+    def retry_delay(attempts: int) -> timedelta:
+        """Backoff before the next try: JOB_RETRY_BACKOFF doubled per attempt."""
+        return timedelta(seconds=settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+    @staticmethod
+    def error_message(
+        error: Exception, user_errors: Tuple[Type[Exception], ...]
+    ) -> str:
+        """The message to store on a failed job, safe to show its owner."""
+        if isinstance(error, user_errors):
+            return str(error)
+        return JobService.UNEXPECTED_ERROR
+
+    @staticmethod
+    def run_job(job: Job) -> Job:
+        """Run a claimed job's handler and record the outcome on the row."""
+        registered = JobService.HANDLERS.get(job.kind)
+        if registered is None:
+            job.status = "failed"
+            job.error = f"No handler registered for job kind '{job.kind}'"
+            job.save(update_fields=["status", "error", "updated_at"])
+            return job
+
+        handler, retry_on, user_errors, on_failure = registered
+        try:
+            job.result = handler(job)
+        except retry_on as e:
+            job.error = JobService.error_message(e, user_errors)
+            if job.attempts < job.max_attempts:
+                job.status = "queued"
+                job.run_after = timezone.now() + JobService.retry_delay(job.attempts)
+                logger.warning(f"Job {job.pk} ({job.kind}) will retry: {e}")
+            else:
+                job.status = "failed"
+                logger.error(f"Job {job.pk} ({job.kind}) gave up: {e}")
+        except Exception as e:
+            logger.exception(f"Job {job.pk} ({job.kind}) failed")
+            job.status = "failed"
+            job.error = JobService.error_message(e, user_errors)
+        else:
+            job.status = "succeeded"
+            job.error = ""
+
+        job.locked_by = ""
+        job.locked_at = None
+        job.save()
+        if job.status == "failed":
+            JobService.job_failed(job)
+        return job
+
+    @staticmethod
+    def job_failed(job: Job) -> None:
+        """Run the failed job's on_failure callback, if its kind has one."""
+        registered = JobService.HANDLERS.get(job.kind)
+        if registered is None or registered[3] is None:
+            return
+        try:
+            registered[3](job)
+        except Exception:
+            logger.exception(f"Cleaning up failed job {job.pk} ({job.kind}) failed")
+
+    @staticmethod
+    def touch(worker_id: str) -> int:
+        """Refresh locked_at on the jobs this worker is running. Returns the count."""
+        return Job.objects.filter(status="running", locked_by=worker_id).update(
+            locked_at=timezone.now()
+        )
+
+    @staticmethod
+    @contextmanager
+    def heartbeat(worker_id: str, interval: Optional[float] = None):
+        """
+        Touch the worker's jobs every interval seconds while the block runs.
+
+        A job's locked_at then only goes stale once its worker has stopped,
+        however long the job itself takes.
+        """
+        interval = interval or settings.JOB_HEARTBEAT_INTERVAL
+        done = threading.Event()
+
+        def beat():
+            try:
+                while not done.wait(interval):
+                    try:
+                        JobService.touch(worker_id)
+                    except Exception:
+                        logger.exception(f"Heartbeat for {worker_id} failed")
+            finally:
+                connection.close()
+
+        thread = threading.Thread(
+            target=beat, name=f"heartbeat-{worker_id}", daemon=True
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    @staticmethod
+    def requeue_stale(older_than: Optional[timedelta] = None) -> int:
+        """
+        Requeue running jobs whose worker died mid-job.
+
+        Running jobs are touched every JOB_HEARTBEAT_INTERVAL, so a job is
+        stale once its worker has missed several heartbeats.
+
+        The interrupted run counts as an attempt, so a job that has used
+        all of its attempts is failed instead; that keeps jobs that mustn't
+        be rerun (max_attempts=1) from running twice.
+
+        Returns:
+            Number of jobs requeued
+        """
+        older_than = older_than or timedelta(seconds=settings.JOB_STALE_AFTER)
+        now = timezone.now()
+        stale = Job.objects.filter(status="running", locked_at__lt=now - older_than)
+        for job in stale.filter(attempts__gte=F("max_attempts")):
+            # Conditional, in case its worker finished it in the meantime
+            failed = Job.objects.filter(pk=job.pk, status="running").update(
+                status="failed",
+                error=JobService.UNEXPECTED_ERROR,
+                locked_by="",
+                locked_at=None,
+                updated_at=now,
+            )
+            if failed:
+                logger.error(
+                    f"Job {job.pk} ({job.kind}) went stale with no attempts left"
+                )
+                JobService.job_failed(job)
+        requeued = stale.update(
+            status="queued", locked_by="", locked_at=None, updated_at=now
+        )
+        if requeued:
+            logger.warning(f"Requeued {requeued} stale job(s)")
+        return requeued
+
+    @staticmethod
+    def work(
+        worker_id: str,
+        stop_event: threading.Event,
+        poll_interval: float = 1.0,
+        burst: bool = False,
+    ) -> int:
+        """
+        Process jobs until stopped.
+
+        Stale jobs are recovered on start and every JOB_HEARTBEAT_INTERVAL
+        after, so a worker that restarts soon after a crash still picks up
+        what it dropped.
+
+        Args:
+            worker_id: Name recorded on claimed jobs
+            stop_event: Set to finish the current job and exit
+            poll_interval: Seconds to sleep when the queue is empty
+            burst: Exit as soon as the queue is empty instead of polling
+
+        Returns:
+            Number of jobs processed
+        """
+        processed = 0
+        next_recovery = 0.0
+        while not stop_event.is_set():
+            if time.monotonic() >= next_recovery:
+                JobService.requeue_stale()
+                next_recovery = time.monotonic() + settings.JOB_HEARTBEAT_INTERVAL
+            job = JobService.claim_next(worker_id)
+            if job is None:
+                if burst:
+                    break
+                close_old_connections()
+                stop_event.wait(poll_interval)
+                continue
+            with JobService.heartbeat(worker_id):
+                JobService.run_job(job)
+            processed += 1
+        return processed
@@ -10,7 +10,7 @@ This service generates intelligent weekly meal plans based on:
 import random
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from django.contrib.auth.models import User
 from django.db.models import Avg
@@ -21,6 +21,7 @@ from ..models import (
     MealPlan,
     MealPlannerPreferences,
     Recipe,
+    UserRecipeStats,
 )
 from ..models.household import get_household
 
@@ -73,32 +74,43 @@ class MealPlanningAssistantService:
         Returns: Score from 0-100.  Neutral 50 if no notes exist.
         Penalised if the latest note has would_make_again=False.
         """
-        notes = CookingNote.objects.filter(
-            recipe=recipe,
-            user=user,
-            rating__isnull=False,
-        )
+        return MealPlanningAssistantService.calculate_recipe_happiness_scores(
+            [recipe], user
+        )[recipe.id]
 
-        if not notes.exists():
-            return Decimal("50.0")
+    @staticmethod
+    def calculate_recipe_happiness_scores(
+        recipes: Iterable[Recipe],
+        user: User,
+    ) -> Dict[int, Decimal]:
+        """
+        Calculate happiness scores for many recipes in a single query.
 
-        avg_rating = notes.aggregate(Avg("rating"))["rating__avg"] or 3.0
-        # Convert 1-5 scale to 0-100
-        score = ((avg_rating - 1) / 4) * 100
+        Reads the user's denormalized UserRecipeStats rows (average rating
+        and latest would_make_again), so the cost doesn't grow with the
+        number of candidate recipes or cooking notes.
 
-        # Penalise if the latest note says would_make_again=False
-        latest_note = (
-            CookingNote.objects.filter(
-                recipe=recipe,
-                user=user,
-            )
-            .order_by("-cooked_date")
-            .first()
-        )
-        if latest_note and not latest_note.would_make_again:
-            score = max(score - 20, 0)
+        Returns: Dict of recipe_id to score (same scale as
+        calculate_recipe_happiness_score).
+        """
+        recipe_ids = {r.id for r in recipes}
+        scores = {recipe_id: Decimal("50.0") for recipe_id in recipe_ids}
+        if not recipe_ids:
+            return scores
 
-        return Decimal(str(min(score, 100)))
+        rows = UserRecipeStats.objects.filter(
+            user=user, recipe_id__in=recipe_ids, rating_count__gt=0
+        ).values_list("recipe_id", "average_rating", "last_would_make_again")
+
+        for recipe_id, avg_rating, would_make_again in rows:
+            # Convert 1-5 scale to 0-100
+            score = ((avg_rating - 1) / 4) * 100
+            # Penalise if the latest note says would_make_again=False
+            if not would_make_again:
+                score = max(score - 20, 0)
+            scores[recipe_id] = Decimal(str(min(score, 100)))
+
+        return scores
 
     @staticmethod
     def get_recently_cooked_recipes(
@@ -170,6 +182,12 @@ class MealPlanningAssistantService:
         if not candidate_recipes:
             candidate_recipes = available_recipes
 
+        # Rank candidates best-first so each slot can pick from the top scorers
+        scores = MealPlanningAssistantService.calculate_recipe_happiness_scores(
+            candidate_recipes, user
+        )
+        candidate_recipes.sort(key=lambda r: scores[r.id], reverse=True)
+
         for day_offset in range(7):
             current_date = week_start + timedelta(days=day_offset)
             is_weekend = current_date.weekday() in MealPlanningAssistantService.WEEKENDS
@@ -187,7 +205,9 @@ class MealPlanningAssistantService:
 
             for meal_type in meals_per_day:
                 if time_appropriate:
-                    recipe = random.choice(time_appropriate)
+                    # Random pick from the top half, as in week_suggest
+                    pool = time_appropriate[: max(len(time_appropriate) // 2, 1)]
+                    recipe = random.choice(pool)
                 else:
                     recipe = random.choice(candidate_recipes)
 
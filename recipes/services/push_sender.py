@@ -0,0 +1,174 @@
+"""
+Push Sender - Sends Web Push notifications with reusable VAPID credentials.
+
+This module encapsulates how the app talks to push services including:
+- Parsing VAPID_PRIVATE_KEY once per process instead of once per push
+- Caching the signed VAPID headers per push service origin, re-signing
+  only shortly before the JWT expires
+- Reusing one pooled requests session, sized to PUSH_WORKERS, so a burst
+  of reminders keeps its connections to each push service open
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from py_vapid import Vapid
+from pywebpush import WebPusher, WebPushException
+from requests.adapters import HTTPAdapter
+
+from ..utils.timing import timed
+
+_senders = {}
+_lock = threading.Lock()
+
+
+def get_push_sender() -> "PushSender":
+    """
+    Return the shared PushSender for the current VAPID settings.
+
+    One sender per (key, subject, pool size) is created on first use and
+    reused for the life of the process.
+    """
+    key = (
+        settings.VAPID_PRIVATE_KEY,
+        settings.VAPID_ADMIN_EMAIL,
+        settings.PUSH_WORKERS,
+    )
+    sender = _senders.get(key)
+    if sender is None:
+        with _lock:
+            sender = _senders.get(key)
+            if sender is None:
+                sender = _senders[key] = PushSender(*key)
+    return sender
+
+
+def reset_push_senders() -> None:
+    """Close and forget every shared sender."""
+    with _lock:
+        for sender in _senders.values():
+            sender.close()
+        _senders.clear()
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting.startswith("VAPID_") or setting == "PUSH_WORKERS":
+        reset_push_senders()
+
+
+class PushSender:
+    """Signs and sends Web Push requests, reusing the key, signatures and connections.
+
+    Safe to share between threads.
+    """
+
+    # Lifetime of each signed JWT; push services reject anything over 24 hours
+    TOKEN_LIFETIME = 12 * 60 * 60
+    # Re-sign this long before expiry, so a token never expires in flight
+    REFRESH_MARGIN = 10 * 60
+
+    def __init__(self, private_key: str, subject: str, pool_size: int = 10):
+        self.private_key = private_key
+        self.subject = subject
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.signatures = 0
+        self._vapid = None
+        self._headers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def vapid(self) -> Vapid:
+        """The parsed VAPID key, loaded on first use."""
+        if self._vapid is None:
+            with self._lock:
+                if self._vapid is None:
+                    if os.path.isfile(self.private_key):
+                        self._vapid = Vapid.from_file(private_key_file=self.private_key)
+                    else:
+                        self._vapid = Vapid.from_string(private_key=self.private_key)
+        return self._vapid
+
+    @staticmethod
+    def origin(endpoint: str) -> str:
+        """Return the scheme://host[:port] a push endpoint's JWT is scoped to."""
+        url = urlparse(endpoint)
+        return f"{url.scheme}://{url.netloc}"
+
+    def vapid_headers(self, endpoint: str) -> Dict[str, str]:
+        """
+        Return the VAPID Authorization headers for a push endpoint.
+
+        Headers are signed once per push service origin and reused until
+        REFRESH_MARGIN before their JWT expires.
+
+        Args:
+            endpoint: The subscription's push endpoint URL
+
+        Returns:
+            Dict of headers to add to the push request
+        """
+        aud = self.origin(endpoint)
+        now = int(time.time())
+        cached = self._headers.get(aud)
+        if cached is not None and cached[0] - self.REFRESH_MARGIN > now:
+            return cached[1]
+
+        vapid = self.vapid
+        with self._lock:
+            cached = self._headers.get(aud)
+            if cached is not None and cached[0] - self.REFRESH_MARGIN > now:
+                return cached[1]
+            exp = now + self.TOKEN_LIFETIME
+            headers = vapid.sign({"sub": self.subject, "aud": aud, "exp": exp})
+            self._headers[aud] = (exp, headers)
+            self.signatures += 1
+        return headers
+
+    def send(
+        self,
+        subscription_info: dict,
+        data: Optional[str] = None,
+        timeout: Optional[float] = None,
+        ttl: int = 0,
+    ) -> requests.Response:
+        """
+        Encrypt and send one push notification.
+
+        Args:
+            subscription_info: The subscription's endpoint and keys
+            data: Serialized payload to send
+            timeout: Seconds to wait on the push service
+            ttl: Seconds the push service should hold an undeliverable message
+
+        Returns:
+            The push service's response
+
+        Raises:
+            WebPushException: If the push service rejects the message
+        """
+        headers = dict(self.vapid_headers(subscription_info["endpoint"]))
+        with timed("http-out"):
+            response = WebPusher(subscription_info, requests_session=self.session).send(
+                data, headers, ttl=ttl, timeout=timeout
+            )
+        if response.status_code > 202:
+            raise WebPushException(
+                f"Push failed: {response.status_code} {response.reason}\n"
+                f"Response body:{response.text}",
+                response=response,
+            )
+        return response
+
+    def close(self) -> None:
+        self.session.close()
@@ -12,9 +12,10 @@ from decimal import Decimal
 from typing import List, Optional, Set
 
 from django.contrib.auth.models import User
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 
-from ..models import Recipe, Tag
+from ..models import Recipe, RecipeIngredient, Tag
+from ..utils.conversions import combine_quantities, unit_group
 
 
 class RecipeService:
@@ -33,7 +34,7 @@ class RecipeService:
 
         Args:
             user: The user whose recipes to retrieve
-            query: Search query for title/ingredients
+            query: Search query for title/ingredients, ranked by relevance
             tag_id: Filter by tag ID
             favourites_only: Show only favourited recipes
 
@@ -44,9 +45,7 @@ class RecipeService:
 
         # Apply search filter
         if query:
-            recipes = recipes.filter(
-                Q(title__icontains=query) | Q(ingredients_text__icontains=query)
-            )
+            recipes = recipes.search(query)
 
         # Apply tag filter
         if tag_id:
@@ -61,8 +60,11 @@ class RecipeService:
             recipes.distinct()
             .select_related("user")
             .prefetch_related("tags", "favourited_by")
-            .order_by("-created_at")
         )
+        if query:
+            recipes = recipes.order_by("-search_rank", "-created_at")
+        else:
+            recipes = recipes.order_by("-created_at")
 
         return recipes
 
@@ -164,9 +166,20 @@ class RecipeService:
         Uses structured RecipeIngredient rows when available (with quantities,
         units, and categories). Falls back to ingredients_text lines for any
         recipe that has no structured ingredients at all.
+
+        All RecipeIngredient rows for the selected recipes are fetched in a
+        single query, so the query count stays constant however many meals
+        are selected. A recipe listed more than once (planned on several
+        days) contributes its quantities once per occurrence.
+
+        Quantities of the same ingredient in compatible units (e.g. g and kg,
+        tsp and tbsp) are merged into one entry and shown in a sensible
+        display unit; see utils.conversions.
         """
         from collections import defaultdict
 
+        recipes = list(recipes)
+
         aggregated = defaultdict(
             lambda: {
                 "ingredient": None,
@@ -178,24 +191,28 @@ class RecipeService:
             }
         )
 
+        quantity_parts = defaultdict(list)
         text_items = []
 
+        rows_by_recipe = defaultdict(list)
+        if recipes:
+            for ri in RecipeIngredient.objects.filter(
+                recipe_id__in={r.pk for r in recipes}
+            ).select_related("ingredient"):
+                rows_by_recipe[ri.recipe_id].append(ri)
+
         for recipe in recipes:
-            structured = list(
-                recipe.recipe_ingredients.select_related("ingredient").all()
-            )
+            structured = rows_by_recipe.get(recipe.pk, [])
             structured_names = set()
 
             # Always include structured ingredients
             for ri in structured:
-                key = (ri.ingredient_id, ri.unit)
+                key = (ri.ingredient_id, unit_group(ri.unit))
                 entry = aggregated[key]
                 entry["ingredient"] = ri.ingredient
                 entry["ingredient_name"] = ri.ingredient.name
                 entry["category"] = ri.ingredient.category
-                if ri.quantity:
-                    entry["total_quantity"] += ri.quantity
-                entry["unit"] = ri.unit
+                quantity_parts[key].append((ri.quantity, ri.unit))
                 entry["recipes"].add(recipe.title)
                 structured_names.add(ri.ingredient.name.lower())
 
@@ -221,6 +238,11 @@ class RecipeService:
                         }
                     )
 
+        for key, entry in aggregated.items():
+            entry["total_quantity"], entry["unit"] = combine_quantities(
+                quantity_parts[key]
+            )
+
         result = sorted(
             aggregated.values(),
             key=lambda x: (x["category"], x["ingredient_name"]),
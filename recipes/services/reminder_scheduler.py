@@ -0,0 +1,176 @@
+"""
+Reminder Scheduler - Fires each user's dinner reminder at its reminder_time.
+
+This module encapsulates the long-running reminder process including:
+- An in-memory min-heap of every user's next reminder, so waking up for the
+  next one costs no database work
+- Rebuilding the heap when MealPlannerPreferences change (detected with one
+  cheap aggregate query) and on a fixed refresh interval
+- Sending reminders that came due while the process was down, within a
+  grace period, instead of relying on a cron tick landing in a window
+- Claiming every reminder in ReminderLog before it is sent, so a user is
+  reminded at most once a day however often the process restarts
+"""
+
+import heapq
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from ..models import MealPlannerPreferences, ReminderLog
+from .reminder_service import ReminderService
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderScheduler:
+    """Keeps a heap of upcoming reminders and dispatches them as they come due."""
+
+    def __init__(
+        self,
+        grace: Optional[float] = None,
+        refresh_interval: Optional[float] = None,
+        poll_interval: float = 30.0,
+    ):
+        """
+        Args:
+            grace: Seconds after its time a missed reminder is still sent
+                (defaults to settings.REMINDER_GRACE)
+            refresh_interval: Seconds between full heap rebuilds (defaults to
+                settings.REMINDER_REFRESH_INTERVAL)
+            poll_interval: Seconds between checks for preference changes
+        """
+        self.grace = timedelta(
+            seconds=settings.REMINDER_GRACE if grace is None else grace
+        )
+        self.refresh_interval = timedelta(
+            seconds=(
+                settings.REMINDER_REFRESH_INTERVAL
+                if refresh_interval is None
+                else refresh_interval
+            )
+        )
+        self.poll_interval = poll_interval
+        self.heap: List[Tuple[datetime, int, time]] = []
+        self._version = None
+        self._loaded_at = None
+
+    @staticmethod
+    def due_at(day: date, reminder_time: time) -> datetime:
+        """Return the aware local datetime of a reminder_time on day."""
+        return timezone.make_aware(datetime.combine(day, reminder_time))
+
+    @staticmethod
+    def preferences_version() -> tuple:
+        """Summarize MealPlannerPreferences so any edit, add or delete changes it."""
+        stats = MealPlannerPreferences.objects.aggregate(
+            count=Count("pk"), latest=Max("updated_at")
+        )
+        return stats["count"], stats["latest"]
+
+    def load(self, now: datetime) -> None:
+        """
+        Rebuild the heap with every user's next reminder after now.
+
+        A reminder earlier today is kept if it is still within the grace
+        period and the user hasn't been sent one today; otherwise it moves to
+        tomorrow. Log rows older than a week are pruned.
+        """
+        today = now.date()
+        sent_today = set(
+            ReminderLog.objects.filter(date=today).values_list("user_id", flat=True)
+        )
+        heap = []
+        for user_id, reminder_time in MealPlannerPreferences.objects.values_list(
+            "user_id", "reminder_time"
+        ):
+            due = self.due_at(today, reminder_time)
+            if user_id in sent_today or due < now - self.grace:
+                due = self.due_at(today + timedelta(days=1), reminder_time)
+            heap.append((due, user_id, reminder_time))
+        heapq.heapify(heap)
+        self.heap = heap
+        self._version = self.preferences_version()
+        self._loaded_at = now
+        ReminderLog.objects.filter(date__lt=today - timedelta(days=7)).delete()
+
+    def refresh_if_needed(self, now: datetime) -> bool:
+        """Reload the heap if it is stale or preferences changed; True if reloaded."""
+        if (
+            self._loaded_at is None
+            or now - self._loaded_at >= self.refresh_interval
+            or self.preferences_version() != self._version
+        ):
+            self.load(now)
+            return True
+        return False
+
+    def pop_due(self, now: datetime) -> dict:
+        """
+        Take every reminder due by now off the heap, rescheduling each for tomorrow.
+
+        Returns:
+            Map of reminder date to the user ids due that day; reminders
+            missed by more than the grace period are dropped
+        """
+        due_by_day = {}
+        while self.heap and self.heap[0][0] <= now:
+            due, user_id, reminder_time = heapq.heappop(self.heap)
+            day = timezone.localtime(due).date()
+            if now - due <= self.grace:
+                due_by_day.setdefault(day, []).append(user_id)
+            heapq.heappush(
+                self.heap,
+                (
+                    self.due_at(day + timedelta(days=1), reminder_time),
+                    user_id,
+                    reminder_time,
+                ),
+            )
+        return due_by_day
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """
+        Refresh the heap if needed and send every reminder due by now.
+
+        Returns:
+            Number of pushes sent
+        """
+        now = now or timezone.localtime()
+        self.refresh_if_needed(now)
+        sent = 0
+        for day, user_ids in self.pop_due(now).items():
+            reminders = ReminderService.reminders_for_users(user_ids, day)
+            result = ReminderService.dispatch(reminders)
+            for sub, error in result["failed"]:
+                logger.warning("Push failed for %s: %s", sub.user.username, error)
+            sent += len(result["sent"])
+        return sent
+
+    def seconds_until_next(self, now: datetime) -> float:
+        """Seconds to sleep before the next reminder or preferences check."""
+        wait = self.poll_interval
+        if self.heap:
+            wait = min(wait, (self.heap[0][0] - now).total_seconds())
+        return max(wait, 0.0)
+
+    def run(self, stop_event: threading.Event) -> int:
+        """
+        Fire reminders until stop_event is set.
+
+        Returns:
+            Total pushes sent
+        """
+        sent = 0
+        while not stop_event.is_set():
+            try:
+                sent += self.tick()
+            except Exception:
+                logger.exception("Reminder scheduler tick failed")
+            stop_event.wait(self.seconds_until_next(timezone.localtime()))
+        return sent
@@ -0,0 +1,239 @@
+"""
+Reminder Service - Sends the daily dinner reminder push notifications.
+
+This service encapsulates reminder dispatch including:
+- Loading the users due a reminder, their household's dinner and their push
+  subscriptions in a fixed number of set-based queries
+- Logging each reminder in ReminderLog so a user gets at most one a day
+- Sending the pushes concurrently through a bounded thread pool, with a
+  timeout on every push service request
+- Deleting subscriptions the push service reports as expired in one statement
+"""
+
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from pywebpush import WebPushException
+
+from ..models import (
+    HouseholdMembership,
+    MealPlan,
+    MealPlannerPreferences,
+    PushSubscription,
+    ReminderLog,
+)
+from ..utils import metrics
+from .push_sender import get_push_sender
+
+# A push service answers 404/410 for subscriptions that no longer exist
+EXPIRED_STATUS_CODES = (404, 410)
+
+
+class ReminderService:
+    """Service for dispatching dinner reminder push notifications."""
+
+    @staticmethod
+    def reminder_window(now: datetime) -> Tuple:
+        """Return the (start, end) reminder_time range due at now."""
+        return (
+            (now - timedelta(minutes=2)).time(),
+            (now + timedelta(minutes=3)).time(),
+        )
+
+    @staticmethod
+    def build_payload(meal: MealPlan) -> str:
+        """Build the JSON notification body for a planned dinner."""
+        cook_time = f" ({meal.recipe.cook_time} min)" if meal.recipe.cook_time else ""
+        return json.dumps(
+            {
+                "title": "Tonight's Dinner",
+                "body": f"{meal.recipe.title}{cook_time}",
+                "url": "/week/",
+            }
+        )
+
+    @staticmethod
+    def due_user_ids(now: datetime) -> List[int]:
+        """Return the users whose reminder_time falls in the window around now."""
+        window_start, window_end = ReminderService.reminder_window(now)
+        return list(
+            MealPlannerPreferences.objects.filter(
+                reminder_time__gte=window_start,
+                reminder_time__lte=window_end,
+            ).values_list("user_id", flat=True)
+        )
+
+    @staticmethod
+    def claim(user_ids: Iterable[int], day: date) -> Set[int]:
+        """
+        Record that these users are being sent their reminder for day.
+
+        Users already logged for day are skipped, so concurrent or repeated
+        runs never send a user two reminders on the same date.
+
+        Args:
+            user_ids: Users about to be sent a reminder
+            day: The date the reminders are for
+
+        Returns:
+            The ids this call logged, i.e. the users it should send to
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        token = uuid.uuid4().hex
+        ReminderLog.objects.bulk_create(
+            [
+                ReminderLog(user_id=user_id, date=day, claimed_by=token)
+                for user_id in user_ids
+            ],
+            ignore_conflicts=True,
+        )
+        return set(
+            ReminderLog.objects.filter(date=day, claimed_by=token).values_list(
+                "user_id", flat=True
+            )
+        )
+
+    @staticmethod
+    def reminders_for_users(
+        user_ids: Iterable[int], day: date
+    ) -> List[Tuple[PushSubscription, str]]:
+        """
+        Build the pushes to send these users for their household's dinner on day.
+
+        Users with no household or no dinner planned are skipped; the rest
+        are claimed in the reminder log first, so a user already reminded
+        that day is skipped too. Runs a fixed number of queries however many
+        users are given.
+
+        Args:
+            user_ids: Users whose reminder is due
+            day: The date of the dinner to remind them about
+
+        Returns:
+            List of (subscription, payload) pairs
+        """
+        household_by_user = dict(
+            HouseholdMembership.objects.filter(user_id__in=list(user_ids)).values_list(
+                "user_id", "household_id"
+            )
+        )
+        if not household_by_user:
+            return []
+
+        payload_by_household = {
+            meal.household_id: ReminderService.build_payload(meal)
+            for meal in MealPlan.objects.filter(
+                household_id__in=set(household_by_user.values()),
+                date=day,
+                meal_type="dinner",
+            ).select_related("recipe")
+        }
+        payload_by_user = {
+            user_id: payload_by_household[household_id]
+            for user_id, household_id in household_by_user.items()
+            if household_id in payload_by_household
+        }
+        claimed = ReminderService.claim(payload_by_user, day)
+        if not claimed:
+            return []
+
+        subscriptions = PushSubscription.objects.filter(
+            user_id__in=claimed
+        ).select_related("user")
+        return [(sub, payload_by_user[sub.user_id]) for sub in subscriptions]
+
+    @staticmethod
+    def due_reminders(now: datetime) -> List[Tuple[PushSubscription, str]]:
+        """
+        Find every push to send for reminders due in the window around now.
+
+        Args:
+            now: The current local time
+
+        Returns:
+            List of (subscription, payload) pairs
+        """
+        return ReminderService.reminders_for_users(
+            ReminderService.due_user_ids(now), now.date()
+        )
+
+    @staticmethod
+    def send_push(
+        subscription: PushSubscription, payload: str, timeout: Optional[float] = None
+    ) -> None:
+        """Send one push notification, raising WebPushException on failure."""
+        get_push_sender().send(
+            subscription_info={
+                "endpoint": subscription.endpoint,
+                "keys": {"p256dh": subscription.p256dh, "auth": subscription.auth},
+            },
+            data=payload,
+            timeout=timeout,
+        )
+
+    @staticmethod
+    def dispatch(
+        reminders: List[Tuple[PushSubscription, str]],
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, list]:
+        """
+        Send reminders concurrently and remove expired subscriptions.
+
+        Only the push requests run on the pool's threads. Subscriptions the
+        push service reports as gone are deleted together once every push has
+        finished.
+
+        Args:
+            reminders: (subscription, payload) pairs from due_reminders
+            workers: Max concurrent pushes (defaults to settings.PUSH_WORKERS)
+            timeout: Seconds to wait on each push service (defaults to
+                settings.PUSH_TIMEOUT)
+
+        Returns:
+            Dict with the sent and expired subscriptions, and failed
+            (subscription, error) pairs
+        """
+        result = {"sent": [], "expired": [], "failed": []}
+        if not reminders:
+            return result
+        workers = workers or settings.PUSH_WORKERS
+        timeout = timeout or settings.PUSH_TIMEOUT
+
+        def send(reminder):
+            subscription, payload = reminder
+            try:
+                ReminderService.send_push(subscription, payload, timeout=timeout)
+            except WebPushException as e:
+                if (
+                    e.response is not None
+                    and e.response.status_code in EXPIRED_STATUS_CODES
+                ):
+                    return subscription, "expired", e
+                return subscription, "failed", e
+            except Exception as e:
+                # Timeouts, connection errors, or a key or payload the push
+                # libraries reject: the user is already logged as reminded,
+                # so report it rather than abort everyone else's pushes
+                return subscription, "failed", e
+            return subscription, "sent", None
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(reminders))) as pool:
+            for subscription, outcome, error in pool.map(send, reminders):
+                metrics.PUSH_SENDS.inc(outcome=outcome)
+                if outcome == "failed":
+                    result["failed"].append((subscription, error))
+                else:
+                    result[outcome].append(subscription)
+
+        if result["expired"]:
+            PushSubscription.objects.filter(
+                pk__in=[sub.pk for sub in result["expired"]]
+            ).delete()
+        return result
@@ -0,0 +1,162 @@
+"""
+Shopping List Service - Keeps generated shopping items in sync with the meal plan.
+
+This service encapsulates shopping list generation including:
+- Fingerprinting the selected meals so unchanged plans skip regeneration
+- Diffing the desired generated items against the stored rows
+- Writing only the inserts, updates and deletes that changed, in bulk
+"""
+
+import hashlib
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from ..models import Household, MealPlan, ShoppingListItem
+from ..utils import metrics
+from ..utils.fragments import invalidate_shopping
+from .recipe_service import RecipeService
+
+
+class ShoppingListService:
+    """Service for syncing generated shopping list items."""
+
+    SYNCED_FIELDS = ["quantity", "category", "recipe_sources", "checked"]
+
+    @staticmethod
+    def compute_fingerprint(meals: Iterable[MealPlan]) -> str:
+        """
+        Hash the inputs that determine the generated shopping list.
+
+        Each meal contributes its id, recipe id and the recipe's updated_at,
+        so adding, removing or swapping a meal, or editing a planned recipe,
+        produces a new fingerprint.
+        """
+        parts = sorted(
+            f"{meal.pk}:{meal.recipe_id}:{meal.recipe.updated_at.isoformat()}"
+            for meal in meals
+        )
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def format_quantity(item: dict) -> str:
+        """Format an aggregated item's quantity and unit for display, e.g. '1.5 kg'."""
+        qty_parts = []
+        if item.get("total_quantity"):
+            qty_parts.append(f"{float(item['total_quantity']):g}")
+        if item.get("unit"):
+            qty_parts.append(item["unit"])
+        return " ".join(qty_parts)
+
+    @staticmethod
+    def sync_generated_items(
+        household: Household,
+        user: User,
+        meal_ids: List[int],
+        force: bool = False,
+    ) -> Optional[Dict[str, int]]:
+        """
+        Bring the household's generated ShoppingListItems in line with the given meals.
+
+        Manual items are never touched. Generated rows are matched to the
+        desired items by name, so a row that is still needed keeps its pk and
+        checked state; checked is only cleared when the quantity changes.
+
+        Args:
+            household: The household whose list to sync
+            user: The user triggering the sync (recorded on new rows)
+            meal_ids: MealPlan IDs to build the list from
+            force: Sync even if the meal fingerprint is unchanged
+
+        Returns:
+            Dict of created/updated/deleted counts, or None if the sync was
+            skipped because the meal plan hasn't changed since the last one.
+        """
+        start = time.perf_counter()
+        meals = list(
+            MealPlan.objects.filter(household=household, pk__in=meal_ids)
+            .select_related("recipe")
+            .order_by("date", "meal_type")
+        )
+        fingerprint = ShoppingListService.compute_fingerprint(meals)
+        if not force and fingerprint == household.shopping_fingerprint:
+            metrics.SHOPPING_SYNCS.inc(result="skipped")
+            return None
+
+        recipes = [m.recipe for m in meals]
+        desired = (
+            RecipeService.generate_structured_shopping_list(recipes) if recipes else []
+        )
+
+        existing = ShoppingListItem.objects.filter(
+            household=household, is_generated=True
+        ).order_by("pk")
+        rows_by_name = defaultdict(list)
+        for row in existing:
+            rows_by_name[row.name].append(row)
+
+        to_create = []
+        to_update = []
+        for item in desired:
+            name = item["ingredient_name"]
+            quantity = ShoppingListService.format_quantity(item)
+            category = item.get("category") or "other"
+            recipe_sources = ", ".join(sorted(item.get("recipes", set())))
+
+            matches = rows_by_name.get(name)
+            if not matches:
+                to_create.append(
+                    ShoppingListItem(
+                        household=household,
+                        added_by=user,
+                        name=name,
+                        quantity=quantity,
+                        category=category,
+                        recipe_sources=recipe_sources,
+                        is_generated=True,
+                    )
+                )
+                continue
+
+            row = matches.pop(0)
+            changed = False
+            if row.quantity != quantity:
+                row.quantity = quantity
+                row.checked = False
+                changed = True
+            if row.category != category:
+                row.category = category
+                changed = True
+            if row.recipe_sources != recipe_sources:
+                row.recipe_sources = recipe_sources
+                changed = True
+            if changed:
+                to_update.append(row)
+
+        stale_ids = [row.pk for rows in rows_by_name.values() for row in rows]
+
+        with transaction.atomic():
+            if stale_ids:
+                ShoppingListItem.objects.filter(pk__in=stale_ids).delete()
+            if to_update:
+                ShoppingListItem.objects.bulk_update(
+                    to_update, ShoppingListService.SYNCED_FIELDS
+                )
+            if to_create:
+                ShoppingListItem.objects.bulk_create(to_create)
+            household.shopping_fingerprint = fingerprint
+            household.save(update_fields=["shopping_fingerprint"])
+        if stale_ids or to_update or to_create:
+            # The bulk writes above skip ShoppingListItem's signals
+            invalidate_shopping([household.pk])
+
+        metrics.SHOPPING_SYNC_DURATION.observe(time.perf_counter() - start)
+        metrics.SHOPPING_SYNCS.inc(result="synced")
+        return {
+            "created": len(to_create),
+            "updated": len(to_update),
+            "deleted": len(stale_ids),
+        }
@@ -1,8 +1,36 @@
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import Recipe
+from .models import (
+    CookingNote,
+    DayComment,
+    Household,
+    HouseholdMembership,
+    Ingredient,
+    MealPlan,
+    MealPlanTemplate,
+    MealPlanTemplateEntry,
+    Recipe,
+    RecipeIngredient,
+    ShoppingListItem,
+    refresh_household_recipes,
+    refresh_recipe_stats,
+    refresh_search_documents,
+)
+from .models.household import invalidate_household_cache
+from .utils.fragments import (
+    invalidate_fragments,
+    invalidate_shopping,
+    recipe_households,
+)
+
+
+def _deleted_directly(origin, model):
+    """True if .delete() was called on this model, not cascaded from a parent."""
+    # origin is the model instance or queryset .delete() was called on
+    return getattr(origin, "model", type(origin)) is model
 
 
 @receiver(post_save, sender=User)
@@ -36,3 +64,213 @@ def create_demo_recipes(sender, instance, created, **kwargs):
                 cook_time=0,
                 source="manual",
             )
+
+
+@receiver(post_save, sender=CookingNote)
+@receiver(post_delete, sender=CookingNote)
+def update_recipe_stats(sender, instance, **kwargs):
+    """Keep RecipeStats/UserRecipeStats in step with CookingNote writes."""
+    refresh_recipe_stats(instance.recipe_id, instance.user_id)
+    # Drop a stale stats row cached on a recipe instance the caller still holds
+    if CookingNote.recipe.is_cached(instance):
+        stats_rel = Recipe._meta.get_field("stats")
+        if stats_rel.is_cached(instance.recipe):
+            stats_rel.delete_cached_value(instance.recipe)
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipe_search_document(sender, instance, **kwargs):
+    """Reindex a recipe whenever it is saved."""
+    refresh_search_documents([instance.pk])
+
+
+@receiver(post_save, sender=RecipeIngredient)
+def update_search_document_on_ingredient_save(sender, instance, **kwargs):
+    """Reindex the recipe when one of its structured ingredients is saved."""
+    refresh_search_documents([instance.recipe_id])
+
+
+@receiver(post_delete, sender=RecipeIngredient)
+def update_search_document_on_ingredient_delete(sender, instance, origin, **kwargs):
+    """Reindex the recipe when one of its structured ingredients is removed.
+
+    Deletes cascading from a recipe or user are skipped: the recipe and its
+    search document are going away too, and recreating the document mid
+    cascade would violate its foreign key.
+    """
+    if _deleted_directly(origin, RecipeIngredient) or _deleted_directly(
+        origin, Ingredient
+    ):
+        refresh_search_documents([instance.recipe_id])
+
+
+@receiver(post_save, sender=Ingredient)
+def update_search_documents_for_ingredient(sender, instance, created, **kwargs):
+    """Reindex every recipe using an ingredient whose name may have changed."""
+    if created:
+        return
+    refresh_search_documents(
+        RecipeIngredient.objects.filter(ingredient=instance)
+        .values_list("recipe_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipe_visibility(sender, instance, created, **kwargs):
+    """Re-share (or un-share) a recipe into its owner's household."""
+    if created and not instance.shared:
+        return  # a brand-new private recipe can't be shared or planned yet
+    refresh_household_recipes([instance.pk])
+
+
+def _refresh_member_recipes(membership):
+    refresh_household_recipes(
+        Recipe.objects.filter(user_id=membership.user_id, shared=True).values_list(
+            "pk", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=HouseholdMembership)
+def update_visibility_for_membership(sender, instance, **kwargs):
+    """Move a member's shared recipes into the household they joined."""
+    _refresh_member_recipes(instance)
+
+
+@receiver(post_delete, sender=HouseholdMembership)
+def update_visibility_for_departed_member(sender, instance, origin, **kwargs):
+    """Withdraw a member's shared recipes when they leave a household.
+
+    Deletes cascading from the user or household are skipped; the same
+    cascade removes their recipes or the household's links.
+    """
+    if _deleted_directly(origin, HouseholdMembership):
+        _refresh_member_recipes(instance)
+
+
+@receiver(pre_save, sender=MealPlan)
+def remember_planned_recipe(sender, instance, **kwargs):
+    """Record the recipe a meal is being moved off, so it can be refreshed too."""
+    instance._previous_recipe_id = (
+        MealPlan.objects.filter(pk=instance.pk)
+        .values_list("recipe_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=MealPlan)
+def update_visibility_for_meal(sender, instance, **kwargs):
+    """Expose a planned recipe to the household (and drop a replaced one)."""
+    recipe_ids = {instance.recipe_id}
+    previous = getattr(instance, "_previous_recipe_id", None)
+    if previous is not None:
+        recipe_ids.add(previous)
+    refresh_household_recipes(recipe_ids)
+
+
+@receiver(post_delete, sender=MealPlan)
+def update_visibility_for_removed_meal(sender, instance, origin, **kwargs):
+    """Drop the planned link once a recipe is off the household's plan."""
+    if _deleted_directly(origin, MealPlan):
+        refresh_household_recipes([instance.recipe_id])
+
+
+@receiver(post_save, sender=HouseholdMembership)
+@receiver(post_delete, sender=HouseholdMembership)
+def invalidate_cached_membership(sender, instance, **kwargs):
+    """Drop the member's cached household after they join, move or leave."""
+    invalidate_household_cache([instance.user_id])
+
+
+@receiver(post_save, sender=Household)
+def invalidate_cached_household(sender, instance, created, **kwargs):
+    """Drop every member's cached copy after the household itself changes."""
+    if created or not settings.HOUSEHOLD_CACHE_TIMEOUT:
+        return
+    invalidate_household_cache(instance.members.values_list("user_id", flat=True))
+
+
+# Fragment cache versions. Registered last, so the HouseholdRecipe rows
+# recipe_households() reads are already current.
+
+
+@receiver(post_save, sender=Household)
+def reset_fragment_version(sender, instance, created, **kwargs):
+    """Start a new household with fresh versions, whatever its id held before."""
+    if created:
+        invalidate_fragments([instance.pk])
+        invalidate_shopping([instance.pk])
+
+
+@receiver(post_save, sender=MealPlan)
+@receiver(post_delete, sender=MealPlan)
+@receiver(post_save, sender=DayComment)
+@receiver(post_delete, sender=DayComment)
+@receiver(post_save, sender=MealPlanTemplate)
+@receiver(post_delete, sender=MealPlanTemplate)
+@receiver(post_save, sender=HouseholdMembership)
+@receiver(post_delete, sender=HouseholdMembership)
+def invalidate_household_fragments(sender, instance, **kwargs):
+    """Re-render a household's cards after its plan, notes, templates or members change."""
+    invalidate_fragments([instance.household_id])
+
+
+@receiver(post_save, sender=MealPlanTemplateEntry)
+def invalidate_fragments_for_template_entry(sender, instance, **kwargs):
+    """Entries are added after their template is saved; re-render its picker."""
+    invalidate_fragments([instance.template.household_id])
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe_fragments(sender, instance, origin=None, **kwargs):
+    """Re-render every household that can see a recipe after it changes.
+
+    Deletes cascading from the owner are skipped; their membership and meal
+    plans go too, and those deletes invalidate the households.
+    """
+    if origin is None or _deleted_directly(origin, Recipe):
+        invalidate_fragments(recipe_households([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.favourited_by.through)
+def invalidate_fragments_for_recipe_links(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Recipe cards show tags and recipe pages favourites; re-render on changes."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    recipe_ids = (pk_set or ()) if reverse else [instance.pk]
+    if recipe_ids:
+        invalidate_fragments(recipe_households(recipe_ids))
+
+
+@receiver(post_save, sender=CookingNote)
+@receiver(post_delete, sender=CookingNote)
+def invalidate_fragments_for_rating(sender, instance, origin=None, **kwargs):
+    """Cards show a recipe's rating and times cooked, which notes change."""
+    if origin is None or not _deleted_directly(origin, Recipe):
+        invalidate_fragments(recipe_households([instance.recipe_id]))
+
+
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+def invalidate_fragments_for_ingredient_line(sender, instance, origin=None, **kwargs):
+    """Recipe pages list their ingredients, so change their households' ETags."""
+    if origin is None or _deleted_directly(origin, RecipeIngredient):
+        invalidate_fragments(recipe_households([instance.recipe_id]))
+
+
+@receiver(post_save, sender=ShoppingListItem)
+def invalidate_shopping_list(sender, instance, **kwargs):
+    """Change the shop page's ETag after an item is added, ticked or edited.
+
+    Items are only deleted by ShoppingListService.sync_generated_items,
+    which invalidates itself; a post_delete receiver here would stop its
+    bulk delete from running as a single query.
+    """
+    invalidate_shopping([instance.household_id])
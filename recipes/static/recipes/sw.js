@@ -1,4 +1,4 @@
-const CACHE_NAME = 'meal-planner-v3';
+const CACHE_NAME = 'meal-planner-v4';
 const STATIC_ASSETS = [
     '/static/recipes/css/app.css',
     '/static/recipes/js/app.js',
@@ -52,23 +52,7 @@ self.addEventListener('fetch', event => {
 
     // HTML pages: network-first, cache recipe and week pages
     if (event.request.mode === 'navigate' || event.request.headers.get('accept')?.includes('text/html')) {
-        event.respondWith(
-            fetch(event.request).then(response => {
-                // Cache recipe detail pages, week view, and home for offline
-                if (response.ok && (url.pathname.match(/^\/recipes\/\d+\/$/) || url.pathname === '/week/' || url.pathname === '/')) {
-                    const clone = response.clone();
-                    caches.open(CACHE_NAME).then(cache => cache.put(event.request, clone));
-                }
-                return response;
-            }).catch(() => {
-                // Offline: try cache first
-                return caches.match(event.request).then(cached => {
-                    if (cached) return cached;
-                    // Offline fallback page
-                    return caches.match('/offline/');
-                });
-            })
-        );
+        event.respondWith(fetchPage(event.request, url));
         return;
     }
 
@@ -78,6 +62,47 @@ self.addEventListener('fetch', event => {
     );
 });
 
+// Cache recipe detail pages, week view, and home for offline
+function isOfflinePage(url) {
+    return url.pathname.match(/^\/recipes\/\d+\/$/) || url.pathname === '/week/' || url.pathname === '/';
+}
+
+// Copy a request, asking the server to answer 304 if the page still has this ETag
+function withETag(request, etag) {
+    const headers = new Headers(request.headers);
+    headers.set('If-None-Match', etag);
+    if (request.mode === 'navigate') {
+        // Navigation requests can't be copied with changes
+        return new Request(request.url, { headers, credentials: 'include', redirect: 'manual' });
+    }
+    return new Request(request, { headers });
+}
+
+// Network-first page fetch. The stored copy's ETag is sent along, so an
+// unchanged page comes back as an empty 304 and the copy is served instead.
+function fetchPage(request, url) {
+    return caches.open(CACHE_NAME).then(cache =>
+        (isOfflinePage(url) ? cache.match(request) : Promise.resolve()).then(cached => {
+            const etag = cached?.headers.get('ETag');
+            return fetch(etag ? withETag(request, etag) : request).then(response => {
+                if (response.status === 304 && cached) return cached;
+                if (response.ok && isOfflinePage(url)) {
+                    cache.put(request, response.clone());
+                }
+                return response;
+            }).catch(() => {
+                // Offline: try cache first
+                if (cached) return cached;
+                return caches.match(request).then(stored => {
+                    if (stored) return stored;
+                    // Offline fallback page
+                    return caches.match('/offline/');
+                });
+            });
+        })
+    );
+}
+
 // Push notification handler
 self.addEventListener('push', event => {
     const data = event.data ? event.data.json() : {};
@@ -1,8 +1,9 @@
 import hashlib
 
-import anthropic
 from django import template
-from django.conf import settings
+
+from recipes.services.ai_client import get_client
+from recipes.utils.timing import timed
 
 register = template.Library()
 
@@ -49,14 +50,15 @@ def ai_generate_surprise_recipe():
         "Include a title, ingredients, and clear steps. Format as:\n"
         "Title:\nIngredients:\nSteps:"
     )
-    client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-    response = client.messages.create(
-        model="claude-haiku-4-5",
-        max_tokens=4096,
-        system="You're a helpful chef assistant.",
-        messages=[
-            {"role": "user", "content": prompt},
-        ],
-    )
+    client = get_client()
+    with timed("ai"):
+        response = client.messages.create(
+            model="claude-haiku-4-5",
+            max_tokens=4096,
+            system="You're a helpful chef assistant.",
+            messages=[
+                {"role": "user", "content": prompt},
+            ],
+        )
     content = next((b.text for b in response.content if b.type == "text"), "")
     return content.strip() if content else None
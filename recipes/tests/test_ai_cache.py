@@ -0,0 +1,147 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from recipes.models import AIResponseCache
+from recipes.services.ai_cache import AICache
+from recipes.services.ai_service import AIAPIError, AIService
+from recipes.tests.test_import_url import page_response
+
+RECIPE_JSON = '{"title": "Pasta", "ingredients": [], "steps": ["Boil"]}'
+
+
+def mock_client_returning(text):
+    block = MagicMock()
+    block.type = "text"
+    block.text = text
+    client = MagicMock()
+    client.messages.create.return_value.content = [block]
+    return client
+
+
+class AICacheNormalizationTest(TestCase):
+    """Tests for AICache key normalization."""
+
+    def test_normalize_prompt(self):
+        self.assertEqual(
+            AICache.normalize_prompt("  Chicken   and\nRICE "), "chicken and rice"
+        )
+
+    def test_normalize_url(self):
+        self.assertEqual(
+            AICache.normalize_url(
+                "HTTPS://Example.COM:443/recipes/pasta/?b=2&utm_source=x&a=1#method"
+            ),
+            "https://example.com/recipes/pasta?a=1&b=2",
+        )
+
+    def test_normalize_url_keeps_meaningful_parts(self):
+        self.assertEqual(
+            AICache.normalize_url("http://example.com:8000/?id=7"),
+            "http://example.com:8000/?id=7",
+        )
+
+    def test_key_depends_on_system_prompt_and_model(self):
+        base = AICache.key("structured_recipe", "model-a", "system", "pasta")
+        self.assertNotEqual(
+            base, AICache.key("structured_recipe", "model-a", "other", "pasta")
+        )
+        self.assertNotEqual(
+            base, AICache.key("structured_recipe", "model-b", "system", "pasta")
+        )
+        self.assertEqual(len(base), 64)
+
+
+@override_settings(ANTHROPIC_API_KEY="test-key", AI_CACHE_TTL=3600)
+class AICacheTest(TestCase):
+    """Tests for caching AI responses."""
+
+    def setUp(self):
+        patcher = patch("recipes.services.ai_service.get_client")
+        self.get_client = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client_mock = mock_client_returning(RECIPE_JSON)
+        self.get_client.return_value = self.client_mock
+
+    def test_equivalent_prompts_call_ai_once(self):
+        first = AIService.generate_structured_recipe("Chicken and rice")
+        second = AIService.generate_structured_recipe("  chicken AND rice ")
+        self.assertEqual(first, second)
+        self.assertEqual(self.client_mock.messages.create.call_count, 1)
+        entry = AIResponseCache.objects.get()
+        self.assertEqual(entry.kind, "structured_recipe")
+        self.assertEqual(entry.hits, 1)
+
+    def test_bypass_always_calls_ai(self):
+        AIService.generate_structured_recipe("pasta", use_cache=False)
+        AIService.generate_structured_recipe("pasta", use_cache=False)
+        self.assertEqual(self.client_mock.messages.create.call_count, 2)
+        self.assertFalse(AIResponseCache.objects.exists())
+
+    @override_settings(AI_CACHE_TTL=0)
+    def test_zero_ttl_disables_cache(self):
+        AIService.generate_structured_recipe("pasta")
+        AIService.generate_structured_recipe("pasta")
+        self.assertEqual(self.client_mock.messages.create.call_count, 2)
+
+    def test_expired_entries_are_refreshed(self):
+        AIService.generate_structured_recipe("pasta")
+        AIResponseCache.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        AIService.generate_structured_recipe("pasta")
+        self.assertEqual(self.client_mock.messages.create.call_count, 2)
+        self.assertEqual(AIResponseCache.objects.count(), 1)
+
+    @override_settings(AI_CACHE_MAX_ENTRIES=2)
+    def test_least_recently_used_entries_are_evicted(self):
+        AIService.generate_structured_recipe("one")
+        AIService.generate_structured_recipe("two")
+        AIResponseCache.objects.filter(
+            key=AICache.key(
+                "structured_recipe",
+                AIService.MODEL,
+                AIService.STRUCTURED_RECIPE_SYSTEM,
+                "one",
+            )
+        ).update(last_used_at=timezone.now() - timedelta(hours=1))
+        AIService.generate_structured_recipe("three")
+        self.assertEqual(AIResponseCache.objects.count(), 2)
+        AIService.generate_structured_recipe("one")
+        self.assertEqual(self.client_mock.messages.create.call_count, 4)
+
+    def test_failures_are_not_cached(self):
+        self.client_mock.messages.create.side_effect = [
+            RuntimeError("boom"),
+            self.client_mock.messages.create.return_value,
+        ]
+        with self.assertRaises(AIAPIError):
+            AIService.generate_structured_recipe("pasta")
+        self.assertFalse(AIResponseCache.objects.exists())
+        self.assertEqual(
+            AIService.generate_structured_recipe("pasta")["title"], "Pasta"
+        )
+
+    @patch("requests.get")
+    def test_url_import_is_cached_by_normalized_url(self, mock_get):
+        mock_get.return_value = page_response(
+            "<html><body><p>"
+            + "Boil the pasta and serve it. " * 5
+            + "</p></body></html>"
+        )
+        first = AIService.import_recipe_from_url("https://example.com/pasta/")
+        second = AIService.import_recipe_from_url(
+            "https://EXAMPLE.com/pasta?utm_campaign=share"
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(self.client_mock.messages.create.call_count, 1)
+
+    @patch("requests.get")
+    def test_failed_url_fetch_is_not_cached(self, mock_get):
+        mock_get.side_effect = ConnectionError("down")
+        for _ in range(2):
+            with self.assertRaises(AIAPIError):
+                AIService.import_recipe_from_url("https://example.com/pasta")
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertFalse(AIResponseCache.objects.exists())
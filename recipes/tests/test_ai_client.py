@@ -0,0 +1,70 @@
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from recipes.services.ai_client import (
+    STUB_RECIPE,
+    get_client,
+    get_stub_server,
+    reset_clients,
+)
+from recipes.services.ai_service import AIService
+
+
+@override_settings(ANTHROPIC_API_KEY="test-key", ANTHROPIC_TRANSPORT="")
+class SharedClientTest(SimpleTestCase):
+    """Tests for the process-wide Anthropic client registry."""
+
+    def tearDown(self):
+        reset_clients()
+
+    def test_client_is_reused(self):
+        self.assertIs(get_client(), get_client())
+
+    def test_client_is_shared_across_threads(self):
+        clients = []
+        threads = [
+            threading.Thread(target=lambda: clients.append(get_client()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(client) for client in clients}), 1)
+
+    @override_settings(ANTHROPIC_MAX_RETRIES=5, ANTHROPIC_TIMEOUT=12)
+    def test_client_uses_settings(self):
+        client = get_client()
+        self.assertEqual(client.max_retries, 5)
+        self.assertEqual(client.timeout.read, 12)
+        self.assertEqual(client.api_key, "test-key")
+
+    def test_changing_settings_replaces_client(self):
+        client = get_client()
+        with self.settings(ANTHROPIC_API_KEY="other-key"):
+            other = get_client()
+            self.assertIsNot(client, other)
+            self.assertEqual(other.api_key, "other-key")
+
+
+@override_settings(ANTHROPIC_API_KEY="test-key", ANTHROPIC_TRANSPORT="stub")
+class StubTransportTest(SimpleTestCase):
+    """Tests for the offline stub transport."""
+
+    def tearDown(self):
+        reset_clients()
+
+    def test_structured_recipe_from_stub(self):
+        result = AIService.generate_structured_recipe("tomato pasta", use_cache=False)
+        self.assertEqual(result, STUB_RECIPE)
+
+    def test_connections_are_kept_alive(self):
+        for _ in range(3):
+            AIService.generate_structured_recipe("tomato pasta", use_cache=False)
+        server = get_stub_server()
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(server.connections, 1)
+
+    def test_text_endpoints_use_stub(self):
+        self.assertIn("Stub Tomato Pasta", AIService.generate_surprise_recipe())
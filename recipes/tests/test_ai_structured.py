@@ -6,8 +6,8 @@ from recipes.services.ai_service import AIService
 
 
 class AIStructuredRecipeTest(TestCase):
-    @patch("recipes.services.ai_service.anthropic")
-    def test_parse_structured_recipe(self, mock_anthropic):
+    @patch("recipes.services.ai_service.get_client")
+    def test_parse_structured_recipe(self, mock_get_client):
         mock_text_block = MagicMock()
         mock_text_block.type = "text"
         mock_text_block.text = (
@@ -19,9 +19,7 @@ class AIStructuredRecipeTest(TestCase):
         )
         mock_response = MagicMock()
         mock_response.content = [mock_text_block]
-        mock_anthropic.Anthropic.return_value.messages.create.return_value = (
-            mock_response
-        )
+        mock_get_client.return_value.messages.create.return_value = mock_response
 
         with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
             from django.conf import settings
@@ -37,8 +35,8 @@ class AIStructuredRecipeTest(TestCase):
             finally:
                 settings.ANTHROPIC_API_KEY = original
 
-    @patch("recipes.services.ai_service.anthropic")
-    def test_strips_markdown_fences(self, mock_anthropic):
+    @patch("recipes.services.ai_service.get_client")
+    def test_strips_markdown_fences(self, mock_get_client):
         mock_text_block = MagicMock()
         mock_text_block.type = "text"
         mock_text_block.text = (
@@ -46,9 +44,7 @@ class AIStructuredRecipeTest(TestCase):
         )
         mock_response = MagicMock()
         mock_response.content = [mock_text_block]
-        mock_anthropic.Anthropic.return_value.messages.create.return_value = (
-            mock_response
-        )
+        mock_get_client.return_value.messages.create.return_value = mock_response
 
         from django.conf import settings
 
@@ -0,0 +1,194 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from recipes.models import (
+    CookingNote,
+    Household,
+    MealPlan,
+    Recipe,
+    RecipeIngredient,
+    RecipeSearchDocument,
+)
+from recipes.utils.benchmark import compare, dataset_user, percentile, summarize
+from recipes.utils.seeding import DatasetSeeder
+
+
+class BenchmarkStatsTest(TestCase):
+    def test_percentile_interpolates(self):
+        values = [10, 20, 30, 40]
+        self.assertEqual(percentile(values, 0), 10)
+        self.assertEqual(percentile(values, 50), 25)
+        self.assertEqual(percentile(values, 100), 40)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_summarize(self):
+        stats = summarize([3.0, 1.0, 2.0])
+        self.assertEqual(stats["min"], 1.0)
+        self.assertEqual(stats["max"], 3.0)
+        self.assertEqual(stats["p50"], 2.0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            "week": {"time_ms": {"p50": 10.0}, "queries": {"max": 5}},
+            "shop": {"time_ms": {"p50": 10.0}, "queries": {"max": 5}},
+        }
+        results = {
+            "week": {"time_ms": {"p50": 10.5}, "queries": {"max": 6}},
+            "shop": {"time_ms": {"p50": 12.0}, "queries": {"max": 5}},
+            "new": {"time_ms": {"p50": 1.0}, "queries": {"max": 1}},
+        }
+        rows = {
+            (row["scenario"], row["metric"]): row
+            for row in compare(results, baseline, threshold=10)
+        }
+
+        self.assertNotIn(("new", "time_ms.p50"), rows)
+        self.assertFalse(rows[("week", "time_ms.p50")]["regressed"])
+        # Any extra query is a regression, whatever the threshold
+        self.assertTrue(rows[("week", "queries.max")]["regressed"])
+        self.assertTrue(rows[("shop", "time_ms.p50")]["regressed"])
+        self.assertEqual(rows[("shop", "time_ms.p50")]["change_pct"], 20.0)
+        self.assertFalse(rows[("shop", "queries.max")]["regressed"])
+
+
+class DatasetSeederTest(TestCase):
+    def seed(self, prefix, seed=0):
+        seeder = DatasetSeeder(seed=seed, prefix=prefix, today=date(2026, 3, 4))
+        seeder.seed(households=2, members=2, recipes=6, plan_days=8)
+        return seeder
+
+    def test_creates_households_of_recipes(self):
+        seeder = self.seed("t")
+
+        self.assertEqual(User.objects.filter(username__startswith="t_").count(), 4)
+        self.assertEqual(Recipe.objects.count(), 12)
+        self.assertEqual(seeder.counts["recipes"], 12)
+        self.assertEqual(RecipeIngredient.objects.count(), 12 * 8)
+        self.assertEqual(RecipeSearchDocument.objects.count(), 12)
+        self.assertGreaterEqual(
+            MealPlan.objects.filter(meal_type="dinner").count(), 2 * 8
+        )
+        self.assertTrue(CookingNote.objects.exists())
+        user, household = dataset_user("t")
+        self.assertEqual(user.username, "t_000000_0")
+        self.assertEqual(household.members.count(), 2)
+
+    def test_same_seed_same_dataset(self):
+        self.seed("a", seed=7)
+        self.seed("b", seed=7)
+
+        def titles(prefix):
+            return list(
+                Recipe.objects.filter(user__username__startswith=f"{prefix}_")
+                .order_by("pk")
+                .values_list("title", "servings")
+            )
+
+        self.assertEqual(titles("a"), titles("b"))
+
+
+class BenchmarkCommandTest(TestCase):
+    def test_writes_results_and_rolls_back(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            call_command(
+                "benchmark",
+                scenarios=["week", "recipe_search"],
+                iterations=2,
+                warmup=1,
+                recipes=10,
+                output=path,
+                stdout=StringIO(),
+            )
+            with open(path) as f:
+                results = json.load(f)
+
+        self.assertEqual(set(results["scenarios"]), {"week", "recipe_search"})
+        week = results["scenarios"]["week"]
+        self.assertEqual(week["status_codes"], [200])
+        self.assertEqual(week["iterations"], 2)
+        self.assertEqual(results["meta"]["dataset"]["recipes"], 10)
+        self.assertFalse(User.objects.filter(username__startswith="bench_").exists())
+
+    def test_fails_on_regression(self):
+        baseline = {
+            "meta": {},
+            "scenarios": {"week": {"queries": {"max": 0}}},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            with open(path, "w") as f:
+                json.dump(baseline, f)
+            with self.assertRaises(CommandError):
+                call_command(
+                    "benchmark",
+                    scenarios=["week"],
+                    iterations=1,
+                    warmup=0,
+                    recipes=5,
+                    baseline=path,
+                    fail_on_regression=True,
+                    stdout=StringIO(),
+                )
+
+    def test_unknown_dataset(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark", dataset="missing", stdout=StringIO())
+
+
+class SeedScaleCommandTest(TestCase):
+    def seed(self, **options):
+        out = StringIO()
+        options = {"households": 2, "recipes": 5, "plan_days": 4, **options}
+        call_command("seed_scale", shopping_items=3, stdout=out, **options)
+        return out.getvalue()
+
+    def test_seeds_and_reports_progress(self):
+        output = self.seed(password="secret123")
+
+        self.assertIn("2/2 households", output)
+        self.assertIn("recipes: 10", output)
+        self.assertEqual(Recipe.objects.count(), 10)
+        self.assertTrue(
+            self.client.login(username="seed_000000_0", password="secret123")
+        )
+
+    def test_refuses_existing_prefix(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+
+    def test_clear_removes_only_that_dataset(self):
+        self.seed()
+        self.seed(prefix="other")
+        kept = Recipe.objects.filter(user__username__startswith="other_").count()
+
+        output = self.seed(clear=True, households=0)
+
+        self.assertIn("Deleted 4 'seed' users", output)
+        self.assertFalse(User.objects.filter(username__startswith="seed_").exists())
+        self.assertEqual(Recipe.objects.count(), kept)
+        self.assertFalse(
+            CookingNote.objects.exclude(user__username__startswith="other_").exists()
+        )
+        self.assertTrue(Household.objects.filter(members__isnull=False).exists())
+        self.assertFalse(Household.objects.filter(members__isnull=True).exists())
+
+    def test_clear_then_reseed_is_deterministic(self):
+        self.seed(seed=3)
+        titles = list(Recipe.objects.order_by("title").values_list("title", flat=True))
+
+        self.seed(seed=3, clear=True)
+
+        self.assertEqual(
+            list(Recipe.objects.order_by("title").values_list("title", flat=True)),
+            titles,
+        )
@@ -0,0 +1,130 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.models import (
+    Ingredient,
+    MealPlan,
+    Recipe,
+    RecipeIngredient,
+    ShoppingListItem,
+)
+from recipes.models.household import DayComment, Household, HouseholdMembership
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("cook", password="pw")
+        self.household = Household.objects.create(name="Cooks")
+        HouseholdMembership.objects.create(user=self.user, household=self.household)
+        self.recipe = Recipe.objects.create(
+            user=self.user, title="Fish Pie", steps="Bake.", shared=True
+        )
+        self.client.force_login(self.user)
+        # Pages depend on the CSRF cookie, which the first page view sets
+        self.client.get(reverse("settings"))
+
+    def assertRevalidates(self, url):
+        """GET url, then check a repeat with its ETag is a 304; return the ETag."""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        return etag
+
+    def assertChanged(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_week_not_modified_skips_view(self):
+        etag = self.assertRevalidates(reverse("week"))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("week"), HTTP_IF_NONE_MATCH=etag)
+        sql = " ".join(q["sql"] for q in queries.captured_queries)
+        self.assertNotIn("recipes_mealplan", sql)
+        self.assertNotIn("recipes_daycomment", sql)
+
+    def test_week_changes_with_plan_comments_and_offset(self):
+        url = reverse("week")
+        etag = self.assertRevalidates(url)
+        MealPlan.objects.create(
+            household=self.household,
+            added_by=self.user,
+            date=date.today(),
+            meal_type="dinner",
+            recipe=self.recipe,
+        )
+        self.assertChanged(url, etag)
+
+        etag = self.assertRevalidates(url)
+        DayComment.objects.create(
+            household=self.household, user=self.user, date=date.today(), text="Late"
+        )
+        self.assertChanged(url, etag)
+
+        self.assertChanged(f"{url}?offset=1", self.assertRevalidates(url))
+
+    def test_each_member_has_own_etag(self):
+        etag = self.assertRevalidates(reverse("week"))
+        partner = User.objects.create_user("partner", password="pw")
+        HouseholdMembership.objects.create(user=partner, household=self.household)
+        self.client.force_login(partner)
+        self.assertChanged(reverse("week"), etag)
+
+    def test_recipe_detail(self):
+        url = reverse("recipe_detail", args=[self.recipe.pk])
+        etag = self.assertRevalidates(url)
+        RecipeIngredient.objects.create(
+            recipe=self.recipe,
+            ingredient=Ingredient.objects.create(name="cod"),
+            quantity=1,
+        )
+        self.assertChanged(url, etag)
+
+        etag = self.assertRevalidates(url)
+        self.client.post(reverse("toggle_favourite", args=[self.recipe.pk]))
+        self.assertChanged(url, etag)
+
+    def test_hidden_recipe_has_no_etag(self):
+        stranger = User.objects.create_user("stranger", password="pw")
+        private = Recipe.objects.create(user=stranger, title="Secret", steps="-")
+        response = self.client.get(reverse("recipe_detail", args=[private.pk]))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+    def test_shop_changes_with_items(self):
+        url = reverse("shop")
+        etag = self.assertRevalidates(url)
+        item = ShoppingListItem.objects.create(
+            household=self.household, added_by=self.user, name="milk"
+        )
+        self.assertChanged(url, etag)
+
+        etag = self.assertRevalidates(url)
+        self.client.post(reverse("shop_toggle", args=[item.pk]))
+        self.assertChanged(url, etag)
+
+    def test_pending_message_disables_etag(self):
+        self.client.post(reverse("shop_generate"))
+        response = self.client.get(reverse("shop"))
+        self.assertContains(response, "Shopping list updated!")
+        self.assertNotIn("ETag", response)
+
+        self.assertRevalidates(reverse("shop"))
+
+    @override_settings(CONDITIONAL_GET=False)
+    def test_can_be_turned_off(self):
+        self.assertNotIn("ETag", self.client.get(reverse("week")))
@@ -0,0 +1,42 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from recipes.models import UNIT_CHOICES
+from recipes.utils.conversions import (
+    UNIT_DIMENSIONS,
+    choose_display_unit,
+    combine_quantities,
+    unit_group,
+)
+
+
+class UnitConversionTests(SimpleTestCase):
+    """Tests for the shopping list unit algebra."""
+
+    def test_every_unit_choice_has_a_dimension(self):
+        for unit, _ in UNIT_CHOICES:
+            self.assertIn(unit, UNIT_DIMENSIONS)
+
+    def test_mass_and_volume_group_by_dimension(self):
+        self.assertEqual(unit_group("g"), unit_group("lb"))
+        self.assertEqual(unit_group("tsp"), unit_group("l"))
+        self.assertNotEqual(unit_group("g"), unit_group("ml"))
+
+    def test_count_units_only_group_with_themselves(self):
+        self.assertNotEqual(unit_group("piece"), unit_group("clove"))
+        self.assertEqual(unit_group("clove"), "clove")
+
+    def test_display_unit_steps_up_the_ladder(self):
+        self.assertEqual(choose_display_unit(Decimal("1500"), {"g", "kg"}), "kg")
+        self.assertEqual(choose_display_unit(Decimal("400"), {"g", "kg"}), "g")
+
+    def test_mixed_metric_and_imperial_falls_back_to_metric(self):
+        total, unit = combine_quantities([(Decimal("1"), "lb"), (Decimal("500"), "g")])
+        self.assertEqual(unit, "g")
+        self.assertEqual(total, Decimal("953.59"))
+
+    def test_missing_quantities_are_ignored(self):
+        total, unit = combine_quantities([(None, "cup"), (Decimal("2"), "tbsp")])
+        self.assertEqual(unit, "tbsp")
+        self.assertEqual(total, Decimal("2"))
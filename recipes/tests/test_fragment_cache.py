@@ -0,0 +1,173 @@
+import shutil
+import tempfile
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recipes.models import CookingNote, MealPlan, Recipe, Tag
+from recipes.models.household import DayComment, Household, HouseholdMembership
+from recipes.models.template import MealPlanTemplate, MealPlanTemplateEntry
+from recipes.utils.cache import FileBasedCache
+from recipes.utils.fragments import fragment_version, invalidate_fragments
+
+
+class FragmentVersionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_stable_until_invalidated(self):
+        version = fragment_version(1)
+        self.assertEqual(fragment_version(1), version)
+        self.assertNotEqual(fragment_version(2), version)
+
+        invalidate_fragments([1, None])
+        self.assertNotEqual(fragment_version(1), version)
+
+    def test_new_household_gets_fresh_version(self):
+        household = Household.objects.create(name="First")
+        version = fragment_version(household.pk)
+        household.delete()
+        # An id reused after a rollback must not inherit cached fragments
+        reused = Household(pk=household.pk, name="Second")
+        reused.save()
+        self.assertNotEqual(fragment_version(reused.pk), version)
+
+
+class FileBasedCacheTest(TestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.cache = FileBasedCache(
+            location, {"OPTIONS": {"MAX_ENTRIES": 4, "CULL_FREQUENCY": 2}}
+        )
+
+    def test_culls_at_most_once_per_interval(self):
+        with patch.object(
+            self.cache, "_list_cache_files", wraps=self.cache._list_cache_files
+        ) as listed:
+            for i in range(6):
+                self.cache.set(f"key-{i}", i)
+        self.assertEqual(listed.call_count, 1)
+        self.assertEqual(len(self.cache._list_cache_files()), 6)
+
+        with patch("recipes.utils.cache.time.monotonic", return_value=1e12):
+            self.cache.set("key-6", 6)
+        self.assertEqual(len(self.cache._list_cache_files()), 4)
+
+
+class FragmentCacheViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("cook", password="pw")
+        self.household = Household.objects.create(name="Cooks")
+        HouseholdMembership.objects.create(user=self.user, household=self.household)
+        self.recipe = Recipe.objects.create(
+            user=self.user, title="Fish Pie", steps="Bake.", shared=True
+        )
+        self.meal = MealPlan.objects.create(
+            household=self.household,
+            added_by=self.user,
+            date=date.today(),
+            meal_type="dinner",
+            recipe=self.recipe,
+        )
+        self.client.force_login(self.user)
+        self.slot_url = reverse("week_slot", args=[date.today().isoformat(), "dinner"])
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        tables = " ".join(q["sql"] for q in queries.captured_queries)
+        return response, tables
+
+    def test_repeated_slot_swap_skips_meal_queries(self):
+        _, first = self.get(self.slot_url)
+        self.assertIn("recipes_mealplan", first)
+
+        response, second = self.get(self.slot_url)
+        self.assertContains(response, "Fish Pie")
+        self.assertContains(response, "csrfmiddlewaretoken")
+        self.assertNotIn("recipes_mealplan", second)
+        self.assertNotIn("recipes_daycomment", second)
+
+    def test_week_page_reuses_day_cards(self):
+        self.get(reverse("week"))
+        response, tables = self.get(reverse("week"))
+        self.assertContains(response, "Fish Pie")
+        self.assertNotIn("recipes_mealplan", tables)
+
+    def test_plan_comment_and_recipe_changes_rerender(self):
+        self.get(self.slot_url)
+
+        DayComment.objects.create(
+            household=self.household, user=self.user, date=date.today(), text="Late"
+        )
+        self.assertContains(self.client.get(self.slot_url), "Late")
+
+        self.recipe.title = "Cottage Pie"
+        self.recipe.save()
+        self.assertContains(self.client.get(self.slot_url), "Cottage Pie")
+
+        self.recipe.tags.add(Tag.objects.create(name="Comfort"))
+        self.assertContains(self.client.get(self.slot_url), "Comfort")
+
+        CookingNote.objects.create(
+            recipe=self.recipe, user=self.user, cooked_date=date.today(), rating=4
+        )
+        self.assertContains(self.client.get(self.slot_url), "4.0")
+
+        self.meal.delete()
+        self.assertContains(self.client.get(self.slot_url), "Tap to add a meal")
+
+    def test_members_get_their_own_cards(self):
+        partner = User.objects.create_user("partner", password="pw")
+        HouseholdMembership.objects.create(user=partner, household=self.household)
+        DayComment.objects.create(
+            household=self.household, user=self.user, date=date.today(), text="Mine"
+        )
+        self.assertContains(self.client.get(self.slot_url), 'value="Mine"')
+
+        self.client.force_login(partner)
+        self.assertNotContains(self.client.get(self.slot_url), 'value="Mine"')
+
+    def test_template_picker(self):
+        template = MealPlanTemplate.objects.create(
+            household=self.household, name="Usual week", created_by=self.user
+        )
+        MealPlanTemplateEntry.objects.create(
+            template=template, day_of_week=0, meal_type="dinner", recipe=self.recipe
+        )
+        url = reverse("list_templates")
+        self.get(url)
+
+        response, tables = self.get(url)
+        self.assertContains(response, "Usual week")
+        self.assertContains(
+            response, f'formaction="{reverse("apply_template", args=[template.pk])}"'
+        )
+        self.assertNotIn("recipes_mealplantemplate", tables)
+
+        template.name = "Busy week"
+        template.save()
+        self.assertContains(self.client.get(url), "Busy week")
+
+    def test_recipe_cards_rerender_after_edit(self):
+        url = reverse("recipe_search")
+        self.assertContains(self.client.get(url), "Fish Pie")
+
+        self.recipe.title = "Cottage Pie"
+        self.recipe.save()
+        self.assertContains(self.client.get(url), "Cottage Pie")
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.get(self.slot_url)
+        _, tables = self.get(self.slot_url)
+        self.assertIn("recipes_mealplan", tables)
@@ -1,11 +1,16 @@
-from unittest.mock import patch
+import threading
+import time
+from unittest.mock import MagicMock, patch
 
+import anthropic
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
-from recipes.models import Recipe
+from recipes.models import GenerationBatch, Job
 from recipes.models.household import Household, HouseholdMembership
+from recipes.services.ai_service import AIServiceException
+from recipes.services.generation_service import BatchGenerationService
 
 
 class GeneratePreferencesTest(TestCase):
@@ -24,7 +29,7 @@ class GeneratePreferencesTest(TestCase):
         self.assertContains(response, "Italian")
         self.assertContains(response, "Chicken")
 
-    def test_preferences_post_stores_session_and_redirects(self):
+    def test_preferences_post_creates_batch_and_redirects(self):
         response = self.client.post(
             reverse("generate_preferences"),
             {
@@ -34,12 +39,18 @@ class GeneratePreferencesTest(TestCase):
             },
         )
         self.assertEqual(response.status_code, 302)
-        session = self.client.session
-        self.assertEqual(session["gen_cuisines"], ["Italian", "Asian"])
-        self.assertEqual(session["gen_proteins"], ["Chicken"])
-        self.assertEqual(session["gen_count"], 5)
-        self.assertEqual(session["gen_completed"], 0)
-        self.assertEqual(session["gen_titles"], [])
+        batch = GenerationBatch.objects.get(user=self.user)
+        self.assertEqual(batch.total, 5)
+        self.assertEqual(batch.status, "pending")
+        self.assertEqual(batch.preferences["cuisines"], ["Italian", "Asian"])
+        self.assertEqual(batch.preferences["proteins"], ["Chicken"])
+        self.assertEqual(batch.preferences["dietary"], [])
+        self.assertEqual(self.client.session["gen_batch_id"], batch.pk)
+        # Generation is handed to the background workers
+        job = Job.objects.get(user=self.user)
+        self.assertEqual(job.kind, "generation_batch")
+        self.assertEqual(job.payload, {"batch_id": batch.pk})
+        self.assertEqual(job.max_attempts, 1)
 
     def test_preferences_requires_login(self):
         self.client.logout()
@@ -49,95 +60,154 @@ class GeneratePreferencesTest(TestCase):
 
     def test_count_capped_at_20(self):
         self.client.post(reverse("generate_preferences"), {"count": "50"})
-        self.assertEqual(self.client.session["gen_count"], 20)
+        self.assertEqual(GenerationBatch.objects.get(user=self.user).total, 20)
 
     def test_progress_redirects_without_session(self):
         response = self.client.get(reverse("generate_progress"))
         self.assertEqual(response.status_code, 302)
 
-    @patch("recipes.views.generate.AIService.generate_structured_recipe")
-    def test_generate_next_creates_recipe(self, mock_generate):
-        mock_generate.return_value = {
-            "title": "Test Recipe",
-            "description": "A test",
-            "prep_time": 10,
-            "cook_time": 20,
-            "servings": 4,
-            "difficulty": "easy",
-            "ingredients": [
-                {
-                    "name": "chicken",
-                    "quantity": 500,
-                    "unit": "g",
-                    "category": "meat",
-                    "preparation_notes": "",
-                }
-            ],
-            "steps": ["Cook it"],
-        }
+    def test_status_polls_until_done(self):
+        batch = GenerationBatch.objects.create(user=self.user, total=2, completed=1)
         session = self.client.session
-        session["gen_count"] = 2
-        session["gen_completed"] = 0
-        session["gen_titles"] = []
-        session["gen_cuisines"] = ["Italian"]
-        session["gen_proteins"] = []
-        session["gen_dietary"] = []
-        session["gen_styles"] = []
-        session["gen_avoid"] = []
+        session["gen_batch_id"] = batch.pk
         session.save()
 
-        response = self.client.get(reverse("generate_next"))
-        self.assertEqual(response.status_code, 200)
-        self.assertTrue(Recipe.objects.filter(title="Test Recipe").exists())
-        self.assertEqual(self.client.session["gen_completed"], 1)
+        response = self.client.get(reverse("generate_progress"))
+        self.assertContains(response, "1 of 2")
+        self.assertContains(response, reverse("generate_status", args=[batch.pk]))
+
+        batch.completed = 2
+        batch.status = "done"
+        batch.save()
+        response = self.client.get(reverse("generate_status", args=[batch.pk]))
+        self.assertTemplateUsed(response, "recipes/partials/generate_status.html")
+        self.assertContains(response, "recipes added")
+        self.assertNotContains(response, "every 2s")
+
+    def test_status_is_private_to_owner(self):
+        other = User.objects.create_user("other", password="pass")
+        batch = GenerationBatch.objects.create(user=other, total=1)
+        response = self.client.get(reverse("generate_status", args=[batch.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+RECIPE_DATA = {
+    "title": "Test Recipe",
+    "description": "A test",
+    "prep_time": 10,
+    "cook_time": 20,
+    "servings": 4,
+    "difficulty": "easy",
+    "ingredients": [
+        {
+            "name": "chicken",
+            "quantity": 500,
+            "unit": "g",
+            "category": "meat",
+            "preparation_notes": "",
+        }
+    ],
+    "steps": ["Cook it"],
+}
 
-        recipe = Recipe.objects.get(title="Test Recipe")
-        self.assertEqual(recipe.source, "ai")
-        self.assertTrue(recipe.is_ai_generated)
-        self.assertEqual(recipe.user, self.user)
-        self.assertEqual(recipe.recipe_ingredients.count(), 1)
 
-    @patch("recipes.views.generate.AIService.generate_structured_recipe")
-    def test_generate_next_returns_complete_when_done(self, mock_generate):
-        session = self.client.session
-        session["gen_count"] = 1
-        session["gen_completed"] = 1
-        session["gen_titles"] = ["Test"]
-        session["gen_cuisines"] = []
-        session["gen_proteins"] = []
-        session["gen_dietary"] = []
-        session["gen_styles"] = []
-        session["gen_avoid"] = []
-        session.save()
+class BatchGenerationServiceTest(TestCase):
+    """Tests for running a generation batch with a mocked AI service."""
 
-        response = self.client.get(reverse("generate_next"))
-        self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "recipes added")
-        # Session keys should be cleaned up
-        self.assertNotIn("gen_count", self.client.session)
-
-    @patch("recipes.views.generate.AIService.generate_structured_recipe")
-    def test_generate_next_handles_ai_error(self, mock_generate):
-        from recipes.services.ai_service import AIServiceException
+    def setUp(self):
+        self.user = User.objects.create_user("testuser", password="testpass123")
 
-        mock_generate.side_effect = AIServiceException("API error")
-        recipe_count_before = Recipe.objects.filter(user=self.user).count()
-        session = self.client.session
-        session["gen_count"] = 2
-        session["gen_completed"] = 0
-        session["gen_titles"] = []
-        session["gen_cuisines"] = []
-        session["gen_proteins"] = []
-        session["gen_dietary"] = []
-        session["gen_styles"] = []
-        session["gen_avoid"] = []
-        session.save()
+    def make_batch(self, total, **preferences):
+        return GenerationBatch.objects.create(
+            user=self.user, total=total, preferences=preferences
+        )
 
-        response = self.client.get(reverse("generate_next"))
-        self.assertEqual(response.status_code, 200)
-        self.assertContains(response, "Skipped")
-        self.assertEqual(self.client.session["gen_completed"], 1)
-        # No new recipe should have been created
-        self.assertEqual(
-            Recipe.objects.filter(user=self.user).count(), recipe_count_before
+    @patch("recipes.services.generation_service.AIService.generate_structured_recipe")
+    def test_run_batch_saves_each_recipe(self, mock_generate):
+        mock_generate.side_effect = lambda prompt, **kwargs: dict(
+            RECIPE_DATA, title=prompt.splitlines()[1]
         )
+        batch = self.make_batch(3, cuisines=["Italian"])
+
+        batch = BatchGenerationService.run_batch(batch.pk, concurrency=2)
+
+        self.assertEqual(batch.status, "done")
+        self.assertEqual(batch.completed, 3)
+        self.assertEqual(batch.failed, 0)
+        self.assertEqual(batch.recipes.count(), 3)
+        recipe = batch.recipes.first()
+        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.source, "ai")
+        self.assertTrue(recipe.is_ai_generated)
+        self.assertEqual(recipe.recipe_ingredients.count(), 1)
+        self.assertTrue(recipe.tags.filter(name="Italian").exists())
+
+    @patch("recipes.services.generation_service.AIService.generate_structured_recipe")
+    def test_ai_errors_are_counted_and_skipped(self, mock_generate):
+        mock_generate.side_effect = [
+            RECIPE_DATA,
+            AIServiceException("API error"),
+        ]
+        batch = BatchGenerationService.run_batch(self.make_batch(2).pk, concurrency=1)
+
+        self.assertEqual(batch.completed, 1)
+        self.assertEqual(batch.failed, 1)
+        self.assertEqual(batch.status, "done")
+
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    @patch("recipes.services.ai_service.get_client")
+    def test_api_and_json_errors_are_counted(self, mock_get_client):
+        good = MagicMock(type="text", text='{"title": "Soup", "steps": ["Stir"]}')
+        bad = MagicMock(type="text", text="Here is a lovely soup!")
+        mock_get_client.return_value.messages.create.side_effect = [
+            MagicMock(content=[good]),
+            anthropic.APIError("Overloaded", request=MagicMock(), body=None),
+            MagicMock(content=[bad]),
+        ]
+        batch = BatchGenerationService.run_batch(self.make_batch(3).pk, concurrency=1)
+
+        self.assertEqual(batch.status, "done")
+        self.assertEqual(batch.completed, 1)
+        self.assertEqual(batch.failed, 2)
+
+    @patch("recipes.services.generation_service.AIService.generate_structured_recipe")
+    def test_unexpected_errors_still_finish_batch(self, mock_generate):
+        mock_generate.side_effect = [
+            anthropic.APIError("Overloaded", request=MagicMock(), body=None),
+            ["not", "a", "recipe"],
+            RECIPE_DATA,
+        ]
+        batch = BatchGenerationService.run_batch(self.make_batch(3).pk, concurrency=1)
+
+        self.assertEqual(batch.status, "done")
+        self.assertEqual(batch.completed, 1)
+        self.assertEqual(batch.failed, 2)
+
+    @patch("recipes.services.generation_service.AIService.generate_structured_recipe")
+    def test_calls_run_concurrently_up_to_cap(self, mock_generate):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def slow_generate(prompt, **kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return RECIPE_DATA
+
+        mock_generate.side_effect = slow_generate
+        BatchGenerationService.run_batch(self.make_batch(6).pk, concurrency=3)
+
+        self.assertEqual(state["peak"], 3)
+        self.assertEqual(mock_generate.call_count, 6)
+
+    def test_prompts_rotate_preferences_per_slot(self):
+        preferences = {"cuisines": ["Thai", "Greek"], "styles": ["One-pot"]}
+        first = BatchGenerationService.build_prompt(preferences, 0, 4, [])
+        second = BatchGenerationService.build_prompt(preferences, 1, 4, ["Old"])
+        self.assertIn("Cuisine: Thai", first)
+        self.assertIn("Cuisine: Greek", second)
+        self.assertIn("Cooking style: One-pot", second)
+        self.assertIn("Must be different from: Old", second)
@@ -1,8 +1,9 @@
 from datetime import date
 
-from django.contrib.auth.models import User
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
 from django.db import IntegrityError
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from recipes.models import (
@@ -15,6 +16,7 @@ from recipes.models import (
     generate_household_code,
     get_household,
 )
+from recipes.models.household import resolve_household
 
 
 class HouseholdModelTests(TestCase):
@@ -122,6 +124,52 @@ class GetHouseholdHelperTests(TestCase):
         self.assertIsNone(get_household(user))
 
 
+class ResolveHouseholdTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("alice", password="pass")
+        self.household = Household.objects.create(name="Alice's Kitchen")
+        HouseholdMembership.objects.create(user=self.user, household=self.household)
+        self.user = User.objects.get(pk=self.user.pk)
+
+    def test_one_query_and_primes_get_household(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_household(self.user), self.household)
+            self.assertEqual(get_household(self.user), self.household)
+
+    def test_no_membership_or_anonymous(self):
+        loner = User.objects.create_user("bob", password="pass")
+        self.assertIsNone(resolve_household(loner))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_household(loner))
+        self.assertIsNone(resolve_household(AnonymousUser()))
+
+    def test_middleware_sets_request_household(self):
+        client = Client()
+        client.login(username="alice", password="pass")
+        response = client.get(reverse("week"))
+        self.assertEqual(response.wsgi_request.household, self.household)
+
+    @override_settings(HOUSEHOLD_CACHE_TIMEOUT=60)
+    def test_cache_skips_query_until_invalidated(self):
+        resolve_household(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_household(self.user), self.household)
+
+        self.household.name = "Renamed Kitchen"
+        self.household.save()
+        self.assertEqual(resolve_household(self.user).name, "Renamed Kitchen")
+
+        other = Household.objects.create(name="Other")
+        membership = HouseholdMembership.objects.get(user=self.user)
+        membership.household = other
+        membership.save()
+        self.assertEqual(resolve_household(self.user), other)
+
+        membership.delete()
+        self.assertIsNone(resolve_household(self.user))
+
+
 class RecipeSharedFieldTests(TestCase):
     def test_shared_default_false(self):
         user = User.objects.create_user("alice", password="pass")
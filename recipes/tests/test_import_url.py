@@ -1,13 +1,34 @@
+import json
 from unittest.mock import MagicMock, patch
 
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
+from recipes.models import Ingredient, Job
 from recipes.models.household import Household, HouseholdMembership
+from recipes.services import JobService
 from recipes.services.ai_service import AIAPIError, AIService, AIValidationError
 
 
+def page_response(html, chunk_size=None, content_type="text/html; charset=utf-8"):
+    """A mock streamed requests response serving html in chunks."""
+    body = html.encode("utf-8")
+    size = chunk_size or len(body) or 1
+    resp = MagicMock()
+    resp.headers = {"Content-Type": content_type}
+    resp.encoding = "utf-8"
+    resp.chunks_read = 0
+
+    def iter_content(chunk_size=1):
+        for start in range(0, len(body), size):
+            resp.chunks_read += 1
+            yield body[start : start + size]
+
+    resp.iter_content.side_effect = iter_content
+    return resp
+
+
 class ImportRecipeFromURLServiceTest(TestCase):
     """Tests for AIService.import_recipe_from_url."""
 
@@ -23,10 +44,9 @@ class ImportRecipeFromURLServiceTest(TestCase):
         with self.assertRaises(AIValidationError):
             AIService.import_recipe_from_url("not-a-url")
 
-    @patch("recipes.services.ai_service.anthropic.Anthropic")
-    @patch("recipes.services.ai_service.settings")
-    def test_import_url_success(self, mock_settings, mock_anthropic_cls):
-        mock_settings.ANTHROPIC_API_KEY = "test-key"
+    @patch("recipes.services.ai_service.get_client")
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    def test_import_url_success(self, mock_get_client):
 
         mock_text_block = MagicMock()
         mock_text_block.type = "text"
@@ -39,50 +59,42 @@ class ImportRecipeFromURLServiceTest(TestCase):
         )
         mock_response = MagicMock()
         mock_response.content = [mock_text_block]
-        mock_anthropic_cls.return_value.messages.create.return_value = mock_response
+        mock_get_client.return_value.messages.create.return_value = mock_response
 
         with patch("requests.get") as mock_get:
-            mock_resp = MagicMock()
-            mock_resp.text = (
+            mock_get.return_value = page_response(
                 "<html><body><h1>Pasta Recipe</h1>"
                 "<p>Boil pasta with sauce and cheese and serve with bread and butter on the side</p>"
                 "</body></html>"
             )
-            mock_resp.raise_for_status = MagicMock()
-            mock_get.return_value = mock_resp
 
             result = AIService.import_recipe_from_url("https://example.com/recipe")
             self.assertEqual(result["title"], "Pasta")
             self.assertEqual(len(result["ingredients"]), 1)
             self.assertEqual(len(result["steps"]), 2)
 
-    @patch("recipes.services.ai_service.anthropic.Anthropic")
-    @patch("recipes.services.ai_service.settings")
-    def test_import_url_no_recipe_found(self, mock_settings, mock_anthropic_cls):
-        mock_settings.ANTHROPIC_API_KEY = "test-key"
+    @patch("recipes.services.ai_service.get_client")
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    def test_import_url_no_recipe_found(self, mock_get_client):
 
         mock_text_block = MagicMock()
         mock_text_block.type = "text"
         mock_text_block.text = '{"error": "No recipe found on this page."}'
         mock_response = MagicMock()
         mock_response.content = [mock_text_block]
-        mock_anthropic_cls.return_value.messages.create.return_value = mock_response
+        mock_get_client.return_value.messages.create.return_value = mock_response
 
         with patch("requests.get") as mock_get:
-            mock_resp = MagicMock()
-            mock_resp.text = (
+            mock_get.return_value = page_response(
                 "<html><body><p>This is a blog post about travel with lots of text content here "
                 "and more words to ensure it passes the minimum length check.</p></body></html>"
             )
-            mock_resp.raise_for_status = MagicMock()
-            mock_get.return_value = mock_resp
 
             with self.assertRaises(AIValidationError):
                 AIService.import_recipe_from_url("https://example.com/blog")
 
-    @patch("recipes.services.ai_service.settings")
-    def test_import_url_fetch_failure(self, mock_settings):
-        mock_settings.ANTHROPIC_API_KEY = "test-key"
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    def test_import_url_fetch_failure(self):
 
         with patch("requests.get") as mock_get:
             mock_get.side_effect = Exception("Connection error")
@@ -90,19 +102,135 @@ class ImportRecipeFromURLServiceTest(TestCase):
             with self.assertRaises(AIAPIError):
                 AIService.import_recipe_from_url("https://example.com/recipe")
 
-    @patch("recipes.services.ai_service.settings")
-    def test_import_url_too_little_content(self, mock_settings):
-        mock_settings.ANTHROPIC_API_KEY = "test-key"
+    def test_error_status_closes_response(self):
+        import requests
+
+        resp = page_response("<html><body>Not found</body></html>")
+        resp.raise_for_status.side_effect = requests.HTTPError("404")
+        with patch("requests.get", return_value=resp):
+            with self.assertRaises(AIAPIError):
+                AIService.import_recipe_from_url("https://example.com/missing")
+        resp.close.assert_called_once()
+
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    def test_import_url_too_little_content(self):
 
         with patch("requests.get") as mock_get:
-            mock_resp = MagicMock()
-            mock_resp.text = "<html><body>Hi</body></html>"
-            mock_resp.raise_for_status = MagicMock()
-            mock_get.return_value = mock_resp
+            mock_get.return_value = page_response("<html><body>Hi</body></html>")
 
             with self.assertRaises(AIValidationError):
                 AIService.import_recipe_from_url("https://example.com/recipe")
 
+    @override_settings(ANTHROPIC_API_KEY="")
+    @patch("recipes.services.ai_service.get_client")
+    def test_import_url_uses_recipe_markup_without_ai(self, mock_get_client):
+        Ingredient.objects.create(name="spaghetti", category="pantry")
+        markup = {
+            "@context": "https://schema.org",
+            "@type": "Recipe",
+            "name": "Pasta",
+            "recipeYield": "2 servings",
+            "recipeIngredient": ["200g spaghetti", "1 tbsp butter"],
+            "recipeInstructions": [{"@type": "HowToStep", "text": "Boil pasta"}],
+        }
+        with patch("requests.get") as mock_get:
+            mock_get.return_value = page_response(
+                '<html><head><script type="application/ld+json">'
+                f"{json.dumps(markup)}</script></head><body></body></html>"
+            )
+            result = AIService.import_recipe_from_url("https://example.com/pasta")
+
+        mock_get_client.assert_not_called()
+        self.assertEqual(result["title"], "Pasta")
+        self.assertEqual(result["servings"], 2)
+        self.assertEqual(result["steps"], ["Boil pasta"])
+        self.assertEqual(
+            [(i["name"], i["unit"], i["category"]) for i in result["ingredients"]],
+            [("spaghetti", "g", "pantry"), ("butter", "tbsp", "other")],
+        )
+
+
+@override_settings(ANTHROPIC_API_KEY="test-key")
+class StreamedPageTest(TestCase):
+    """Tests for the streaming page fetch behind URL import."""
+
+    def setUp(self):
+        patcher = patch("recipes.services.ai_service.get_client")
+        self.client_mock = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        block = MagicMock()
+        block.type = "text"
+        block.text = '{"title": "Soup", "ingredients": [], "steps": []}'
+        self.client_mock.messages.create.return_value.content = [block]
+
+    def sent_text(self):
+        kwargs = self.client_mock.messages.create.call_args.kwargs
+        return kwargs["messages"][0]["content"]
+
+    def test_skipped_elements_are_not_sent_to_ai(self):
+        page = (
+            "<html><head><style>.x{color:red}</style><script>var a = 1;</script></head>"
+            "<body><header>Site header</header><nav><ul><li>Home</li></ul></nav>"
+            "<main><h1>Tomato Soup</h1><p>Simmer tomatoes &amp; stock for twenty "
+            "minutes, then blend.</p></main><aside>Ads</aside>"
+            "<footer>Copyright</footer></body></html>"
+        )
+        with patch("requests.get", return_value=page_response(page, chunk_size=7)):
+            AIService.import_recipe_from_url("https://example.com/soup")
+        self.assertTrue(
+            self.sent_text().endswith(
+                "Tomato Soup Simmer tomatoes & stock for twenty minutes, then blend."
+            )
+        )
+        for hidden in ("color", "var a", "Site header", "Home", "Ads", "Copyright"):
+            self.assertNotIn(hidden, self.sent_text())
+
+    def test_text_is_capped(self):
+        page = "<p>" + "word " * 5000 + "</p>"
+        with patch("requests.get", return_value=page_response(page)):
+            AIService.import_recipe_from_url("https://example.com/long")
+        text = self.sent_text().split("\n\n", 1)[1]
+        self.assertEqual(len(text), AIService.MAX_PAGE_TEXT)
+
+    @override_settings(URL_IMPORT_MAX_BYTES=200)
+    def test_download_stops_at_byte_cap(self):
+        page = "<p>" + "start of the recipe page " * 6 + "</p>" + "x" * 100_000
+        resp = page_response(page, chunk_size=64)
+        with patch("requests.get", return_value=resp):
+            AIService.import_recipe_from_url("https://example.com/huge")
+        self.assertEqual(resp.chunks_read, 4)
+        self.assertLess(len(self.sent_text()), 250)
+        resp.close.assert_called_once()
+
+    def test_reading_stops_once_recipe_markup_is_found(self):
+        markup = {
+            "@type": "Recipe",
+            "name": "Soup",
+            "recipeIngredient": ["1 l stock"],
+        }
+        page = (
+            '<html><head><script type="application/ld+json">'
+            f"{json.dumps(markup)}</script></head><body>"
+            + "<p>story</p>" * 10_000
+            + "</body></html>"
+        )
+        resp = page_response(page, chunk_size=1024)
+        with patch("requests.get", return_value=resp):
+            result = AIService.import_recipe_from_url("https://example.com/soup")
+        self.assertEqual(result["title"], "Soup")
+        self.assertEqual(resp.chunks_read, 1)
+        self.client_mock.messages.create.assert_not_called()
+
+    def test_pages_without_charset_decode_as_utf8(self):
+        page = (
+            "<p>Crème brûlée with a crisp caramel top, chilled custard and berries.</p>"
+        )
+        resp = page_response(page, chunk_size=5, content_type="text/html")
+        resp.encoding = "ISO-8859-1"
+        with patch("requests.get", return_value=resp):
+            AIService.import_recipe_from_url("https://example.com/creme")
+        self.assertIn("Crème brûlée", self.sent_text())
+
 
 class ImportRecipeURLViewTest(TestCase):
     """Tests for the import_recipe_url view."""
@@ -129,7 +257,32 @@ class ImportRecipeURLViewTest(TestCase):
         response = self.client.post(reverse("import_recipe_url"), {"url": ""})
         self.assertEqual(response.status_code, 400)
 
-    @patch("recipes.views.recipes.AIService.import_recipe_from_url")
+    def test_import_url_rejects_non_http_url(self):
+        response = self.client.post(reverse("import_recipe_url"), {"url": "ftp://x"})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(ANTHROPIC_API_KEY="")
+    def test_import_url_queued_without_api_key(self):
+        # Pages with recipe markup import without the AI, so the key is
+        # only required by the job if it has to fall back to Claude
+        response = self.client.post(
+            reverse("import_recipe_url"), {"url": "https://example.com/recipe"}
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(Job.objects.exists())
+
+    def _import(self, url):
+        """POST the URL, run the queued job, and return the job status JSON."""
+        response = self.client.post(reverse("import_recipe_url"), {"url": url})
+        self.assertEqual(response.status_code, 202)
+        job = JobService.claim_next("test")
+        self.assertEqual(job.pk, response.json()["job_id"])
+        JobService.run_job(job)
+        return self.client.get(response.json()["status_url"]).json()
+
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    @patch("recipes.services.job_handlers.AIService.import_recipe_from_url")
     def test_import_url_success(self, mock_import):
         mock_import.return_value = {
             "title": "Pasta",
@@ -150,23 +303,21 @@ class ImportRecipeURLViewTest(TestCase):
             "steps": ["Boil water", "Cook pasta"],
         }
 
-        response = self.client.post(
-            reverse("import_recipe_url"), {"url": "https://example.com/recipe"}
-        )
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
+        status = self._import("https://example.com/recipe")
+        self.assertEqual(status["status"], "succeeded")
+        self.assertTrue(status["finished"])
+        data = status["result"]
         self.assertEqual(data["title"], "Pasta")
         self.assertEqual(len(data["ingredients"]), 1)
         self.assertEqual(len(data["steps"]), 2)
 
-    @patch("recipes.views.recipes.AIService.import_recipe_from_url")
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    @patch("recipes.services.job_handlers.AIService.import_recipe_from_url")
     def test_import_url_service_error(self, mock_import):
         from recipes.services.ai_service import AIServiceException
 
         mock_import.side_effect = AIServiceException("Couldn't access that URL.")
-        response = self.client.post(
-            reverse("import_recipe_url"), {"url": "https://example.com/bad"}
-        )
-        self.assertEqual(response.status_code, 400)
-        data = response.json()
-        self.assertEqual(data["error"], "Couldn't access that URL.")
+        status = self._import("https://example.com/bad")
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(status["error"], "Couldn't access that URL.")
+        self.assertIsNone(status["result"])
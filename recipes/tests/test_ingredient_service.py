@@ -0,0 +1,131 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Ingredient, Recipe, RecipeIngredient, RecipeSearchDocument
+from recipes.services import IngredientService
+
+
+def lines(*names):
+    return [{"name": name, "quantity": "1", "unit": "cup"} for name in names]
+
+
+class IngredientServiceTest(TestCase):
+    """Tests for bulk saving structured recipe ingredients."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="cook", password="pass")
+        self.recipe = Recipe.objects.create(
+            user=self.user, title="Pancakes", steps="Mix and fry."
+        )
+
+    def stored(self):
+        return [
+            (ri.ingredient.name, ri.quantity, ri.unit, ri.preparation_notes, ri.order)
+            for ri in self.recipe.recipe_ingredients.select_related("ingredient")
+        ]
+
+    def test_normalizes_lines(self):
+        IngredientService.save_recipe_ingredients(
+            self.recipe,
+            [
+                {
+                    "name": "  Plain   FLOUR ",
+                    "quantity": 2.5,
+                    "unit": "cups",
+                    "preparation_notes": " sifted ",
+                    "category": "Pantry",
+                },
+                {"name": "", "quantity": "3"},
+                {"name": "Salt", "quantity": "a pinch", "unit": "bogus"},
+            ],
+        )
+        self.assertEqual(
+            self.stored(),
+            [
+                ("plain flour", Decimal("2.50"), "cup", "sifted", 0),
+                ("salt", None, "", "", 2),
+            ],
+        )
+        self.assertEqual(Ingredient.objects.get(name="plain flour").category, "pantry")
+
+    def test_long_values_are_clamped_to_the_columns(self):
+        IngredientService.save_recipe_ingredients(
+            self.recipe,
+            [{"name": "chilli " * 30, "preparation_notes": "finely chopped " * 10}],
+        )
+        row = self.recipe.recipe_ingredients.select_related("ingredient").get()
+        self.assertEqual(len(row.ingredient.name), 100)
+        self.assertEqual(len(row.preparation_notes), 100)
+
+    def test_existing_ingredients_are_reused(self):
+        milk = Ingredient.objects.create(name="milk", category="dairy")
+        IngredientService.save_recipe_ingredients(
+            self.recipe, [{"name": "Milk", "category": "produce"}]
+        )
+        self.assertEqual(Ingredient.objects.filter(name="milk").count(), 1)
+        milk.refresh_from_db()
+        self.assertEqual(milk.category, "dairy")
+
+    def test_query_count_does_not_grow_with_ingredients(self):
+        other = Recipe.objects.create(user=self.user, title="Other", steps="Cook.")
+        with CaptureQueriesContext(connection) as few:
+            IngredientService.save_recipe_ingredients(other, lines("a", "b"))
+        names = [f"ingredient {i}" for i in range(15)]
+        with CaptureQueriesContext(connection) as many:
+            IngredientService.save_recipe_ingredients(self.recipe, lines(*names))
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(self.recipe.recipe_ingredients.count(), 15)
+
+    def test_edit_only_writes_changes(self):
+        IngredientService.save_recipe_ingredients(
+            self.recipe, lines("flour", "milk", "eggs")
+        )
+        ids = dict(self.recipe.recipe_ingredients.values_list("ingredient__name", "pk"))
+        counts = IngredientService.save_recipe_ingredients(
+            self.recipe,
+            [
+                {"name": "milk", "quantity": "2", "unit": "cup"},
+                {"name": "flour", "quantity": "1", "unit": "cup"},
+                {"name": "butter", "quantity": "1", "unit": "tbsp"},
+            ],
+        )
+        self.assertEqual(counts, {"created": 1, "updated": 2, "deleted": 1})
+        self.assertEqual(
+            [name for name, *_ in self.stored()], ["milk", "flour", "butter"]
+        )
+        new_ids = dict(
+            self.recipe.recipe_ingredients.values_list("ingredient__name", "pk")
+        )
+        self.assertEqual(new_ids["milk"], ids["milk"])
+        self.assertEqual(new_ids["flour"], ids["flour"])
+
+    def test_unchanged_lines_write_nothing(self):
+        IngredientService.save_recipe_ingredients(self.recipe, lines("flour", "milk"))
+        counts = IngredientService.save_recipe_ingredients(
+            self.recipe, lines("Flour", "milk")
+        )
+        self.assertEqual(counts, {"created": 0, "updated": 0, "deleted": 0})
+
+    def test_duplicate_ingredients_are_kept(self):
+        IngredientService.save_recipe_ingredients(
+            self.recipe, lines("butter", "sugar", "butter")
+        )
+        counts = IngredientService.save_recipe_ingredients(
+            self.recipe, lines("butter", "sugar")
+        )
+        self.assertEqual(counts["deleted"], 1)
+        self.assertEqual(
+            RecipeIngredient.objects.filter(
+                recipe=self.recipe, ingredient__name="butter"
+            ).count(),
+            1,
+        )
+
+    def test_search_document_is_refreshed(self):
+        IngredientService.save_recipe_ingredients(self.recipe, lines("buttermilk"))
+        document = RecipeSearchDocument.objects.get(recipe=self.recipe)
+        self.assertIn("buttermilk", document.body)
@@ -0,0 +1,331 @@
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import anthropic
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.models import GenerationBatch, Job
+from recipes.services import BatchGenerationService, JobService
+from recipes.services.ai_service import AIAPIError, AIValidationError
+
+
+class FlakyError(Exception):
+    pass
+
+
+class JobServiceTest(TestCase):
+    """Tests for JobService claiming, running and retrying jobs."""
+
+    def setUp(self):
+        self.calls = []
+        handlers = dict(JobService.HANDLERS)
+        patcher = patch.object(JobService, "HANDLERS", handlers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        @JobService.handler("echo")
+        def echo(job):
+            self.calls.append(job.pk)
+            return {"echo": job.payload["value"]}
+
+        @JobService.handler("flaky", retry_on=(FlakyError,), user_errors=(FlakyError,))
+        def flaky(job):
+            raise FlakyError("try again")
+
+        @JobService.handler("broken", retry_on=(FlakyError,))
+        def broken(job):
+            raise ValueError("bad payload")
+
+    def test_enqueue_creates_queued_job(self):
+        job = JobService.enqueue("echo", {"value": 1})
+        self.assertEqual(job.status, "queued")
+        self.assertEqual(job.attempts, 0)
+        self.assertFalse(job.is_finished)
+
+    def test_claim_next_locks_oldest_due_job(self):
+        first = JobService.enqueue("echo", {"value": 1})
+        JobService.enqueue("echo", {"value": 2})
+        job = JobService.claim_next("worker-1")
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(job.status, "running")
+        self.assertEqual(job.locked_by, "worker-1")
+        self.assertEqual(job.attempts, 1)
+
+    def test_claim_next_skips_jobs_not_yet_due(self):
+        job = JobService.enqueue("echo", {"value": 1})
+        Job.objects.filter(pk=job.pk).update(
+            run_after=timezone.now() + timedelta(minutes=5)
+        )
+        self.assertIsNone(JobService.claim_next("worker-1"))
+
+    def test_claimed_job_is_not_claimed_twice(self):
+        JobService.enqueue("echo", {"value": 1})
+        self.assertIsNotNone(JobService.claim_next("worker-1"))
+        self.assertIsNone(JobService.claim_next("worker-2"))
+
+    def test_run_job_stores_result(self):
+        JobService.enqueue("echo", {"value": 42})
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(job.result, {"echo": 42})
+        self.assertEqual(job.locked_by, "")
+
+    @override_settings(JOB_RETRY_BACKOFF=10)
+    def test_retryable_error_requeues_with_backoff(self):
+        JobService.enqueue("flaky", {})
+        before = timezone.now()
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        self.assertEqual(job.status, "queued")
+        self.assertEqual(job.error, "try again")
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=10))
+
+    @override_settings(JOB_RETRY_BACKOFF=10)
+    def test_retry_delay_doubles(self):
+        self.assertEqual(JobService.retry_delay(1), timedelta(seconds=10))
+        self.assertEqual(JobService.retry_delay(3), timedelta(seconds=40))
+
+    def test_retryable_error_fails_after_max_attempts(self):
+        job = JobService.enqueue("flaky", {}, max_attempts=2)
+        for _ in range(2):
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            JobService.run_job(JobService.claim_next("worker-1"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.attempts, 2)
+
+    def test_other_errors_fail_immediately(self):
+        JobService.enqueue("broken", {})
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        self.assertEqual(job.status, "failed")
+        # Unexpected errors aren't shown to the job's owner
+        self.assertEqual(job.error, JobService.UNEXPECTED_ERROR)
+        self.assertEqual(job.attempts, 1)
+
+    def test_unknown_kind_fails(self):
+        JobService.enqueue("nope", {})
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        self.assertEqual(job.status, "failed")
+        self.assertIn("nope", job.error)
+
+    def test_requeue_stale_running_jobs(self):
+        job = JobService.enqueue("echo", {"value": 1})
+        JobService.claim_next("worker-1")
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(JobService.requeue_stale(timedelta(minutes=15)), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "queued")
+        self.assertEqual(job.locked_by, "")
+
+    def test_stale_jobs_without_attempts_left_fail(self):
+        job = JobService.enqueue("echo", {"value": 1}, max_attempts=1)
+        JobService.claim_next("worker-1")
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(JobService.requeue_stale(timedelta(minutes=15)), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.locked_by, "")
+        self.assertIsNone(JobService.claim_next("worker-2"))
+
+    def test_touch_keeps_long_jobs_from_going_stale(self):
+        job = JobService.enqueue("echo", {"value": 1})
+        JobService.claim_next("worker-1")
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(JobService.touch("worker-1"), 1)
+        self.assertEqual(JobService.touch("worker-2"), 0)
+        self.assertEqual(JobService.requeue_stale(timedelta(minutes=15)), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "running")
+
+    def test_heartbeat_touches_while_block_runs(self):
+        with patch.object(JobService, "touch") as mock_touch:
+            with JobService.heartbeat("worker-1", interval=0.01):
+                time.sleep(0.1)
+            calls = mock_touch.call_count
+            time.sleep(0.05)
+        self.assertGreater(calls, 1)
+        self.assertEqual(mock_touch.call_count, calls)
+        mock_touch.assert_called_with("worker-1")
+
+    @override_settings(JOB_STALE_AFTER=60)
+    def test_work_recovers_stale_jobs(self):
+        job = JobService.enqueue("echo", {"value": 1})
+        JobService.claim_next("worker-1")
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(minutes=5)
+        )
+        self.assertEqual(JobService.work("worker-2", threading.Event(), burst=True), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "succeeded")
+
+    def test_requeue_stale_leaves_recent_jobs(self):
+        JobService.enqueue("echo", {"value": 1})
+        JobService.claim_next("worker-1")
+        self.assertEqual(JobService.requeue_stale(timedelta(minutes=15)), 0)
+
+    def test_work_burst_drains_queue(self):
+        for value in range(3):
+            JobService.enqueue("echo", {"value": value})
+        processed = JobService.work("worker-1", threading.Event(), burst=True)
+        self.assertEqual(processed, 3)
+        self.assertEqual(len(self.calls), 3)
+        self.assertFalse(Job.objects.exclude(status="succeeded").exists())
+
+    def test_work_stops_when_event_set(self):
+        JobService.enqueue("echo", {"value": 1})
+        stop = threading.Event()
+        stop.set()
+        self.assertEqual(JobService.work("worker-1", stop, burst=True), 0)
+
+    def test_run_workers_command_burst(self):
+        JobService.enqueue("echo", {"value": 1})
+        out = StringIO()
+        call_command("run_workers", "--burst", "--workers", "1", stdout=out)
+        self.assertIn("Processed 1 job(s)", out.getvalue())
+        self.assertEqual(Job.objects.get().status, "succeeded")
+
+
+class JobHandlersTest(TestCase):
+    """Tests for the AI job handlers registered in job_handlers."""
+
+    @patch("recipes.services.job_handlers.AIService.generate_structured_recipe")
+    def test_ai_generate_recipe_handler(self, mock_generate):
+        mock_generate.return_value = {"title": "Soup"}
+        JobService.enqueue("ai_generate_recipe", {"prompt": "soup"})
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(job.result, {"title": "Soup"})
+        mock_generate.assert_called_once_with("soup")
+
+    @patch("recipes.services.job_handlers.AIService.generate_structured_recipe")
+    def test_api_errors_are_retried(self, mock_generate):
+        mock_generate.side_effect = AIAPIError("overloaded")
+        JobService.enqueue("ai_generate_recipe", {"prompt": "soup"})
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        self.assertEqual(job.status, "queued")
+
+    @patch("recipes.services.job_handlers.AIService.generate_structured_recipe")
+    def test_validation_errors_are_not_retried(self, mock_generate):
+        mock_generate.side_effect = AIValidationError("too long")
+        JobService.enqueue("ai_generate_recipe", {"prompt": "soup"})
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, "too long")
+
+    @override_settings(ANTHROPIC_API_KEY="test-key", AI_CACHE_TTL=0)
+    @patch("recipes.services.ai_service.get_client")
+    def test_sdk_errors_are_retried(self, mock_get_client):
+        mock_get_client.return_value.messages.create.side_effect = (
+            anthropic.RateLimitError(
+                "Rate limited", response=MagicMock(status_code=429), body=None
+            )
+        )
+        JobService.enqueue("ai_generate_recipe", {"prompt": "soup"})
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        self.assertEqual(job.status, "queued")
+        self.assertIn("busy", job.error)
+
+    @patch("recipes.services.job_handlers.AIService.generate_structured_recipe")
+    def test_unexpected_errors_are_not_shown(self, mock_generate):
+        mock_generate.side_effect = KeyError("secret internals")
+        JobService.enqueue("ai_generate_recipe", {"prompt": "soup"})
+        job = JobService.run_job(JobService.claim_next("worker-1"))
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, JobService.UNEXPECTED_ERROR)
+
+    def make_batch_job(self):
+        user = User.objects.create_user("batcher", password="pw")
+        batch = GenerationBatch.objects.create(
+            user=user, total=4, completed=1, status="running"
+        )
+        BatchGenerationService.start_batch(batch)
+        return batch, JobService.claim_next("worker-1")
+
+    def test_stale_batch_job_finishes_its_batch(self):
+        batch, job = self.make_batch_job()
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(JobService.requeue_stale(timedelta(minutes=15)), 0)
+
+        batch.refresh_from_db()
+        self.assertTrue(batch.is_done)
+        self.assertEqual(batch.completed, 1)
+        self.assertEqual(batch.failed, 3)
+
+    @patch("recipes.services.job_handlers.BatchGenerationService.run_batch")
+    def test_failed_batch_job_finishes_its_batch(self, mock_run_batch):
+        mock_run_batch.side_effect = RuntimeError("database went away")
+        batch, job = self.make_batch_job()
+        self.assertEqual(JobService.run_job(job).status, "failed")
+
+        batch.refresh_from_db()
+        self.assertTrue(batch.is_done)
+        self.assertEqual(batch.failed, 3)
+
+
+class JobViewsTest(TestCase):
+    """Tests for the job-queueing AI endpoint and the job status view."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("testuser", password="testpass123")
+        self.client = Client()
+        self.client.login(username="testuser", password="testpass123")
+
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    def test_ai_generate_queues_job(self):
+        response = self.client.post(
+            reverse("ai_generate_recipe_api"), {"ai_prompt": "a quick curry"}
+        )
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        job = Job.objects.get(pk=data["job_id"])
+        self.assertEqual(job.kind, "ai_generate_recipe")
+        self.assertEqual(job.payload, {"prompt": "a quick curry"})
+        self.assertEqual(job.user, self.user)
+        self.assertEqual(data["status_url"], reverse("job_status", args=[job.pk]))
+
+    @override_settings(ANTHROPIC_API_KEY="")
+    def test_ai_generate_without_api_key(self):
+        response = self.client.post(
+            reverse("ai_generate_recipe_api"), {"ai_prompt": "a quick curry"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    def test_ai_generate_requires_prompt(self):
+        response = self.client.post(reverse("ai_generate_recipe_api"), {})
+        self.assertEqual(response.status_code, 400)
+
+    def test_status_of_queued_job(self):
+        job = JobService.enqueue("ai_generate_recipe", {"prompt": "x"}, user=self.user)
+        data = self.client.get(reverse("job_status", args=[job.pk])).json()
+        self.assertEqual(data["status"], "queued")
+        self.assertFalse(data["finished"])
+        self.assertIsNone(data["result"])
+
+    def test_status_hidden_from_other_users(self):
+        other = User.objects.create_user("other", password="testpass123")
+        job = JobService.enqueue("ai_generate_recipe", {"prompt": "x"}, user=other)
+        response = self.client.get(reverse("job_status", args=[job.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_status_requires_login(self):
+        job = JobService.enqueue("ai_generate_recipe", {"prompt": "x"}, user=self.user)
+        self.client.logout()
+        response = self.client.get(reverse("job_status", args=[job.pk]))
+        self.assertEqual(response.status_code, 302)
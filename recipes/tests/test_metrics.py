@@ -0,0 +1,231 @@
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from recipes.models import MealPlan, Recipe
+from recipes.models.household import Household, HouseholdMembership
+from recipes.services import ReminderService, ShoppingListService
+from recipes.services.ai_service import AIService, AIValidationError
+from recipes.utils import metrics
+from recipes.utils.metrics import Counter, Histogram, MetricsStore
+
+METRICS_DIR = tempfile.mkdtemp()
+
+
+@override_settings(METRICS_DB=os.path.join(METRICS_DIR, "metrics.sqlite3"))
+class MetricsTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(METRICS_DIR, exist_ok=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(METRICS_DIR, ignore_errors=True)
+
+    def setUp(self):
+        metrics.store.clear()
+
+    def sample(self, name, labels=""):
+        return metrics.store.totals().get((name, labels), 0)
+
+
+class MetricTypesTest(MetricsTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(metrics, "REGISTRY", [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counter_renders_labels_escaped(self):
+        counter = Counter("jobs_total", "Jobs run.", ["kind"])
+        counter.inc(kind='say "hi"\n')
+        counter.inc(2, kind='say "hi"\n')
+
+        text = metrics.render()
+        self.assertIn("# HELP jobs_total Jobs run.\n# TYPE jobs_total counter\n", text)
+        self.assertIn('jobs_total{kind="say \\"hi\\"\\n"} 3\n', text)
+
+    def test_counter_requires_declared_labels(self):
+        counter = Counter("jobs_total", "Jobs run.", ["kind"])
+        with self.assertRaises(ValueError):
+            counter.inc(other="x")
+
+    def test_histogram_buckets_are_cumulative_and_ordered(self):
+        histogram = Histogram("wait_seconds", "Waits.", buckets=(0.5, 2, 10))
+        histogram.observe(0.1)
+        histogram.observe(1.5)
+        histogram.observe(30)
+
+        lines = metrics.render().splitlines()
+        self.assertEqual(
+            lines[2:],
+            [
+                'wait_seconds_bucket{le="0.5"} 1',
+                'wait_seconds_bucket{le="2"} 2',
+                'wait_seconds_bucket{le="10"} 2',
+                'wait_seconds_bucket{le="+Inf"} 3',
+                "wait_seconds_sum 31.6",
+                "wait_seconds_count 3",
+            ],
+        )
+
+    def test_time_observes_when_block_raises(self):
+        histogram = Histogram("step_seconds", "Steps.", ["step"])
+        with self.assertRaises(RuntimeError):
+            with histogram.time(step="one"):
+                raise RuntimeError
+
+        self.assertEqual(self.sample("step_seconds_count", 'step="one"'), 1)
+
+    @override_settings(METRICS_DB="")
+    def test_disabled_records_nothing(self):
+        Counter("jobs_total", "Jobs run.").inc()
+        self.assertEqual(dict(metrics.store._pending), {})
+
+
+class MetricsStoreTest(MetricsTestCase):
+    def test_processes_add_to_shared_totals(self):
+        key = ("jobs_total", "")
+        other = MetricsStore()
+        metrics.store.add(key, 2)
+        other.add(key, 3)
+        other.flush()
+
+        self.assertEqual(metrics.store.totals()[key], 5)
+        self.assertEqual(metrics.store.totals()[key], 5)
+
+    def test_forked_child_drops_parent_pending(self):
+        metrics.store.add(("jobs_total", ""), 2)
+        metrics.store._pid = -1  # as seen from a freshly forked worker
+        metrics.store.add(("jobs_total", ""), 1)
+
+        self.assertEqual(self.sample("jobs_total"), 1)
+
+    def test_failed_flush_keeps_pending_values(self):
+        key = ("jobs_total", "")
+        store = MetricsStore()
+        store.add(key, 2)
+        with override_settings(METRICS_DB=os.path.join(METRICS_DIR, "missing", "db")):
+            with self.assertLogs("recipes.utils.metrics", "WARNING"):
+                store.flush()
+        store.add(key, 1)
+        store.flush()
+
+        self.assertEqual(self.sample(*key), 3)
+
+
+class MetricsViewTest(MetricsTestCase):
+    def test_renders_text_format(self):
+        metrics.PUSH_SENDS.inc(outcome="sent")
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response["Content-Type"].startswith("text/plain; version=0.0.4")
+        )
+        self.assertIn('push_sends_total{outcome="sent"} 1', response.content.decode())
+
+    @override_settings(METRICS_DB="")
+    def test_not_found_when_disabled(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_requires_token_when_set(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        wrong = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer nope")
+        self.assertEqual(wrong.status_code, 401)
+        right = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(right.status_code, 200)
+
+    def test_middleware_records_requests_by_url_name(self):
+        user = User.objects.create_user("metrics", password="pw")
+        household = Household.objects.create(name="Metrics")
+        HouseholdMembership.objects.create(user=user, household=household)
+        self.client.force_login(user)
+
+        self.client.get("/week/")
+        self.client.get("/no-such-page/")
+
+        self.assertEqual(
+            self.sample(
+                "http_request_duration_seconds_count",
+                'view="week",method="GET",status="200"',
+            ),
+            1,
+        )
+        self.assertEqual(
+            self.sample(
+                "http_request_duration_seconds_count",
+                'view="unmatched",method="GET",status="404"',
+            ),
+            1,
+        )
+        self.assertGreater(self.sample("http_request_db_queries_sum", 'view="week"'), 0)
+
+
+class InstrumentationTest(MetricsTestCase):
+    @patch("recipes.services.ai_service.get_client")
+    @patch("recipes.services.ai_service.settings.ANTHROPIC_API_KEY", "test-key")
+    def test_ai_calls_and_errors(self, mock_get_client):
+        block = MagicMock(type="text", text="Title: T\nIngredients: I\nSteps: S")
+        create = mock_get_client.return_value.messages.create
+        create.return_value = MagicMock(content=[block])
+        AIService.generate_recipe_from_prompt("chicken")
+
+        with self.assertRaises(AIValidationError):
+            AIService.generate_recipe_from_prompt("   ")
+
+        self.assertEqual(
+            self.sample(
+                "ai_request_duration_seconds_count", 'operation="generate_recipe"'
+            ),
+            1,
+        )
+        self.assertEqual(
+            self.sample(
+                "ai_errors_total",
+                'operation="generate_recipe",error="AIValidationError"',
+            ),
+            1,
+        )
+
+    @patch("recipes.services.reminder_service.ReminderService.send_push")
+    def test_push_outcomes(self, mock_send):
+        mock_send.side_effect = [None, requests.Timeout("slow")]
+        reminders = [(MagicMock(), "{}"), (MagicMock(), "{}")]
+
+        ReminderService.dispatch(reminders, workers=1)
+
+        self.assertEqual(self.sample("push_sends_total", 'outcome="sent"'), 1)
+        self.assertEqual(self.sample("push_sends_total", 'outcome="failed"'), 1)
+
+    def test_shopping_syncs(self):
+        user = User.objects.create_user("shopper", password="pw")
+        household = Household.objects.create(name="Shoppers")
+        recipe = Recipe.objects.create(title="Soup", user=user, steps="Simmer")
+        meal = MealPlan.objects.create(
+            household=household,
+            added_by=user,
+            date=date.today(),
+            meal_type="dinner",
+            recipe=recipe,
+        )
+
+        ShoppingListService.sync_generated_items(household, user, [meal.pk])
+        household.refresh_from_db()
+        ShoppingListService.sync_generated_items(household, user, [meal.pk])
+
+        self.assertEqual(self.sample("shopping_list_syncs_total", 'result="synced"'), 1)
+        self.assertEqual(
+            self.sample("shopping_list_syncs_total", 'result="skipped"'), 1
+        )
+        self.assertEqual(self.sample("shopping_list_sync_duration_seconds_count"), 1)
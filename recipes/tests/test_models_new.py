@@ -5,6 +5,9 @@ Covers:
 - Ingredient creation and uniqueness
 - RecipeIngredient creation with/without quantity
 - CookingNote creation and Recipe.average_rating property
+- RecipeStats / UserRecipeStats maintenance and backfill
+- RecipeSearchDocument indexing and ranked full-text search
+- HouseholdRecipe visibility maintenance and Recipe.objects.visible_to
 - ShoppingListItem creation and toggle
 - Tag with tag_type
 - Recipe with source field
@@ -13,20 +16,25 @@ Covers:
 
 from datetime import date
 from decimal import Decimal
+from io import StringIO
 
 from django.contrib.auth.models import User
 from django.db import IntegrityError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from recipes.models import (
     MEAL_CHOICES,
     CookingNote,
+    HouseholdRecipe,
     Ingredient,
     MealPlan,
     Recipe,
     RecipeIngredient,
+    RecipeSearchDocument,
+    RecipeStats,
     ShoppingListItem,
     Tag,
+    UserRecipeStats,
 )
 from recipes.models.household import Household, HouseholdMembership
 
@@ -201,6 +209,79 @@ class CookingNoteModelTests(TestCase):
         latest = self.recipe.latest_note
         self.assertEqual(latest.note, "Second time")
 
+    def test_stats_follow_note_edits_and_deletes(self):
+        note = CookingNote.objects.create(
+            recipe=self.recipe,
+            user=self.user,
+            cooked_date=date(2026, 3, 1),
+            rating=4,
+        )
+        CookingNote.objects.create(
+            recipe=self.recipe,
+            user=self.user,
+            cooked_date=date(2026, 3, 5),
+            rating=2,
+            would_make_again=False,
+        )
+        stats = RecipeStats.objects.get(recipe=self.recipe)
+        self.assertEqual(stats.rating_sum, 6)
+        self.assertEqual(stats.cook_count, 2)
+        self.assertEqual(stats.last_cooked_date, date(2026, 3, 5))
+        self.assertFalse(stats.last_would_make_again)
+
+        note.rating = 5
+        note.save()
+        self.assertEqual(RecipeStats.objects.get(recipe=self.recipe).rating_sum, 7)
+
+        CookingNote.objects.filter(recipe=self.recipe).delete()
+        self.assertFalse(RecipeStats.objects.filter(recipe=self.recipe).exists())
+        self.assertFalse(UserRecipeStats.objects.filter(recipe=self.recipe).exists())
+
+    def test_user_stats_are_per_user(self):
+        other = User.objects.create_user("other", password="pass1234")
+        CookingNote.objects.create(
+            recipe=self.recipe, user=self.user, cooked_date=date(2026, 3, 1), rating=5
+        )
+        CookingNote.objects.create(
+            recipe=self.recipe, user=other, cooked_date=date(2026, 3, 2), rating=1
+        )
+        self.assertEqual(RecipeStats.objects.get(recipe=self.recipe).cook_count, 2)
+        mine = UserRecipeStats.objects.get(recipe=self.recipe, user=self.user)
+        self.assertEqual(mine.average_rating, 5.0)
+        self.assertEqual(mine.cook_count, 1)
+
+    def test_deleting_recipe_with_notes_removes_stats(self):
+        CookingNote.objects.create(
+            recipe=self.recipe, user=self.user, cooked_date=date(2026, 3, 1), rating=3
+        )
+        self.recipe.delete()
+        self.assertEqual(RecipeStats.objects.count(), 0)
+        self.assertEqual(UserRecipeStats.objects.count(), 0)
+
+    def test_backfill_command_rebuilds_stats(self):
+        from django.core.management import call_command
+
+        CookingNote.objects.create(
+            recipe=self.recipe, user=self.user, cooked_date=date(2026, 3, 1), rating=4
+        )
+        CookingNote.objects.create(
+            recipe=self.recipe, user=self.user, cooked_date=date(2026, 3, 9)
+        )
+        # Simulate stats drifting from the notes table
+        RecipeStats.objects.all().delete()
+        UserRecipeStats.objects.all().delete()
+
+        call_command("backfill_recipe_stats", stdout=StringIO())
+
+        stats = RecipeStats.objects.get(recipe=self.recipe)
+        self.assertEqual(stats.rating_count, 1)
+        self.assertEqual(stats.cook_count, 2)
+        self.assertEqual(stats.average_rating, 4.0)
+        self.assertEqual(stats.last_cooked_date, date(2026, 3, 9))
+        self.assertTrue(
+            UserRecipeStats.objects.filter(recipe=self.recipe, user=self.user).exists()
+        )
+
     def test_ordering_by_cooked_date_desc(self):
         CookingNote.objects.create(
             recipe=self.recipe,
@@ -432,3 +513,188 @@ class MealPlanNotesFieldTests(TestCase):
         self.assertIn("breakfast", choices_dict)
         self.assertIn("lunch", choices_dict)
         self.assertIn("dinner", choices_dict)
+
+
+class RecipeSearchTests(TestCase):
+    """Tests for the recipe search document and full-text RecipeQuerySet.search."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="searcher", password="pass")
+        # Drop the demo recipes so results only contain the fixtures below
+        Recipe.objects.filter(user=self.user).delete()
+        self.curry = Recipe.objects.create(
+            user=self.user,
+            title="Chickpea Curry",
+            ingredients_text="400g chickpeas\n1 onion",
+            steps="Simmer",
+        )
+        self.soup = Recipe.objects.create(
+            user=self.user,
+            title="Tomato Soup",
+            ingredients_text="Tomatoes\nCurry powder",
+            steps="Blend",
+        )
+
+    def titles(self, query):
+        return list(
+            Recipe.objects.filter(user=self.user)
+            .search(query)
+            .order_by("-search_rank", "title")
+            .values_list("title", flat=True)
+        )
+
+    def test_prefix_match_on_title_and_ingredients(self):
+        self.assertEqual(self.titles("chick"), ["Chickpea Curry"])
+        self.assertEqual(self.titles("tomat"), ["Tomato Soup"])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.titles("curry onion"), ["Chickpea Curry"])
+        self.assertEqual(self.titles("curry nothing"), [])
+
+    def test_title_match_ranks_above_ingredient_match(self):
+        self.assertEqual(self.titles("curry"), ["Chickpea Curry", "Tomato Soup"])
+
+    def test_blank_or_punctuation_query_returns_nothing(self):
+        self.assertEqual(self.titles("  ?! "), [])
+
+    def test_document_follows_recipe_edits(self):
+        self.soup.title = "Pumpkin Broth"
+        self.soup.save()
+        self.assertEqual(self.titles("pumpkin"), ["Pumpkin Broth"])
+        self.assertEqual(self.titles("soup"), [])
+
+    def test_document_follows_structured_ingredients(self):
+        ginger = Ingredient.objects.create(name="ginger")
+        row = RecipeIngredient.objects.create(recipe=self.soup, ingredient=ginger)
+        self.assertEqual(self.titles("ginger"), ["Tomato Soup"])
+
+        ginger.name = "galangal"
+        ginger.save()
+        self.assertEqual(self.titles("ginger"), [])
+        self.assertEqual(self.titles("galangal"), ["Tomato Soup"])
+
+        row.delete()
+        self.assertEqual(self.titles("galangal"), [])
+
+    def test_deleting_recipe_with_ingredients_removes_document(self):
+        RecipeIngredient.objects.create(
+            recipe=self.curry, ingredient=Ingredient.objects.create(name="cumin")
+        )
+        self.curry.delete()
+        self.assertFalse(
+            RecipeSearchDocument.objects.filter(recipe_id=self.curry.pk).exists()
+        )
+        self.assertEqual(self.titles("cumin"), [])
+
+    @override_settings(RECIPE_SEARCH_BACKEND="recipes.models.search.BasicSearchBackend")
+    def test_basic_backend_fallback(self):
+        self.assertEqual(self.titles("chickpea"), ["Chickpea Curry"])
+        self.assertEqual(self.titles("curry"), ["Chickpea Curry", "Tomato Soup"])
+
+    def test_rebuild_command_restores_documents(self):
+        from django.core.management import call_command
+
+        RecipeSearchDocument.objects.all().delete()
+        self.assertEqual(self.titles("chick"), [])
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(self.titles("chick"), ["Chickpea Curry"])
+
+
+class HouseholdRecipeVisibilityTests(TestCase):
+    """Tests for the materialized HouseholdRecipe rows behind visible_to."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="pass")
+        self.member = User.objects.create_user(username="member", password="pass")
+        self.household = Household.objects.create(name="Home")
+        HouseholdMembership.objects.create(user=self.owner, household=self.household)
+        HouseholdMembership.objects.create(user=self.member, household=self.household)
+        self.recipe = Recipe.objects.create(
+            user=self.owner, title="Family Lasagne", steps="Bake"
+        )
+
+    def visible_titles(self, user, include_planned=False):
+        return set(
+            Recipe.objects.visible_to(
+                user, self.household, include_planned=include_planned
+            ).values_list("title", flat=True)
+        )
+
+    def test_sharing_toggles_visibility(self):
+        self.assertNotIn("Family Lasagne", self.visible_titles(self.member))
+
+        self.recipe.shared = True
+        self.recipe.save()
+        self.assertIn("Family Lasagne", self.visible_titles(self.member))
+
+        self.recipe.shared = False
+        self.recipe.save()
+        self.assertNotIn("Family Lasagne", self.visible_titles(self.member))
+        self.assertFalse(HouseholdRecipe.objects.exists())
+
+    def test_membership_changes_move_shared_recipes(self):
+        self.recipe.shared = True
+        self.recipe.save()
+        other = Household.objects.create(name="Flat")
+
+        membership = self.owner.household_membership
+        membership.household = other
+        membership.save()
+        self.assertNotIn("Family Lasagne", self.visible_titles(self.member))
+        self.assertTrue(
+            HouseholdRecipe.objects.filter(household=other, shared=True).exists()
+        )
+
+        membership.delete()
+        self.assertFalse(HouseholdRecipe.objects.exists())
+
+    def test_planned_recipe_visible_only_with_include_planned(self):
+        meal = MealPlan.objects.create(
+            household=self.household,
+            added_by=self.owner,
+            date=date(2026, 3, 28),
+            meal_type="dinner",
+            recipe=self.recipe,
+        )
+        self.assertNotIn("Family Lasagne", self.visible_titles(self.member))
+        self.assertIn(
+            "Family Lasagne", self.visible_titles(self.member, include_planned=True)
+        )
+
+        # Swapping the meal's recipe drops the old planned link
+        meal.recipe = Recipe.objects.create(user=self.owner, title="Soup", steps="s")
+        meal.save()
+        titles = self.visible_titles(self.member, include_planned=True)
+        self.assertNotIn("Family Lasagne", titles)
+        self.assertIn("Soup", titles)
+
+        meal.delete()
+        self.assertFalse(HouseholdRecipe.objects.exists())
+
+    def test_deleting_household_or_recipe_cascades(self):
+        self.recipe.shared = True
+        self.recipe.save()
+        MealPlan.objects.create(
+            household=self.household,
+            added_by=self.owner,
+            date=date(2026, 3, 28),
+            meal_type="dinner",
+            recipe=self.recipe,
+        )
+        self.recipe.delete()
+        self.assertFalse(HouseholdRecipe.objects.exists())
+
+        Recipe.objects.create(user=self.owner, title="Pie", steps="s", shared=True)
+        self.household.delete()
+        self.assertFalse(HouseholdRecipe.objects.exists())
+
+    def test_visible_to_needs_no_join_or_distinct(self):
+        sql = str(
+            Recipe.objects.visible_to(
+                self.member, self.household, include_planned=True
+            ).query
+        )
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn("JOIN", sql)
@@ -1,5 +1,5 @@
 import json
-from datetime import date, time
+from datetime import date, time, timedelta
 from unittest.mock import MagicMock, patch
 
 from django.contrib.auth.models import User
@@ -184,7 +184,7 @@ class SendDinnerRemindersTest(TestCase):
         )
 
     @patch("recipes.management.commands.send_dinner_reminders.timezone")
-    @patch("recipes.management.commands.send_dinner_reminders.webpush")
+    @patch("recipes.services.push_sender.PushSender.send")
     def test_sends_reminder_for_matching_user(self, mock_webpush, mock_tz):
         from datetime import datetime
 
@@ -230,7 +230,7 @@ class SendDinnerRemindersTest(TestCase):
         self.assertIn("30 min", payload["body"])
 
     @patch("recipes.management.commands.send_dinner_reminders.timezone")
-    @patch("recipes.management.commands.send_dinner_reminders.webpush")
+    @patch("recipes.services.push_sender.PushSender.send")
     def test_skips_user_without_dinner(self, mock_webpush, mock_tz):
         from datetime import datetime
 
@@ -260,7 +260,7 @@ class SendDinnerRemindersTest(TestCase):
         mock_webpush.assert_not_called()
 
     @patch("recipes.management.commands.send_dinner_reminders.timezone")
-    @patch("recipes.management.commands.send_dinner_reminders.webpush")
+    @patch("recipes.services.push_sender.PushSender.send")
     def test_removes_expired_subscription(self, mock_webpush, mock_tz):
         from datetime import datetime
 
@@ -312,3 +312,340 @@ class SendDinnerRemindersTest(TestCase):
         out = StringIO()
         call_command("send_dinner_reminders", stdout=out)
         self.assertIn("VAPID keys not configured", out.getvalue())
+
+
+@override_settings(
+    VAPID_PUBLIC_KEY="test-public-key",
+    VAPID_PRIVATE_KEY="test-private-key",
+    PUSH_WORKERS=4,
+    PUSH_TIMEOUT=5,
+)
+class ReminderServiceTest(TestCase):
+    def setUp(self):
+        from datetime import datetime
+
+        from django.utils import timezone as real_tz
+
+        self.now = real_tz.make_aware(datetime(2026, 3, 29, 16, 0, 0))
+
+    def make_household(self, name, users=1, dinner=True, reminder=time(16, 0)):
+        owner = None
+        for i in range(users):
+            user = User.objects.create_user(username=f"{name}{i}", password="pw")
+            if owner is None:
+                owner = user
+                household = Household.objects.create(
+                    name=name, code=name[:6].upper(), created_by=user
+                )
+            HouseholdMembership.objects.create(user=user, household=household)
+            MealPlannerPreferences.objects.update_or_create(
+                user=user, defaults={"reminder_time": reminder}
+            )
+            PushSubscription.objects.create(
+                user=user,
+                endpoint=f"https://push.example.com/{name}/{i}",
+                p256dh="key",
+                auth="auth",
+            )
+        if dinner:
+            recipe = Recipe.objects.create(
+                title=f"{name} stew", user=owner, steps="Stew."
+            )
+            MealPlan.objects.create(
+                household=household,
+                date=self.now.date(),
+                meal_type="dinner",
+                recipe=recipe,
+                added_by=owner,
+            )
+        return household
+
+    def test_due_reminders_use_fixed_queries(self):
+        from recipes.services import ReminderService
+
+        self.make_household("alpha", users=2)
+        with self.assertNumQueries(6):
+            reminders = ReminderService.due_reminders(self.now)
+        self.assertEqual(len(reminders), 2)
+
+        for name in ("bravo", "charlie", "delta"):
+            self.make_household(name, users=3)
+        with self.assertNumQueries(6):
+            reminders = ReminderService.due_reminders(self.now)
+        self.assertEqual(len(reminders), 9)
+        payload = json.loads(reminders[0][1])
+        self.assertEqual(payload["title"], "Tonight's Dinner")
+
+    def test_due_reminders_are_claimed_once_a_day(self):
+        from recipes.models import ReminderLog
+        from recipes.services import ReminderService
+
+        self.make_household("golf", users=2)
+        self.assertEqual(len(ReminderService.due_reminders(self.now)), 2)
+        self.assertEqual(ReminderService.due_reminders(self.now), [])
+        self.assertEqual(ReminderLog.objects.filter(date=self.now.date()).count(), 2)
+        tomorrow = self.now + timedelta(days=1)
+        MealPlan.objects.update(date=tomorrow.date())
+        self.assertEqual(len(ReminderService.due_reminders(tomorrow)), 2)
+
+    def test_due_reminders_skip_users_not_due(self):
+        from recipes.services import ReminderService
+
+        self.make_household("nodinner", dinner=False)
+        self.make_household("later", reminder=time(18, 0))
+        User.objects.create_user(username="loner", password="pw")
+        self.assertEqual(ReminderService.due_reminders(self.now), [])
+
+    @patch("recipes.services.push_sender.PushSender.send")
+    def test_dispatch_sends_with_timeout_and_deletes_expired(self, mock_webpush):
+        import requests
+        from pywebpush import WebPushException
+
+        from recipes.services import ReminderService
+
+        self.make_household("echo", users=5)
+        gone = MagicMock(status_code=410)
+        outcomes = {
+            "https://push.example.com/echo/1": WebPushException("Gone", response=gone),
+            "https://push.example.com/echo/2": WebPushException("Gone", response=gone),
+            "https://push.example.com/echo/3": requests.Timeout("slow"),
+            "https://push.example.com/echo/4": ValueError("Could not deserialize key"),
+        }
+
+        def fake_webpush(subscription_info, **kwargs):
+            error = outcomes.get(subscription_info["endpoint"])
+            if error:
+                raise error
+
+        mock_webpush.side_effect = fake_webpush
+        reminders = ReminderService.due_reminders(self.now)
+        with self.assertNumQueries(1):
+            result = ReminderService.dispatch(reminders)
+
+        self.assertEqual(len(result["sent"]), 1)
+        self.assertEqual(len(result["expired"]), 2)
+        self.assertEqual(len(result["failed"]), 2)
+        self.assertEqual(mock_webpush.call_count, 5)
+        for call in mock_webpush.call_args_list:
+            self.assertEqual(call.kwargs["timeout"], 5)
+        self.assertEqual(
+            sorted(PushSubscription.objects.values_list("endpoint", flat=True)),
+            [
+                "https://push.example.com/echo/0",
+                "https://push.example.com/echo/3",
+                "https://push.example.com/echo/4",
+            ],
+        )
+
+    @patch("recipes.services.push_sender.PushSender.send")
+    def test_dispatch_runs_pushes_concurrently(self, mock_webpush):
+        import threading
+
+        from recipes.services import ReminderService
+
+        self.make_household("foxtrot", users=4)
+        barrier = threading.Barrier(4, timeout=5)
+        mock_webpush.side_effect = lambda **kwargs: barrier.wait()
+
+        result = ReminderService.dispatch(ReminderService.due_reminders(self.now))
+        self.assertEqual(len(result["sent"]), 4)
+
+
+@override_settings(
+    VAPID_PUBLIC_KEY="test-public-key",
+    VAPID_PRIVATE_KEY="test-private-key",
+    REMINDER_GRACE=1800,
+    REMINDER_REFRESH_INTERVAL=3600,
+)
+class ReminderSchedulerTest(TestCase):
+    def setUp(self):
+        from datetime import datetime
+
+        from django.utils import timezone as real_tz
+
+        from recipes.services.reminder_scheduler import ReminderScheduler
+
+        self.at = lambda hour, minute=0, day=29: real_tz.make_aware(
+            datetime(2026, 3, day, hour, minute)
+        )
+        self.user = User.objects.create_user(username="cook", password="pw")
+        household = Household.objects.create(
+            name="Home", code="HOME01", created_by=self.user
+        )
+        HouseholdMembership.objects.create(user=self.user, household=household)
+        MealPlannerPreferences.objects.update_or_create(
+            user=self.user, defaults={"reminder_time": time(17, 30)}
+        )
+        PushSubscription.objects.create(
+            user=self.user,
+            endpoint="https://push.example.com/cook",
+            p256dh="key",
+            auth="auth",
+        )
+        recipe = Recipe.objects.create(title="Curry", user=self.user, steps="Cook.")
+        for day in (29, 30):
+            MealPlan.objects.create(
+                household=household,
+                date=date(2026, 3, day),
+                meal_type="dinner",
+                recipe=recipe,
+                added_by=self.user,
+            )
+        self.scheduler = ReminderScheduler()
+
+    @patch("recipes.services.push_sender.PushSender.send")
+    def test_fires_once_at_reminder_time(self, mock_webpush):
+        self.assertEqual(self.scheduler.tick(self.at(17, 29)), 0)
+        self.assertEqual(self.scheduler.heap[0][0], self.at(17, 30))
+        self.assertEqual(self.scheduler.tick(self.at(17, 30)), 1)
+        self.assertEqual(self.scheduler.tick(self.at(17, 45)), 0)
+        self.assertEqual(self.scheduler.heap[0][0], self.at(17, 30, day=30))
+        self.assertEqual(self.scheduler.tick(self.at(17, 31, day=30)), 1)
+        self.assertEqual(mock_webpush.call_count, 2)
+
+    @patch("recipes.services.push_sender.PushSender.send")
+    def test_late_start_sends_within_grace_only(self, mock_webpush):
+        from recipes.models import ReminderLog
+        from recipes.services.reminder_scheduler import ReminderScheduler
+
+        self.assertEqual(self.scheduler.tick(self.at(17, 50)), 1)
+        ReminderLog.objects.all().delete()
+        late = ReminderScheduler()
+        self.assertEqual(late.tick(self.at(18, 30)), 0)
+        self.assertEqual(late.heap[0][0], self.at(17, 30, day=30))
+
+    @patch("recipes.services.push_sender.PushSender.send")
+    def test_restart_does_not_resend(self, mock_webpush):
+        from recipes.services.reminder_scheduler import ReminderScheduler
+
+        self.scheduler.tick(self.at(17, 30))
+        restarted = ReminderScheduler()
+        self.assertEqual(restarted.tick(self.at(17, 35)), 0)
+        self.assertEqual(mock_webpush.call_count, 1)
+
+    @patch("recipes.services.push_sender.PushSender.send")
+    def test_preference_change_reloads_heap(self, mock_webpush):
+        self.scheduler.tick(self.at(12, 0))
+        with self.assertNumQueries(1):
+            self.assertFalse(self.scheduler.refresh_if_needed(self.at(12, 1)))
+
+        prefs = MealPlannerPreferences.objects.get(user=self.user)
+        prefs.reminder_time = time(12, 30)
+        prefs.save()
+        self.assertEqual(self.scheduler.tick(self.at(12, 30)), 1)
+
+    def test_waits_for_next_reminder_or_poll(self):
+        from recipes.services.reminder_scheduler import ReminderScheduler
+
+        scheduler = ReminderScheduler(poll_interval=120)
+        scheduler.load(self.at(17, 29))
+        self.assertEqual(scheduler.seconds_until_next(self.at(17, 29)), 60)
+        self.assertEqual(scheduler.seconds_until_next(self.at(12, 0)), 120)
+
+    @patch("recipes.services.reminder_scheduler.timezone.localtime")
+    @patch("recipes.services.push_sender.PushSender.send")
+    def test_command_once(self, mock_webpush, mock_localtime):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        mock_localtime.return_value = self.at(17, 30)
+        out = StringIO()
+        call_command("reminder_scheduler", "--once", stdout=out)
+        self.assertIn("Sent 1 dinner reminders", out.getvalue())
+
+
+def b64url(raw):
+    import base64
+
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def generate_keys():
+    """Return a raw VAPID private key and a browser-style subscription key pair."""
+    import os
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    vapid_key = ec.generate_private_key(ec.SECP256R1())
+    client_key = ec.generate_private_key(ec.SECP256R1())
+    return (
+        b64url(vapid_key.private_numbers().private_value.to_bytes(32, "big")),
+        {
+            "p256dh": b64url(
+                client_key.public_key().public_bytes(
+                    serialization.Encoding.X962,
+                    serialization.PublicFormat.UncompressedPoint,
+                )
+            ),
+            "auth": b64url(os.urandom(16)),
+        },
+    )
+
+
+class PushSenderTest(TestCase):
+    def setUp(self):
+        from recipes.services.push_sender import PushSender
+
+        private_key, self.keys = generate_keys()
+        self.sender = PushSender(private_key, "mailto:test@example.com", pool_size=4)
+        self.addCleanup(self.sender.close)
+        self.post = patch.object(self.sender.session, "post").start()
+        self.addCleanup(patch.stopall)
+        self.post.return_value = MagicMock(status_code=201)
+
+    def send(self, endpoint):
+        return self.sender.send(
+            subscription_info={"endpoint": endpoint, "keys": self.keys},
+            data='{"title": "Dinner"}',
+            timeout=5,
+        )
+
+    def test_signs_once_per_origin(self):
+        self.send("https://fcm.example.com/send/a")
+        self.send("https://fcm.example.com/send/b")
+        self.send("https://updates.example.org/wpush/c")
+        self.assertEqual(self.sender.signatures, 2)
+        self.assertEqual(self.post.call_count, 3)
+
+        first, second, third = (c.kwargs["headers"] for c in self.post.call_args_list)
+        self.assertEqual(first["Authorization"], second["Authorization"])
+        self.assertNotEqual(first["Authorization"], third["Authorization"])
+        self.assertTrue(first["Authorization"].startswith("vapid t="))
+        self.assertEqual(self.post.call_args.kwargs["timeout"], 5)
+
+    def test_resigns_shortly_before_expiry(self):
+        import time as real_time
+
+        self.send("https://fcm.example.com/send/a")
+        later = (
+            real_time.time()
+            + self.sender.TOKEN_LIFETIME
+            - self.sender.REFRESH_MARGIN
+            + 1
+        )
+        with patch("recipes.services.push_sender.time.time", return_value=later):
+            self.send("https://fcm.example.com/send/a")
+        self.assertEqual(self.sender.signatures, 2)
+
+    def test_rejected_push_raises(self):
+        from pywebpush import WebPushException
+
+        self.post.return_value = MagicMock(status_code=410, reason="Gone", text="")
+        with self.assertRaises(WebPushException) as ctx:
+            self.send("https://fcm.example.com/send/a")
+        self.assertEqual(ctx.exception.response.status_code, 410)
+
+    @override_settings(
+        VAPID_PRIVATE_KEY="key-one",
+        VAPID_ADMIN_EMAIL="mailto:test@example.com",
+        PUSH_WORKERS=4,
+    )
+    def test_shared_sender_is_reused(self):
+        from recipes.services.push_sender import get_push_sender
+
+        sender = get_push_sender()
+        self.assertIs(get_push_sender(), sender)
+        with self.settings(VAPID_PRIVATE_KEY="key-two"):
+            self.assertIsNot(get_push_sender(), sender)
@@ -0,0 +1,152 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.middleware import QueryBudgetMiddleware
+from recipes.models import Recipe
+from recipes.utils.benchmark import dataset_user
+from recipes.utils.queries import QUERY_BUDGETS, QueryRecorder, normalize_sql
+from recipes.utils.seeding import DatasetSeeder
+
+
+class NormalizeSqlTest(TestCase):
+    def test_collapses_literals_and_in_lists(self):
+        self.assertEqual(
+            normalize_sql(
+                'SELECT "a" FROM "t"\n WHERE "id" IN (%s, %s, %s) AND "n" = 3'
+            ),
+            'SELECT "a" FROM "t" WHERE "id" IN (...) AND "n" = ?',
+        )
+        self.assertEqual(
+            normalize_sql("SELECT 1 FROM t WHERE name = 'it''s' AND x IN (%s)"),
+            "SELECT ? FROM t WHERE name = ? AND x IN (...)",
+        )
+
+    def test_keeps_identifiers(self):
+        sql = 'SELECT "recipes_recipe"."id" FROM "recipes_recipe" LIMIT 21'
+        self.assertEqual(
+            normalize_sql(sql),
+            'SELECT "recipes_recipe"."id" FROM "recipes_recipe" LIMIT ?',
+        )
+
+
+class QueryRecorderTest(TestCase):
+    def test_records_and_groups_queries(self):
+        with QueryRecorder() as recorder:
+            for pk in [1, 2, 3]:
+                list(Recipe.objects.filter(pk=pk))
+            list(Recipe.objects.filter(pk__in=[1, 2]))
+
+        self.assertEqual(recorder.count, 4)
+        duplicates = recorder.duplicates()
+        self.assertEqual(len(duplicates), 1)
+        self.assertEqual(duplicates[0][1], 3)
+        self.assertIn("3x", recorder.report())
+
+    def test_stops_recording_on_exit(self):
+        with QueryRecorder() as recorder:
+            list(Recipe.objects.all())
+        list(Recipe.objects.all())
+        self.assertEqual(recorder.count, 1)
+        self.assertEqual(connection.execute_wrappers, [])
+
+
+class QueryBudgetTest(TestCase):
+    """Every view in QUERY_BUDGETS, against a household full of data."""
+
+    @classmethod
+    def setUpTestData(cls):
+        DatasetSeeder(prefix="budget").seed(households=2, members=2, recipes=30)
+        cls.user, cls.household = dataset_user("budget")
+        cls.recipe = Recipe.objects.filter(user=cls.user).order_by("pk").first()
+        cls.user.favourites.add(*Recipe.objects.filter(user=cls.user)[:5])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def paths(self):
+        today = f"{timezone.localdate():%Y-%m-%d}"
+        recipe = self.recipe.pk
+        return {
+            "home": reverse("home"),
+            "week": reverse("week"),
+            "week_slot": reverse("week_slot", args=[today, "dinner"]),
+            "week_assign": reverse("week_assign", args=[today, "dinner"]),
+            "week_suggest": reverse("week_suggest") + "?offset=4",
+            "list_templates": reverse("list_templates"),
+            "shop": reverse("shop"),
+            "recipe_list": reverse("recipe_list"),
+            "recipe_search": reverse("recipe_search") + "?q=chicken",
+            "recipe_detail": reverse("recipe_detail", args=[recipe]),
+            "cook": reverse("cook", args=[recipe]),
+            "cook_step": reverse("cook_step", args=[recipe, 2]),
+            "settings": reverse("settings"),
+        }
+
+    def test_every_budget_is_exercised(self):
+        self.assertEqual(set(self.paths()), set(QUERY_BUDGETS))
+
+    def test_views_stay_within_budget(self):
+        limit = settings.QUERY_DUPLICATE_LIMIT
+        for name, path in self.paths().items():
+            with self.subTest(view=name):
+                # Measure every view cold, not after another filled the cache
+                cache.clear()
+                with QueryRecorder() as recorder:
+                    response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    recorder.count,
+                    QUERY_BUDGETS[name],
+                    f"{name} is over its query budget:\n{recorder.report()}",
+                )
+                self.assertEqual(
+                    recorder.duplicates(limit + 1),
+                    [],
+                    f"{name} repeats a query more than {limit} times",
+                )
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def run_middleware(self, url_name, queries):
+        def view(request):
+            for pk in range(queries):
+                list(Recipe.objects.filter(pk=pk))
+            request.resolver_match = type("Match", (), {"url_name": url_name})
+            return "response"
+
+        with self.assertLogs("recipes.middleware", logging.WARNING) as logs:
+            logging.getLogger("recipes.middleware").warning("marker")
+            response = QueryBudgetMiddleware(view)(self.factory.get("/"))
+        self.assertEqual(response, "response")
+        return logs.output[1:]
+
+    @override_settings(QUERY_BUDGET_LOGGING=True, QUERY_DUPLICATE_LIMIT=10)
+    def test_logs_request_over_budget(self):
+        output = self.run_middleware("week", QUERY_BUDGETS["week"] + 1)
+        self.assertEqual(len(output), 1)
+        self.assertIn("over its budget", output[0])
+
+    @override_settings(QUERY_BUDGET_LOGGING=True, QUERY_DUPLICATE_LIMIT=3)
+    def test_logs_repeated_queries(self):
+        output = self.run_middleware("privacy", 4)
+        self.assertEqual(len(output), 1)
+        self.assertIn("4x", output[0])
+
+    @override_settings(QUERY_BUDGET_LOGGING=True, QUERY_DUPLICATE_LIMIT=5)
+    def test_quiet_within_budget(self):
+        self.assertEqual(self.run_middleware("week", 2), [])
+
+    @override_settings(QUERY_BUDGET_LOGGING=False)
+    def test_disabled_by_default(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryBudgetMiddleware(lambda request: None)
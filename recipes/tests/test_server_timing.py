@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from recipes.models import Recipe
+from recipes.models.household import Household, HouseholdMembership
+from recipes.services.ai_service import AIService
+from recipes.utils.profiling import StackSampler
+from recipes.utils.timing import RequestTimer, current_timer, timed
+
+
+class RequestTimerTest(TestCase):
+    def test_accumulates_phases(self):
+        with RequestTimer() as timer:
+            self.assertIs(current_timer(), timer)
+            with timed("ai"):
+                pass
+            with timed("ai"):
+                pass
+            list(Recipe.objects.all())
+
+        self.assertIsNone(current_timer())
+        self.assertEqual(timer.counts, {"ai": 2, "db": 1})
+        self.assertGreater(timer.total_ms, 0)
+        header = timer.header()
+        self.assertIn("ai;dur=", header)
+        self.assertIn('desc="Anthropic API (2)"', header)
+        self.assertIn("db;dur=", header)
+        self.assertTrue(header.endswith('desc="Total"'))
+
+    def test_nested_phase_counted_once(self):
+        with RequestTimer() as timer:
+            with timed("template"):
+                with timed("template"):
+                    pass
+        self.assertEqual(timer.counts, {"template": 1})
+
+    def test_timed_outside_request_is_noop(self):
+        with timed("http-out"):
+            pass
+        self.assertIsNone(current_timer())
+
+    @patch("recipes.services.ai_service.get_client")
+    @patch("recipes.services.ai_service.settings.ANTHROPIC_API_KEY", "test-key")
+    def test_ai_calls_are_timed(self, mock_get_client):
+        block = MagicMock(type="text", text="Title: T\nIngredients: I\nSteps: S")
+        mock_get_client.return_value.messages.create.return_value = MagicMock(
+            content=[block]
+        )
+
+        with RequestTimer() as timer:
+            AIService.generate_recipe_from_prompt("chicken")
+
+        self.assertEqual(timer.counts["ai"], 1)
+
+
+@override_settings(SERVER_TIMING=True)
+class ServerTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("timer", password="pw")
+        household = Household.objects.create(name="Timers")
+        HouseholdMembership.objects.create(user=self.user, household=household)
+        self.client.force_login(self.user)
+
+    def test_reports_phases(self):
+        response = self.client.get("/week/")
+
+        header = response["Server-Timing"]
+        for phase in ["db;", "template;", "household;", "total;"]:
+            self.assertIn(phase, header)
+        self.assertNotIn("X-Profile-Output", response)
+
+    @override_settings(SERVER_TIMING=False)
+    def test_can_be_turned_off(self):
+        response = self.client.get("/week/")
+        self.assertNotIn("Server-Timing", response)
+
+
+class ProfilingTest(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        self.user = User.objects.create_user("staff", password="pw", is_staff=True)
+        household = Household.objects.create(name="Staff")
+        HouseholdMembership.objects.create(user=self.user, household=household)
+        self.client.force_login(self.user)
+
+    def profile(self, **extra):
+        with override_settings(PROFILING_ENABLED=True, MEDIA_ROOT=self.media):
+            return self.client.get("/week/", **extra)
+
+    def test_staff_header_saves_folded_stacks(self):
+        response = self.profile(HTTP_X_PROFILE="1")
+
+        name = response["X-Profile-Output"]
+        self.assertTrue(name.startswith("profiles/"))
+        self.assertTrue(name.endswith("-get-week.folded"))
+        self.assertTrue(os.path.exists(os.path.join(self.media, name)))
+
+    def test_cookie_triggers_profile(self):
+        self.client.cookies["profile"] = "1"
+        self.assertIn("X-Profile-Output", self.profile())
+
+    def test_only_staff_can_profile(self):
+        self.user.is_staff = False
+        self.user.save()
+        self.assertNotIn("X-Profile-Output", self.profile(HTTP_X_PROFILE="1"))
+
+    def test_disabled_by_default(self):
+        response = self.client.get("/week/", HTTP_X_PROFILE="1")
+        self.assertNotIn("X-Profile-Output", response)
+
+
+class StackSamplerTest(TestCase):
+    def test_samples_watched_thread(self):
+        sampler = StackSampler(thread_id=threading.get_ident())
+        sampler.sample()
+        sampler.sample()
+
+        self.assertEqual(sampler.samples, 2)
+        line = sampler.folded().splitlines()[0]
+        stack, count = line.rsplit(" ", 1)
+        self.assertEqual(count, "2")
+        self.assertIn("test_samples_watched_thread (test_server_timing.py:", stack)
+        self.assertTrue(stack.split(";")[-1].startswith("sample ("))
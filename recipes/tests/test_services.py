@@ -260,13 +260,13 @@ class AIServiceTest(TestCase):
         prompt = AIService.validate_prompt("  Valid prompt  ")
         self.assertEqual(prompt, "Valid prompt")
 
-    @patch("recipes.services.ai_service.anthropic.Anthropic")
+    @patch("recipes.services.ai_service.get_client")
     @patch("recipes.services.ai_service.settings.ANTHROPIC_API_KEY", "test-key")
-    def test_generate_recipe_from_prompt_success(self, mock_anthropic_class):
+    def test_generate_recipe_from_prompt_success(self, mock_get_client):
         """Test successful recipe generation"""
         # Mock the Anthropic API response
         mock_client = MagicMock()
-        mock_anthropic_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         mock_text_block = MagicMock()
         mock_text_block.type = "text"
@@ -282,12 +282,12 @@ class AIServiceTest(TestCase):
         self.assertIn("Test Recipe", result)
         mock_client.messages.create.assert_called_once()
 
-    @patch("recipes.services.ai_service.anthropic.Anthropic")
+    @patch("recipes.services.ai_service.get_client")
     @patch("recipes.services.ai_service.settings.ANTHROPIC_API_KEY", "test-key")
-    def test_generate_recipe_authentication_error(self, mock_anthropic_class):
+    def test_generate_recipe_authentication_error(self, mock_get_client):
         """Test recipe generation with authentication error"""
         mock_client = MagicMock()
-        mock_anthropic_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         # Create a mock response for AuthenticationError
         mock_response = MagicMock()
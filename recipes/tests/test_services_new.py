@@ -135,6 +135,75 @@ class GenerateStructuredShoppingListTests(TestCase):
         result = RecipeService.generate_structured_shopping_list(Recipe.objects.none())
         self.assertEqual(result, [])
 
+    def test_query_count_is_constant(self):
+        """Ingredients for every recipe are fetched in one query, however many meals."""
+        recipes = [self.recipe1, self.recipe2] * 7
+        with self.assertNumQueries(1):
+            shopping_list = RecipeService.generate_structured_shopping_list(recipes)
+
+        # Each occurrence of a recipe still contributes its quantities
+        eggs_entry = next(e for e in shopping_list if e["ingredient"].name == "Eggs")
+        self.assertEqual(eggs_entry["total_quantity"], Decimal("35"))
+
+
+class UnitAwareShoppingListTests(TestCase):
+    """Compatible units for the same ingredient merge into one shopping list entry."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="unituser", password="password")
+        self.chicken = Ingredient.objects.create(name="Chicken", category="meat")
+        self.cumin = Ingredient.objects.create(name="Cumin", category="spices")
+        self.recipe1 = Recipe.objects.create(
+            user=self.user, title="Curry", steps="Cook."
+        )
+        self.recipe2 = Recipe.objects.create(
+            user=self.user, title="Roast", steps="Roast."
+        )
+
+    def _entries(self, name):
+        shopping_list = RecipeService.generate_structured_shopping_list(
+            [self.recipe1, self.recipe2]
+        )
+        return [e for e in shopping_list if e["ingredient_name"] == name]
+
+    def test_grams_and_kilograms_merge(self):
+        """500 g + 1 kg chicken becomes a single 1.5 kg entry."""
+        RecipeIngredient.objects.create(
+            recipe=self.recipe1, ingredient=self.chicken, quantity=500, unit="g"
+        )
+        RecipeIngredient.objects.create(
+            recipe=self.recipe2, ingredient=self.chicken, quantity=1, unit="kg"
+        )
+        entries = self._entries("Chicken")
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["total_quantity"], Decimal("1.5"))
+        self.assertEqual(entries[0]["unit"], "kg")
+
+    def test_spoon_measures_merge(self):
+        """1 tsp + 1 tbsp cumin merges into tablespoons."""
+        RecipeIngredient.objects.create(
+            recipe=self.recipe1, ingredient=self.cumin, quantity=1, unit="tsp"
+        )
+        RecipeIngredient.objects.create(
+            recipe=self.recipe2, ingredient=self.cumin, quantity=1, unit="tbsp"
+        )
+        entries = self._entries("Cumin")
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["total_quantity"], Decimal("1.25"))
+        self.assertEqual(entries[0]["unit"], "tbsp")
+
+    def test_single_unit_is_not_converted(self):
+        """Quantities already in the same unit keep that unit."""
+        RecipeIngredient.objects.create(
+            recipe=self.recipe1, ingredient=self.chicken, quantity=800, unit="g"
+        )
+        RecipeIngredient.objects.create(
+            recipe=self.recipe2, ingredient=self.chicken, quantity=700, unit="g"
+        )
+        entries = self._entries("Chicken")
+        self.assertEqual(entries[0]["total_quantity"], Decimal("1500"))
+        self.assertEqual(entries[0]["unit"], "g")
+
 
 class CalculateRecipeHappinessScoreTests(TestCase):
     """Tests for MealPlanningAssistantService.calculate_recipe_happiness_score."""
@@ -248,6 +317,58 @@ class CalculateRecipeHappinessScoreTests(TestCase):
         # No rated notes — should return neutral 50
         self.assertEqual(score, Decimal("50.0"))
 
+    def test_bulk_scores_match_single_scores_in_one_query(self):
+        """Bulk scoring returns a score per recipe id with a single query."""
+        other = Recipe.objects.create(user=self.user, title="Other", steps="Cook.")
+        unrated = Recipe.objects.create(user=self.user, title="Unrated", steps="Cook.")
+        CookingNote.objects.create(
+            recipe=self.recipe,
+            user=self.user,
+            cooked_date=date.today() - timedelta(days=3),
+            rating=5,
+            would_make_again=True,
+        )
+        CookingNote.objects.create(
+            recipe=other,
+            user=self.user,
+            cooked_date=date.today() - timedelta(days=5),
+            rating=5,
+            would_make_again=True,
+        )
+        # Latest note for `other` says don't make again
+        CookingNote.objects.create(
+            recipe=other,
+            user=self.user,
+            cooked_date=date.today(),
+            rating=3,
+            would_make_again=False,
+        )
+
+        with self.assertNumQueries(1):
+            scores = MealPlanningAssistantService.calculate_recipe_happiness_scores(
+                [self.recipe, other, unrated], self.user
+            )
+
+        self.assertEqual(scores[self.recipe.id], Decimal("100.0"))
+        # Average 4 -> 75, minus 20 penalty
+        self.assertEqual(scores[other.id], Decimal("55.0"))
+        self.assertEqual(scores[unrated.id], Decimal("50.0"))
+
+    def test_bulk_scores_ignore_other_users_notes(self):
+        """Only the given user's notes contribute to their scores."""
+        stranger = User.objects.create_user(username="stranger", password="password")
+        CookingNote.objects.create(
+            recipe=self.recipe,
+            user=stranger,
+            cooked_date=date.today(),
+            rating=1,
+            would_make_again=False,
+        )
+        scores = MealPlanningAssistantService.calculate_recipe_happiness_scores(
+            [self.recipe], self.user
+        )
+        self.assertEqual(scores[self.recipe.id], Decimal("50.0"))
+
 
 class GetRecentlyCookedRecipesTests(TestCase):
     """Tests for MealPlanningAssistantService.get_recently_cooked_recipes."""
@@ -0,0 +1,205 @@
+import json
+
+from django.test import SimpleTestCase
+
+from recipes.utils.structured_data import (
+    extract_recipe,
+    parse_duration,
+    parse_ingredient_line,
+    parse_yield,
+)
+
+JSON_LD_RECIPE = {
+    "@context": "https://schema.org",
+    "@type": "Recipe",
+    "name": "Lemon Chicken &amp; Rice",
+    "description": "A weeknight <b>favourite</b>.",
+    "prepTime": "PT15M",
+    "cookTime": "PT1H",
+    "recipeYield": ["4", "4 servings"],
+    "recipeIngredient": [
+        "500g chicken thighs, diced",
+        "1 ½ cups long grain rice",
+        "2 lemons",
+        "Salt, to taste",
+    ],
+    "recipeInstructions": [
+        {"@type": "HowToStep", "text": "Brown the chicken."},
+        {
+            "@type": "HowToSection",
+            "name": "Rice",
+            "itemListElement": [
+                {"@type": "HowToStep", "text": "Add the rice."},
+                {"@type": "HowToStep", "text": "Simmer until tender."},
+            ],
+        },
+    ],
+}
+
+
+def page_with_json_ld(data):
+    return (
+        "<html><head><title>Blog</title>"
+        '<script type="application/ld+json">' + json.dumps(data) + "</script>"
+        "</head><body><nav>Menu</nav><p>Story time</p></body></html>"
+    )
+
+
+class ParseHelpersTest(SimpleTestCase):
+    """Tests for the schema.org value parsers."""
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("PT15M"), 15)
+        self.assertEqual(parse_duration("PT1H30M"), 90)
+        self.assertEqual(parse_duration("P0DT2H"), 120)
+        self.assertEqual(parse_duration(25), 25)
+        self.assertIsNone(parse_duration("15 minutes"))
+        self.assertIsNone(parse_duration(""))
+
+    def test_parse_yield(self):
+        self.assertEqual(parse_yield("Serves 6"), 6)
+        self.assertEqual(parse_yield(["8", "8 muffins"]), 8)
+        self.assertEqual(parse_yield(2), 2)
+        self.assertIsNone(parse_yield("a crowd"))
+
+    def test_ingredient_with_fraction_unit_and_notes(self):
+        self.assertEqual(
+            parse_ingredient_line("2 1/2 cups plain flour, sifted"),
+            {
+                "name": "plain flour",
+                "quantity": 2.5,
+                "unit": "cup",
+                "category": "other",
+                "preparation_notes": "sifted",
+            },
+        )
+
+    def test_ingredient_notes_fit_the_field(self):
+        line = "2 cups flour, " + "sifted twice " * 12
+        self.assertGreater(len(line), 150)
+        parsed = parse_ingredient_line(line)
+        self.assertEqual(len(parsed["preparation_notes"]), 100)
+        self.assertTrue(parsed["preparation_notes"].startswith("sifted twice"))
+
+    def test_ingredient_unicode_fraction(self):
+        parsed = parse_ingredient_line("1½ tbsp olive oil")
+        self.assertEqual(parsed["quantity"], 1.5)
+        self.assertEqual(parsed["unit"], "tbsp")
+        self.assertEqual(parsed["name"], "olive oil")
+
+    def test_ingredient_glued_unit_and_parenthetical(self):
+        parsed = parse_ingredient_line("400g (14 oz) spaghetti")
+        self.assertEqual(parsed["quantity"], 400)
+        self.assertEqual(parsed["unit"], "g")
+        self.assertEqual(parsed["name"], "spaghetti")
+        self.assertEqual(parsed["preparation_notes"], "14 oz")
+
+    def test_ingredient_range_uses_lower_bound(self):
+        parsed = parse_ingredient_line("2-3 cloves garlic, crushed")
+        self.assertEqual(parsed["quantity"], 2)
+        self.assertEqual(parsed["unit"], "clove")
+        self.assertEqual(parsed["name"], "garlic")
+
+    def test_ingredient_without_quantity(self):
+        parsed = parse_ingredient_line("Salt and pepper")
+        self.assertIsNone(parsed["quantity"])
+        self.assertEqual(parsed["unit"], "")
+        self.assertEqual(parsed["name"], "salt and pepper")
+
+    def test_count_ingredient_has_no_unit(self):
+        parsed = parse_ingredient_line("3 eggs")
+        self.assertEqual(parsed["quantity"], 3)
+        self.assertEqual(parsed["unit"], "")
+        self.assertEqual(parsed["name"], "eggs")
+
+
+class ExtractRecipeTest(SimpleTestCase):
+    """Tests for extracting recipes from JSON-LD and microdata."""
+
+    def test_json_ld_recipe(self):
+        recipe = extract_recipe(page_with_json_ld(JSON_LD_RECIPE))
+        self.assertEqual(recipe["title"], "Lemon Chicken & Rice")
+        self.assertEqual(recipe["description"], "A weeknight favourite.")
+        self.assertEqual(recipe["prep_time"], 15)
+        self.assertEqual(recipe["cook_time"], 60)
+        self.assertEqual(recipe["servings"], 4)
+        self.assertEqual(recipe["difficulty"], "medium")
+        self.assertEqual(
+            [i["name"] for i in recipe["ingredients"]],
+            ["chicken thighs", "long grain rice", "lemons", "salt"],
+        )
+        self.assertEqual(
+            recipe["steps"],
+            ["Brown the chicken.", "Add the rice.", "Simmer until tender."],
+        )
+
+    def test_json_ld_graph(self):
+        data = {
+            "@context": "https://schema.org",
+            "@graph": [
+                {"@type": "WebPage", "name": "Blog"},
+                dict(JSON_LD_RECIPE, **{"@type": ["Recipe", "NewsArticle"]}),
+            ],
+        }
+        self.assertEqual(
+            extract_recipe(page_with_json_ld(data))["title"], "Lemon Chicken & Rice"
+        )
+
+    def test_total_time_fills_cook_time(self):
+        data = dict(JSON_LD_RECIPE, totalTime="PT45M")
+        del data["cookTime"]
+        self.assertEqual(extract_recipe(page_with_json_ld(data))["cook_time"], 30)
+
+    def test_text_instructions_split_into_steps(self):
+        data = dict(JSON_LD_RECIPE, recipeInstructions="Mix.\nBake.\n\nServe.")
+        self.assertEqual(
+            extract_recipe(page_with_json_ld(data))["steps"],
+            ["Mix.", "Bake.", "Serve."],
+        )
+
+    def test_invalid_json_ld_is_skipped(self):
+        page = (
+            '<script type="application/ld+json">{not json</script>'
+            + page_with_json_ld(JSON_LD_RECIPE)
+        )
+        self.assertIsNotNone(extract_recipe(page))
+
+    def test_microdata_recipe(self):
+        page = """
+        <div itemscope itemtype="https://schema.org/Recipe">
+          <h1 itemprop="name">Pancakes</h1>
+          <meta itemprop="prepTime" content="PT5M">
+          <time itemprop="cookTime" datetime="PT10M">10 mins</time>
+          <span itemprop="recipeYield">Makes 8</span>
+          <div itemprop="author" itemscope itemtype="https://schema.org/Person">
+            <span itemprop="name">Sam</span>
+          </div>
+          <ul>
+            <li itemprop="recipeIngredient">1 cup milk</li>
+            <li itemprop="recipeIngredient">2 eggs</li>
+          </ul>
+          <ol itemprop="recipeInstructions">
+            <li>Whisk everything.</li>
+            <li>Fry in a hot pan.</li>
+          </ol>
+        </div>
+        """
+        recipe = extract_recipe(page)
+        self.assertEqual(recipe["title"], "Pancakes")
+        self.assertEqual(recipe["prep_time"], 5)
+        self.assertEqual(recipe["cook_time"], 10)
+        self.assertEqual(recipe["servings"], 8)
+        self.assertEqual(
+            [(i["name"], i["quantity"], i["unit"]) for i in recipe["ingredients"]],
+            [("milk", 1, "cup"), ("eggs", 2, "")],
+        )
+        self.assertEqual(recipe["steps"], ["Whisk everything.", "Fry in a hot pan."])
+
+    def test_page_without_markup(self):
+        self.assertIsNone(
+            extract_recipe("<html><body><p>Just a story.</p></body></html>")
+        )
+
+    def test_recipe_without_ingredients_or_steps(self):
+        data = {"@type": "Recipe", "name": "Mystery"}
+        self.assertIsNone(extract_recipe(page_with_json_ld(data)))
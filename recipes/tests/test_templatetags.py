@@ -142,15 +142,12 @@ class RecipeExtrasTemplateTagsTest(TestCase):
         self.assertEqual(get(test_dict, "complex"), {"nested": "nested_value"})
         self.assertEqual(get(test_dict, "list"), [1, 2, 3])
 
-    @patch("recipes.templatetags.recipe_extras.anthropic.Anthropic")
-    @patch(
-        "recipes.templatetags.recipe_extras.settings.ANTHROPIC_API_KEY", "test-api-key"
-    )
-    def test_ai_generate_surprise_recipe_success(self, mock_anthropic):
+    @patch("recipes.templatetags.recipe_extras.get_client")
+    def test_ai_generate_surprise_recipe_success(self, mock_get_client):
         """Test ai_generate_surprise_recipe function with successful API call"""
         # Mock Anthropic response
         mock_client = Mock()
-        mock_anthropic.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_text_block = Mock()
         mock_text_block.type = "text"
         mock_text_block.text = "Title: Surprise Recipe\nIngredients: Surprise ingredients\nSteps: Surprise steps"
@@ -165,8 +162,8 @@ class RecipeExtrasTemplateTagsTest(TestCase):
             "Title: Surprise Recipe\nIngredients: Surprise ingredients\nSteps: Surprise steps",
         )
 
-        # Verify Anthropic was called correctly
-        mock_anthropic.assert_called_once_with(api_key="test-api-key")
+        # Verify the shared client was used
+        mock_get_client.assert_called_once_with()
         mock_client.messages.create.assert_called_once()
 
         # Check the call arguments
@@ -174,15 +171,12 @@ class RecipeExtrasTemplateTagsTest(TestCase):
         self.assertEqual(call_args[1]["model"], "claude-haiku-4-5")
         self.assertEqual(len(call_args[1]["messages"]), 1)
 
-    @patch("recipes.templatetags.recipe_extras.anthropic.Anthropic")
-    @patch(
-        "recipes.templatetags.recipe_extras.settings.ANTHROPIC_API_KEY", "test-api-key"
-    )
-    def test_ai_generate_surprise_recipe_empty_content(self, mock_anthropic):
+    @patch("recipes.templatetags.recipe_extras.get_client")
+    def test_ai_generate_surprise_recipe_empty_content(self, mock_get_client):
         """Test ai_generate_surprise_recipe function with empty content"""
         # Mock Anthropic response with no text blocks
         mock_client = Mock()
-        mock_anthropic.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_response = Mock()
         mock_response.content = []
         mock_client.messages.create.return_value = mock_response
@@ -190,15 +184,12 @@ class RecipeExtrasTemplateTagsTest(TestCase):
         result = ai_generate_surprise_recipe()
         self.assertIsNone(result)
 
-    @patch("recipes.templatetags.recipe_extras.anthropic.Anthropic")
-    @patch(
-        "recipes.templatetags.recipe_extras.settings.ANTHROPIC_API_KEY", "test-api-key"
-    )
-    def test_ai_generate_surprise_recipe_whitespace_content(self, mock_anthropic):
+    @patch("recipes.templatetags.recipe_extras.get_client")
+    def test_ai_generate_surprise_recipe_whitespace_content(self, mock_get_client):
         """Test ai_generate_surprise_recipe function with whitespace-only content"""
         # Mock Anthropic response with whitespace content
         mock_client = Mock()
-        mock_anthropic.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_text_block = Mock()
         mock_text_block.type = "text"
         mock_text_block.text = "   \n\t   "
@@ -209,15 +200,12 @@ class RecipeExtrasTemplateTagsTest(TestCase):
         result = ai_generate_surprise_recipe()
         self.assertEqual(result, "")  # Should be stripped to empty string
 
-    @patch("recipes.templatetags.recipe_extras.anthropic.Anthropic")
-    @patch(
-        "recipes.templatetags.recipe_extras.settings.ANTHROPIC_API_KEY", "test-api-key"
-    )
-    def test_ai_generate_surprise_recipe_strips_whitespace(self, mock_anthropic):
+    @patch("recipes.templatetags.recipe_extras.get_client")
+    def test_ai_generate_surprise_recipe_strips_whitespace(self, mock_get_client):
         """Test ai_generate_surprise_recipe function strips leading/trailing whitespace"""
         # Mock Anthropic response with content that has whitespace
         mock_client = Mock()
-        mock_anthropic.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_text_block = Mock()
         mock_text_block.type = "text"
         mock_text_block.text = (
@@ -230,14 +218,11 @@ class RecipeExtrasTemplateTagsTest(TestCase):
         result = ai_generate_surprise_recipe()
         self.assertEqual(result, "Title: Clean Recipe\nIngredients: Clean ingredients")
 
-    @patch("recipes.templatetags.recipe_extras.anthropic.Anthropic")
-    @patch(
-        "recipes.templatetags.recipe_extras.settings.ANTHROPIC_API_KEY", "test-api-key"
-    )
-    def test_ai_generate_surprise_recipe_prompt_content(self, mock_anthropic):
+    @patch("recipes.templatetags.recipe_extras.get_client")
+    def test_ai_generate_surprise_recipe_prompt_content(self, mock_get_client):
         """Test that ai_generate_surprise_recipe sends correct prompt"""
         mock_client = Mock()
-        mock_anthropic.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_text_block = Mock()
         mock_text_block.type = "text"
         mock_text_block.text = "Mock content"
@@ -150,6 +150,19 @@ class RecipeSearchViewTest(TestCase):
         recipes = list(response.context["recipes"])
         self.assertEqual(recipes[0].title, "Thai Green Curry")
 
+    def test_search_query_defaults_to_relevance(self):
+        """A query without ?sort= should rank title matches first."""
+        Recipe.objects.create(
+            user=self.user,
+            title="Laksa",
+            ingredients_text="Curry paste\nNoodles",
+            steps="Simmer.",
+        )
+        response = self.client.get(reverse("recipe_search") + "?q=curry")
+        self.assertEqual(response.context["sort"], "relevance")
+        titles = [recipe.title for recipe in response.context["recipes"]]
+        self.assertEqual(titles, ["Thai Green Curry", "Laksa"])
+
     def test_search_requires_login(self):
         """Unauthenticated users should be redirected."""
         self.client.logout()
@@ -416,3 +416,102 @@ class ShopViewTest(TestCase):
         response = self.client.get(reverse("shop"))
         self.assertContains(response, "lamb")
         self.assertContains(response, "beef")
+
+
+class ShoppingListSyncTest(TestCase):
+    """Tests for the diff-based generated shopping list sync."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.household = Household.objects.create(name="Test")
+        HouseholdMembership.objects.create(user=self.user, household=self.household)
+        self.recipe = Recipe.objects.create(
+            user=self.user, title="Test Soup", steps="Make soup.", cook_time=30
+        )
+        carrots = Ingredient.objects.create(name="carrots", category="produce")
+        RecipeIngredient.objects.create(
+            recipe=self.recipe, ingredient=carrots, quantity=3, unit="piece", order=0
+        )
+        MealPlan.objects.create(
+            household=self.household,
+            added_by=self.user,
+            date=date.today(),
+            meal_type="dinner",
+            recipe=self.recipe,
+        )
+        self.client.login(username="testuser", password="testpass123")
+
+    def test_checked_state_survives_reload(self):
+        """Reloading the shop page should keep generated items and their checked state."""
+        self.client.get(reverse("shop"))
+        item = ShoppingListItem.objects.get(household=self.household, name="carrots")
+        item.checked = True
+        item.save()
+
+        self.client.get(reverse("shop"))
+        reloaded = ShoppingListItem.objects.get(
+            household=self.household, name="carrots"
+        )
+        self.assertEqual(reloaded.pk, item.pk)
+        self.assertTrue(reloaded.checked)
+
+    def test_unchanged_plan_skips_sync(self):
+        """A second sync with the same meals should be skipped via the fingerprint."""
+        from recipes.services import ShoppingListService
+
+        meal_ids = list(MealPlan.objects.values_list("pk", flat=True))
+        first = ShoppingListService.sync_generated_items(
+            self.household, self.user, meal_ids
+        )
+        self.assertEqual(first, {"created": 1, "updated": 0, "deleted": 0})
+        self.household.refresh_from_db()
+        self.assertIsNone(
+            ShoppingListService.sync_generated_items(
+                self.household, self.user, meal_ids
+            )
+        )
+
+    def test_added_meal_updates_existing_row_in_place(self):
+        """Planning the same recipe again should update the quantity, not recreate the row."""
+        self.client.get(reverse("shop"))
+        item = ShoppingListItem.objects.get(household=self.household, name="carrots")
+        item.checked = True
+        item.save()
+
+        MealPlan.objects.create(
+            household=self.household,
+            added_by=self.user,
+            date=date.today() + timedelta(days=1),
+            meal_type="dinner",
+            recipe=self.recipe,
+        )
+        self.client.get(reverse("shop"))
+        reloaded = ShoppingListItem.objects.get(
+            household=self.household, name="carrots"
+        )
+        self.assertEqual(reloaded.pk, item.pk)
+        self.assertEqual(reloaded.quantity, "6 piece")
+        # Quantity changed, so the item needs buying again
+        self.assertFalse(reloaded.checked)
+
+    def test_removed_meal_deletes_stale_rows(self):
+        """Removing the only meal should delete its generated items but keep manual ones."""
+        self.client.get(reverse("shop"))
+        ShoppingListItem.objects.create(
+            household=self.household, added_by=self.user, name="Milk"
+        )
+        MealPlan.objects.all().delete()
+        self.client.get(reverse("shop"))
+        self.assertFalse(
+            ShoppingListItem.objects.filter(
+                household=self.household, is_generated=True
+            ).exists()
+        )
+        self.assertTrue(
+            ShoppingListItem.objects.filter(
+                household=self.household, name="Milk"
+            ).exists()
+        )
@@ -10,15 +10,17 @@ from .views import (
     cook_view,
     day_comment,
     delete_template,
-    generate_next,
     generate_preferences,
     generate_progress,
+    generate_status,
     image_search,
     image_select,
     import_recipe_url,
+    job_status,
     list_templates,
     meal_plan_create,
     meal_plan_list,
+    metrics_view,
     offline_view,
     push_subscribe,
     push_unsubscribe,
@@ -95,7 +97,11 @@ urlpatterns = [
     path(
         "recipes/generate-batch/progress/", generate_progress, name="generate_progress"
     ),
-    path("recipes/generate-batch/next/", generate_next, name="generate_next"),
+    path(
+        "recipes/generate-batch/<int:pk>/status/",
+        generate_status,
+        name="generate_status",
+    ),
     # --- Redesign: Recipe views ---
     path("recipes/", recipe_list_view, name="recipe_list"),
     path("recipes/search/", recipe_search, name="recipe_search"),
@@ -108,6 +114,7 @@ urlpatterns = [
     path("recipes/<int:pk>/image-select/", image_select, name="image_select"),
     path("recipes/ai-generate/", ai_generate_recipe_api, name="ai_generate_recipe_api"),
     path("recipes/import-url/", import_recipe_url, name="import_recipe_url"),
+    path("jobs/<int:pk>/", job_status, name="job_status"),
     # --- Legacy recipe views (AI-related, still in use) ---
     path("recipes/ai/generate/", ai_generate_recipe, name="ai_generate_recipe"),
     path("recipes/ai-create/", recipe_create_from_ai, name="recipe_create_from_ai"),
@@ -122,6 +129,8 @@ urlpatterns = [
     path("disclaimer/", views.disclaimer, name="disclaimer"),
     path("getting-started/", views.getting_started, name="getting_started"),
     path("ai-surprise-me/", views.ai_surprise_me, name="ai_surprise_me"),
+    # --- Monitoring ---
+    path("metrics", metrics_view, name="metrics"),
     # --- Push Notifications ---
     path("api/push/vapid-key/", vapid_public_key, name="vapid_public_key"),
     path("api/push/subscribe/", push_subscribe, name="push_subscribe"),
@@ -0,0 +1,220 @@
+"""Request benchmarks for the main pages and HTMX endpoints.
+
+Each scenario builds one request against a seeded household; run_scenario
+times it with perf_counter, counts its database queries and measures the
+memory it allocates. Results are plain dicts that serialize to JSON, so a
+run saved on one commit can be compared against a run on another.
+"""
+
+import gc
+import math
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..models import MealPlanTemplate
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of values, interpolating between ranks."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Return min/mean/p50/p95/p99/max for a list of samples."""
+    return {
+        "min": min(values),
+        "mean": statistics.mean(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+class BenchmarkContext:
+    """The seeded user and objects scenarios build their requests from."""
+
+    def __init__(self, user, household):
+        self.user = user
+        self.household = household
+        self.recipe = user.recipes.order_by("pk").first()
+        self.template = MealPlanTemplate.objects.filter(household=household).first()
+        self.today = timezone.localdate()
+
+
+def _week_picker(ctx, i):
+    day = ctx.today + timedelta(days=i % 7)
+    return "get", f"/week/assign/{day:%Y-%m-%d}/dinner/", {}
+
+
+def _cook_step(ctx, i):
+    return "get", f"/cook/{ctx.recipe.pk}/step/{1 + i % 3}/", {}
+
+
+def _apply_template(ctx, i):
+    # A week nobody has planned yet, so every run fills seven empty slots
+    return "post", f"/week/apply-template/{ctx.template.pk}/", {"offset": 8 + i}
+
+
+# name -> (description, request builder(ctx, iteration) -> (method, path, data))
+SCENARIOS: Dict[str, tuple] = {
+    "week": ("This Week page", lambda ctx, i: ("get", "/week/", {})),
+    "shop": ("Shopping list page", lambda ctx, i: ("get", "/shop/", {})),
+    "recipe_search": (
+        "Recipe search results",
+        lambda ctx, i: ("get", "/recipes/search/", {"q": "chicken"}),
+    ),
+    "week_picker": ("Recipe picker for a meal slot", _week_picker),
+    "week_suggest": (
+        "Dinner suggestions for a later week",
+        lambda ctx, i: ("get", "/week/suggest/", {"offset": 4}),
+    ),
+    "cook_step": ("Cooking mode step partial", _cook_step),
+    "template_apply": ("Apply a meal plan template", _apply_template),
+}
+
+
+def run_scenario(
+    client: Client,
+    build: Callable,
+    ctx: BenchmarkContext,
+    iterations: int = 50,
+    warmup: int = 5,
+) -> Dict:
+    """
+    Time one scenario and collect its query counts and memory use.
+
+    Warmup requests run first and are not recorded. Timings are taken
+    without tracing; memory is measured in one extra traced request, since
+    tracemalloc slows everything it watches.
+
+    Args:
+        client: A logged-in test client
+        build: The scenario's request builder
+        ctx: Objects the request is built from
+        iterations: Timed requests
+        warmup: Untimed requests sent first
+
+    Returns:
+        Dict with timing percentiles (ms), query counts, memory (KiB) and
+        the status codes seen
+    """
+
+    def send(i):
+        method, path, data = build(ctx, i)
+        return getattr(client, method)(path, data)
+
+    for i in range(warmup):
+        send(i)
+
+    timings, queries, statuses = [], [], set()
+    gc.collect()
+    for i in range(warmup, warmup + iterations):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = send(i)
+            elapsed = time.perf_counter() - start
+        timings.append(elapsed * 1000)
+        queries.append(len(captured))
+        statuses.add(response.status_code)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        send(warmup + iterations)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "time_ms": summarize(timings),
+        "queries": {"min": min(queries), "max": max(queries)},
+        "memory_kib": {
+            "peak": round((peak - before) / 1024, 1),
+            "retained": round((after - before) / 1024, 1),
+        },
+        "status_codes": sorted(statuses),
+    }
+
+
+# (section, key) pairs compared between runs, lower is better for all
+COMPARED_METRICS = [
+    ("time_ms", "p50"),
+    ("time_ms", "p95"),
+    ("time_ms", "p99"),
+    ("queries", "max"),
+    ("memory_kib", "peak"),
+]
+
+
+def compare(
+    results: Dict, baseline: Dict, threshold: float = 10.0
+) -> List[Dict[str, object]]:
+    """
+    Compare two runs' scenario results metric by metric.
+
+    Query counts regress on any increase; time and memory only when they
+    grow by more than threshold percent, to allow for run-to-run noise.
+
+    Args:
+        results: The "scenarios" dict of the current run
+        baseline: The "scenarios" dict of the run to compare against
+        threshold: Percent growth in time or memory counted as a regression
+
+    Returns:
+        One row per scenario and metric present in both runs
+    """
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for section, key in COMPARED_METRICS:
+            before = previous.get(section, {}).get(key)
+            after = current.get(section, {}).get(key)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else 0.0
+            if section == "queries":
+                regressed = after > before
+            else:
+                regressed = change > threshold
+            rows.append(
+                {
+                    "scenario": name,
+                    "metric": f"{section}.{key}",
+                    "before": before,
+                    "after": after,
+                    "change_pct": round(change, 1),
+                    "regressed": regressed,
+                }
+            )
+    return rows
+
+
+def dataset_user(prefix: str) -> Optional[tuple]:
+    """Return (user, household) for the first member of a seeded dataset."""
+    user = (
+        User.objects.filter(username__startswith=f"{prefix}_")
+        .select_related("household_membership__household")
+        .order_by("username")
+        .first()
+    )
+    if user is None:
+        return None
+    return user, user.household_membership.household
@@ -0,0 +1,33 @@
+"""Cache backends for the shared CACHE_BACKEND (see config/settings.py).
+
+Django's FileBasedCache lists its whole folder before every set to decide
+whether to cull, which puts a directory scan behind each fragment the
+cache stores. The one here checks at most once every CULL_INTERVAL
+seconds, so MAX_ENTRIES is a soft limit: the folder can pass it by the
+entries set in between.
+
+Culling deletes random entries, version tokens from recipes.utils.fragments
+included. A household whose token goes just gets a new one, and its
+fragments are rendered again.
+"""
+
+import time
+
+from django.core.cache.backends import filebased
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """FileBasedCache that counts its files at most once every CULL_INTERVAL."""
+
+    CULL_INTERVAL = 60  # seconds
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._next_cull = 0.0
+
+    def _cull(self):
+        now = time.monotonic()
+        if now < self._next_cull:
+            return
+        self._next_cull = now + self.CULL_INTERVAL
+        super()._cull()
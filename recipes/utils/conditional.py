@@ -0,0 +1,105 @@
+"""Conditional GET for full pages.
+
+A page's ETag hashes everything its HTML depends on that can change
+without the URL changing: the household's fragment version (see
+recipes.utils.fragments), today's date, the user and the CSRF cookie whose
+token the page's forms carry, and the deployed code. Working it out costs
+a cache read or two, so a request that still matches is answered with 304
+before the view builds any context.
+"""
+
+import functools
+import hashlib
+import os
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .fragments import fragment_version
+
+
+@functools.lru_cache(maxsize=None)
+def release() -> str:
+    """Identify the deployed templates, code and static files.
+
+    Deploys rewrite these files, so their newest modification time changes
+    and pages rendered by the previous release stop matching.
+    """
+    newest = 0.0
+    roots = [settings.BASE_DIR / "recipes", settings.BASE_DIR / "config"]
+    manifest = settings.STATIC_ROOT / "staticfiles.json"
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+            for name in filenames:
+                newest = max(newest, os.path.getmtime(os.path.join(dirpath, name)))
+    if manifest.exists():
+        newest = max(newest, manifest.stat().st_mtime)
+    return str(newest)
+
+
+def page_etag(request, *args, **kwargs) -> Optional[str]:
+    """ETag for a page that shows the household's plan and recipes.
+
+    None (no conditional GET) without a household, or while flash messages
+    are waiting to be shown, since a 304 would hide them.
+
+    Args:
+        request: The request for the page
+        **kwargs: The view's URL kwargs, plus anything else the page
+            depends on, e.g. a shopping list version
+    """
+    household = getattr(request, "household", None)
+    if not settings.CONDITIONAL_GET or household is None:
+        return None
+    if len(get_messages(request)):
+        return None
+    parts = [
+        release(),
+        request.user.pk,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        request.get_full_path(),
+        timezone.localdate().isoformat(),
+        fragment_version(household.pk),
+        *sorted(kwargs.items()),
+    ]
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def conditional_page(etag_func):
+    """Answer GET requests whose ETag still matches with 304 Not Modified.
+
+    Like Django's condition(), except the ETag only goes on 200 responses,
+    which are marked private and no-cache so browsers revalidate every time
+    instead of reusing a stale page.
+
+    Args:
+        etag_func: Called like the view; returns the ETag, or None to skip
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            etag = None
+            if request.method in ("GET", "HEAD"):
+                etag = etag_func(request, *args, **kwargs)
+            if etag is None:
+                return view(request, *args, **kwargs)
+
+            etag = quote_etag(etag)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response.headers.setdefault("ETag", etag)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,105 @@
+"""Unit conversion utilities for aggregating ingredient quantities.
+
+Every UNIT_CHOICES value maps to a dimension and a factor into that
+dimension's base unit (grams for mass, millilitres for volume). Count-style
+units (piece, clove, can, ...) can't be converted into each other, so each
+one only ever combines with itself.
+"""
+
+from decimal import Decimal
+
+MASS = "mass"
+VOLUME = "volume"
+COUNT = "count"
+
+# unit -> (dimension, factor to base unit). Spoon and cup measures use
+# Australian metric sizes (tsp 5 ml, tbsp 20 ml, cup 250 ml).
+UNIT_DIMENSIONS = {
+    "": (COUNT, Decimal("1")),
+    "g": (MASS, Decimal("1")),
+    "kg": (MASS, Decimal("1000")),
+    "oz": (MASS, Decimal("28.3495")),
+    "lb": (MASS, Decimal("453.592")),
+    "ml": (VOLUME, Decimal("1")),
+    "l": (VOLUME, Decimal("1000")),
+    "tsp": (VOLUME, Decimal("5")),
+    "tbsp": (VOLUME, Decimal("20")),
+    "cup": (VOLUME, Decimal("250")),
+    "piece": (COUNT, Decimal("1")),
+    "slice": (COUNT, Decimal("1")),
+    "pinch": (COUNT, Decimal("1")),
+    "handful": (COUNT, Decimal("1")),
+    "bunch": (COUNT, Decimal("1")),
+    "can": (COUNT, Decimal("1")),
+    "clove": (COUNT, Decimal("1")),
+}
+
+# Display ladders, largest unit first. The first ladder whose units cover
+# every unit being combined is used; metric is the fallback for mixed input.
+DISPLAY_LADDERS = {
+    MASS: [
+        ["lb", "oz"],
+        ["kg", "g"],
+    ],
+    VOLUME: [
+        ["cup", "tbsp", "tsp"],
+        ["l", "ml"],
+    ],
+}
+
+QUANTITY_PRECISION = Decimal("0.01")
+
+
+def unit_group(unit):
+    """Return the key under which quantities in this unit can be combined.
+
+    Mass and volume units group by dimension; count units (and unknown
+    units) only group with themselves.
+    """
+    dimension, _ = UNIT_DIMENSIONS.get(unit, (COUNT, Decimal("1")))
+    if dimension == COUNT:
+        return unit
+    return dimension
+
+
+def to_base(quantity, unit):
+    """Convert a quantity in ``unit`` to its dimension's base unit."""
+    _, factor = UNIT_DIMENSIONS.get(unit, (COUNT, Decimal("1")))
+    return quantity * factor
+
+
+def choose_display_unit(base_quantity, units):
+    """Pick a readable unit for a base quantity combined from ``units``.
+
+    Uses the largest unit on the matching ladder that keeps the quantity at
+    or above 1, e.g. 1500 g -> kg, 25 ml from tsp/tbsp -> tbsp.
+    """
+    dimension = UNIT_DIMENSIONS[next(iter(units))][0]
+    ladders = DISPLAY_LADDERS[dimension]
+    ladder = next((lad for lad in ladders if set(units) <= set(lad)), ladders[-1])
+    for unit in ladder:
+        if base_quantity >= UNIT_DIMENSIONS[unit][1]:
+            return unit
+    return ladder[-1]
+
+
+def combine_quantities(parts):
+    """Combine (quantity, unit) pairs that share a unit_group into one total.
+
+    Quantities of None are ignored. A single unit is kept as-is; mixed
+    units are converted through the base unit and shown in the unit chosen
+    by choose_display_unit.
+
+    Returns:
+        Tuple of (total Decimal, unit)
+    """
+    units = {unit for _, unit in parts}
+    if len(units) == 1:
+        unit = next(iter(units))
+        total = sum((q for q, _ in parts if q), Decimal("0"))
+        return total, unit
+
+    base_total = sum((to_base(q, u) for q, u in parts if q), Decimal("0"))
+    unit = choose_display_unit(base_total, units)
+    total = (base_total / UNIT_DIMENSIONS[unit][1]).quantize(QUANTITY_PRECISION)
+    return total, unit
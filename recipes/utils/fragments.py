@@ -0,0 +1,87 @@
+"""Per-household versions for the template fragment caches and page ETags.
+
+Day cards, recipe cards and the template picker are cached with
+{% cache %} blocks that vary on fragment_version (see
+recipes.context_processors.fragment_cache). A household's version is a
+random token kept in the cache. Saving anything those fragments show
+replaces the token (see signals.py), which orphans every fragment the
+household had cached at once; the orphans age out with their timeout.
+
+The shopping list has a version of its own, so ticking items off doesn't
+throw away the household's fragments. Page ETags combine both (see
+recipes.utils.conditional).
+"""
+
+import uuid
+from typing import Iterable
+
+from django.core.cache import cache
+
+from ..models import HouseholdMembership, HouseholdRecipe
+
+
+def fragment_version_key(household_id) -> str:
+    return f"fragment-version:{household_id}"
+
+
+def shopping_version_key(household_id) -> str:
+    return f"shopping-version:{household_id}"
+
+
+def _version(key) -> str:
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        # Another process may have created it first; theirs wins
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def _replace_versions(make_key, household_ids) -> None:
+    cache.set_many(
+        {
+            make_key(household_id): uuid.uuid4().hex
+            for household_id in set(household_ids)
+            if household_id is not None
+        },
+        None,
+    )
+
+
+def fragment_version(household_id) -> str:
+    """Return the household's current fragment version, creating one if needed."""
+    return _version(fragment_version_key(household_id))
+
+
+def invalidate_fragments(household_ids: Iterable) -> None:
+    """Give these households new fragment versions, dropping their cached fragments."""
+    _replace_versions(fragment_version_key, household_ids)
+
+
+def shopping_version(household_id) -> str:
+    """Return the version of the household's shopping list, creating one if needed."""
+    return _version(shopping_version_key(household_id))
+
+
+def invalidate_shopping(household_ids: Iterable) -> None:
+    """Give these households' shopping lists new versions."""
+    _replace_versions(shopping_version_key, household_ids)
+
+
+def recipe_households(recipe_ids: Iterable) -> Iterable:
+    """Ids of the households that can see any of these recipes.
+
+    That is the owner's household plus every household the recipe is
+    shared or planned into. One query.
+    """
+    recipe_ids = list(recipe_ids)
+    return (
+        HouseholdRecipe.objects.filter(recipe_id__in=recipe_ids)
+        .values_list("household_id", flat=True)
+        .union(
+            HouseholdMembership.objects.filter(
+                user__recipes__in=recipe_ids
+            ).values_list("household_id", flat=True)
+        )
+    )
@@ -0,0 +1,277 @@
+"""Prometheus-style metrics shared by every process on the host.
+
+Gunicorn workers, run_workers and reminder_scheduler are separate
+processes, so each one adds up its counter and histogram increments in
+memory. A background thread flushes them to the SQLite file named by
+METRICS_DB every METRICS_FLUSH_INTERVAL seconds, and again at exit. The
+/metrics view flushes its own process first, then renders the totals of
+all of them in the Prometheus text format.
+
+Collection is off, and everything here a no-op, while METRICS_DB is empty.
+Every metric is declared at the bottom of this module.
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# (sample name, rendered labels) -> value
+Key = Tuple[str, str]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, object]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+class MetricsStore:
+    """This process's unflushed increments, and the shared SQLite file."""
+
+    def __init__(self):
+        self._pending: Dict[Key, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._pid = None
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(settings.METRICS_DB)
+
+    def add(self, key: Key, amount: float) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._start()
+            self._pending[key] += amount
+
+    def _start(self):
+        # First increment in this process (or a child forked after one):
+        # drop the parent's pending values and start flushing on our own
+        self._pending.clear()
+        self._pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name="metrics", daemon=True).start()
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(settings.METRICS_FLUSH_INTERVAL)
+            # Nothing restarts this thread, so it must outlive any error
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing metrics failed")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(settings.METRICS_DB, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS samples ("
+            "name TEXT NOT NULL, labels TEXT NOT NULL, value REAL NOT NULL, "
+            "PRIMARY KEY (name, labels))"
+        )
+        return conn
+
+    def flush(self) -> None:
+        """Add this process's pending increments to the shared totals."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(float)
+        if not pending or not self.enabled():
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO samples (name, labels, value) VALUES (?, ?, ?) "
+                        "ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value",
+                        [
+                            (name, labels, value)
+                            for (name, labels), value in pending.items()
+                        ],
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # The transaction rolled back; keep the increments for next time
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending[key] += value
+            logger.warning(f"Couldn't flush metrics to {settings.METRICS_DB}: {e}")
+
+    def totals(self) -> Dict[Key, float]:
+        """Return every process's flushed totals, after flushing this one's."""
+        self.flush()
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT name, labels, value FROM samples").fetchall()
+        finally:
+            conn.close()
+        return {(name, labels): value for name, labels, value in rows}
+
+    def clear(self) -> None:
+        """Forget pending increments and delete the shared totals."""
+        with self._lock:
+            self._pending.clear()
+        if self.enabled():
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM samples")
+            finally:
+                conn.close()
+
+
+store = MetricsStore()
+atexit.register(store.flush)
+REGISTRY: List["Metric"] = []
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+    def _label_values(self, labels) -> Dict[str, object]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}")
+        return {name: labels[name] for name in self.labelnames}
+
+    def sample_names(self) -> List[str]:
+        return [self.name]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if store.enabled():
+            store.add((self.name, _labels(self._label_values(labels))), amount)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        if not store.enabled():
+            return
+        labels = self._label_values(labels)
+        rendered = _labels(labels)
+        for bound in self.buckets:
+            if value <= bound:
+                le = _labels({**labels, "le": bound})
+                store.add((f"{self.name}_bucket", le), 1)
+        store.add((f"{self.name}_bucket", _labels({**labels, "le": "+Inf"})), 1)
+        store.add((f"{self.name}_sum", rendered), value)
+        store.add((f"{self.name}_count", rendered), 1)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the seconds the block takes, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def sample_names(self) -> List[str]:
+        return [f"{self.name}_{suffix}" for suffix in ("bucket", "sum", "count")]
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render(totals: Optional[Dict[Key, float]] = None) -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    if totals is None:
+        totals = store.totals()
+    by_name = defaultdict(list)
+    for (name, labels), value in totals.items():
+        by_name[name].append((labels, value))
+
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for sample in metric.sample_names():
+            order = _bucket_order if sample.endswith("_bucket") else None
+            for labels, value in sorted(by_name.get(sample, []), key=order):
+                series = f"{sample}{{{labels}}}" if labels else sample
+                lines.append(f"{series} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _bucket_order(row):
+    # Each series' buckets in ascending le order, +Inf last; le is always
+    # the last label
+    head, _, le = row[0].rpartition('le="')
+    le = le.rstrip('"')
+    return (head, float("inf") if le == "+Inf" else float(le))
+
+
+# --- Metrics ---
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, by URL name.",
+    ["view", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run while handling a request, by URL name.",
+    ["view"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+AI_REQUEST_DURATION = Histogram(
+    "ai_request_duration_seconds",
+    "Time spent on each Anthropic API call.",
+    ["operation"],
+    buckets=(0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+AI_ERRORS = Counter(
+    "ai_errors_total",
+    "AI operations that failed, by AIServiceException subclass.",
+    ["operation", "error"],
+)
+PUSH_SENDS = Counter(
+    "push_sends_total",
+    "Web Push reminders by outcome (sent, expired or failed).",
+    ["outcome"],
+)
+SHOPPING_SYNCS = Counter(
+    "shopping_list_syncs_total",
+    "Generated shopping list syncs, by result (synced or skipped as unchanged).",
+    ["result"],
+)
+SHOPPING_SYNC_DURATION = Histogram(
+    "shopping_list_sync_duration_seconds",
+    "Time to regenerate a household's shopping list.",
+)
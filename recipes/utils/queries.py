@@ -0,0 +1,126 @@
+"""Database query recording and the per-view query budgets.
+
+QueryRecorder wraps the database connections with an execute wrapper, so it
+sees every query a block of code runs (with or without DEBUG) along with its
+duration. Queries are grouped by SQL template - the statement with literals
+and IN lists collapsed - which makes an N+1 loop show up as one template
+repeated many times.
+
+QUERY_BUDGETS is the single list of how many queries each view may issue.
+The test suite holds every listed view to its budget, and
+QueryBudgetMiddleware can log live requests that go over.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections
+
+# URL name -> most queries one GET may run, counting the session, user and
+# household lookups every signed-in request makes (and, for shop and
+# week_suggest, the writes of a first visit), with nothing in the cache.
+# Raise a budget only in the change that needs the extra query.
+QUERY_BUDGETS: Dict[str, int] = {
+    "home": 6,
+    "week": 6,
+    "week_slot": 6,
+    "week_assign": 4,
+    "week_suggest": 13,
+    "list_templates": 6,
+    "shop": 16,
+    "recipe_list": 10,
+    "recipe_search": 9,
+    "recipe_detail": 9,
+    "cook": 9,
+    "cook_step": 9,
+    "settings": 8,
+}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(
+    r"\bIN\s*\((?:\s*(?:%s|\?|NULL)\s*,)*\s*(?:%s|\?|NULL)\s*\)", re.I
+)
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Return the template of a SQL statement, for grouping repeated queries.
+
+    String and number literals become ?, and IN lists of any length become
+    IN (...), so the same query run for different rows has one template.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    duration_ms: float
+    alias: str
+
+    @property
+    def template(self) -> str:
+        return normalize_sql(self.sql)
+
+
+class QueryRecorder:
+    """Context manager that records every query run while it is active.
+
+    Works whether or not DEBUG is on, and only on the current thread's
+    connections.
+    """
+
+    def __init__(self, using: Optional[List[str]] = None):
+        self.aliases = using or list(connections)
+        self.queries: List[RecordedQuery] = []
+        self._stack = None
+
+    def __enter__(self) -> "QueryRecorder":
+        self._stack = ExitStack()
+        for alias in self.aliases:
+            self._stack.enter_context(connections[alias].execute_wrapper(self._record))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def _record(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                RecordedQuery(
+                    sql=sql,
+                    duration_ms=(time.perf_counter() - start) * 1000,
+                    alias=context["connection"].alias,
+                )
+            )
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration_ms(self) -> float:
+        return sum(query.duration_ms for query in self.queries)
+
+    def duplicates(self, min_count: int = 2) -> List[Tuple[str, int]]:
+        """Return (template, count) for templates run at least min_count times."""
+        counts = Counter(query.template for query in self.queries)
+        return [(sql, n) for sql, n in counts.most_common() if n >= min_count]
+
+    def report(self, min_count: int = 2) -> str:
+        """Describe the recorded queries and any repeated templates."""
+        lines = [f"{self.count} queries in {self.duration_ms:.1f}ms"]
+        for sql, n in self.duplicates(min_count):
+            lines.append(f"  {n}x {sql}")
+        return "\n".join(lines)
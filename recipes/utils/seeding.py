@@ -0,0 +1,382 @@
+"""Deterministic synthetic datasets for benchmarks and scale testing.
+
+DatasetSeeder builds households with members, recipes (structured
+ingredients, tags, cooking history), meal plan calendars, templates and
+shopping lists. The same seed and sizes always produce the same rows, so
+benchmark results stay comparable between runs. Everything is written with
+bulk_create, and the denormalized tables the model signals normally keep
+current (search documents, household visibility, cooking stats) are
+rebuilt at the end.
+"""
+
+import random
+import string
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import (
+    CookingNote,
+    Household,
+    HouseholdMembership,
+    Ingredient,
+    MealPlan,
+    MealPlanTemplate,
+    MealPlanTemplateEntry,
+    Recipe,
+    RecipeIngredient,
+    ShoppingListItem,
+    Tag,
+    refresh_household_recipes,
+    refresh_search_documents,
+)
+from .fragments import invalidate_fragments, invalidate_shopping
+
+ADJECTIVES = """
+Smoky Crispy Herby Spicy Creamy Zesty Golden Rustic Sticky Charred Garlicky Lemony Slow-Cooked One-Pan Easy Roasted
+""".split()
+MAINS = """
+Chicken Beef Pork Lamb Salmon Prawn Tofu Chickpea Lentil Mushroom Halloumi Sausage Cod Aubergine Bean Turkey
+""".split()
+DISHES = """
+Curry Stew Tacos Salad Pasta Risotto Stir-Fry Soup Traybake Pie Burgers Noodles Bowl Skewers Chilli Bake
+""".split()
+INGREDIENTS = [
+    ("onion", "produce"), ("garlic", "produce"), ("carrot", "produce"),
+    ("tomato", "produce"), ("potato", "produce"), ("spinach", "produce"),
+    ("red pepper", "produce"), ("courgette", "produce"), ("lemon", "produce"),
+    ("ginger", "produce"), ("coriander", "produce"), ("broccoli", "produce"),
+    ("mushrooms", "produce"), ("spring onion", "produce"), ("chilli", "produce"),
+    ("milk", "dairy"), ("butter", "dairy"), ("cheddar", "dairy"),
+    ("parmesan", "dairy"), ("yoghurt", "dairy"), ("double cream", "dairy"),
+    ("eggs", "dairy"), ("feta", "dairy"),
+    ("chicken thighs", "meat"), ("beef mince", "meat"), ("pork loin", "meat"),
+    ("bacon", "meat"), ("lamb shoulder", "meat"), ("salmon fillet", "meat"),
+    ("prawns", "meat"), ("sausages", "meat"),
+    ("rice", "pantry"), ("pasta", "pantry"), ("plain flour", "pantry"),
+    ("olive oil", "pantry"), ("soy sauce", "pantry"), ("chickpeas", "pantry"),
+    ("chopped tomatoes", "pantry"), ("coconut milk", "pantry"),
+    ("stock cube", "pantry"), ("honey", "pantry"), ("lentils", "pantry"),
+    ("noodles", "pantry"), ("tortillas", "pantry"), ("breadcrumbs", "pantry"),
+    ("cumin", "spice"), ("paprika", "spice"), ("turmeric", "spice"),
+    ("chilli flakes", "spice"), ("oregano", "spice"), ("cinnamon", "spice"),
+    ("garam masala", "spice"), ("black pepper", "spice"), ("salt", "spice"),
+    ("frozen peas", "frozen"), ("frozen sweetcorn", "frozen"),
+    ("bread", "bakery"), ("naan", "bakery"), ("burger buns", "bakery"),
+]  # fmt: skip
+TAGS = [
+    ("Italian", "cuisine"), ("Indian", "cuisine"), ("Mexican", "cuisine"),
+    ("Thai", "cuisine"), ("Chinese", "cuisine"), ("British", "cuisine"),
+    ("Greek", "cuisine"), ("Japanese", "cuisine"),
+    ("Vegetarian", "dietary"), ("Vegan", "dietary"), ("Gluten-Free", "dietary"),
+    ("Quick", "other"), ("Batch Cook", "other"), ("Family Favourite", "other"),
+]  # fmt: skip
+UNITS = ["g", "kg", "ml", "tsp", "tbsp", "cup", "piece", "clove", "can", "pinch"]
+STEP_VERBS = ["Chop", "Fry", "Simmer", "Season", "Stir in", "Roast", "Whisk", "Toss"]
+CODE_CHARS = [c for c in string.ascii_uppercase + string.digits if c not in "0O1IL"]
+
+
+class DatasetSeeder:
+    """Generates a reproducible dataset of households and their recipes.
+
+    Usernames start with prefix, so a dataset can be found later and removed
+    with clear(); seeding the same prefix twice fails on the unique usernames.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        prefix: str = "seed",
+        batch_size: int = 1000,
+        today: Optional[date] = None,
+        password: Optional[str] = None,
+    ):
+        self.rng = random.Random(seed)
+        # Invite codes are unique, so two datasets with one seed need different ones
+        self.code_rng = random.Random(f"{prefix}:{seed}")
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.today = today or timezone.localdate()
+        self.raw_password = password
+        self.counts: Dict[str, int] = {}
+
+    def _bulk_create(self, model, objs) -> list:
+        created = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        key = model._meta.verbose_name_plural
+        self.counts[key] = self.counts.get(key, 0) + len(created)
+        return created
+
+    def seed(
+        self,
+        households: int = 1,
+        members: int = 2,
+        recipes: int = 100,
+        ingredients_per_recipe: int = 8,
+        notes_per_recipe: int = 2,
+        plan_days: int = 28,
+        shopping_items: int = 20,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Household]:
+        """
+        Create households full of recipes, history and plans.
+
+        Args:
+            households: Households to create
+            members: Users per household (the first one created it)
+            recipes: Recipes per household, spread across its members
+            ingredients_per_recipe: Structured ingredient lines per recipe
+            notes_per_recipe: Average CookingNotes per recipe
+            plan_days: Days of dinner plans, half before today, half after
+            shopping_items: Shopping list items per household
+            progress: Called with (households done, total) after each batch
+
+        Returns:
+            The created households
+        """
+        self.members = max(1, members)
+        self.recipes = recipes
+        self.ingredients_per_recipe = ingredients_per_recipe
+        self.notes_per_recipe = notes_per_recipe
+        self.plan_days = plan_days
+        self.shopping_items = shopping_items
+        # Seed enough households at a time to fill about one batch of recipes
+        chunk = max(1, self.batch_size // max(1, recipes))
+
+        self.tags = self._lookup_rows(Tag, TAGS, "tag_type")
+        self.ingredients = self._lookup_rows(Ingredient, INGREDIENTS, "category")
+        self.password = make_password(self.raw_password)
+
+        created = []
+        # One transaction per chunk, so a huge run commits as it goes
+        for start in range(0, households, chunk):
+            with transaction.atomic():
+                created.extend(
+                    self._seed_households(start, min(chunk, households - start))
+                )
+            if progress:
+                progress(len(created), households)
+        call_command(
+            "backfill_recipe_stats", batch_size=self.batch_size, stdout=StringIO()
+        )
+        return created
+
+    @staticmethod
+    def clear(prefix: str) -> int:
+        """
+        Delete a seeded dataset: its users, their households and everything in them.
+
+        Cooking notes, ingredient lines and meal plans are deleted directly
+        first; their delete signals would otherwise refresh stats or
+        visibility row by row for data that is going away anyway.
+
+        Args:
+            prefix: The prefix the dataset was seeded with
+
+        Returns:
+            Number of users deleted
+        """
+        users = User.objects.filter(username__startswith=f"{prefix}_")
+        households = Household.objects.filter(members__user__in=users)
+        with transaction.atomic():
+            for qs in [
+                CookingNote.objects.filter(user__in=users),
+                RecipeIngredient.objects.filter(recipe__user__in=users),
+                MealPlan.objects.filter(household__in=households),
+            ]:
+                qs._raw_delete(qs.db)
+            households.delete()
+            deleted, by_model = users.delete()
+        return by_model.get(User._meta.label, 0)
+
+    @staticmethod
+    def _lookup_rows(model, rows, field) -> list:
+        model.objects.bulk_create(
+            [model(name=name, **{field: value}) for name, value in rows],
+            ignore_conflicts=True,
+        )
+        return list(
+            model.objects.filter(name__in=[name for name, _ in rows]).order_by("name")
+        )
+
+    def _code(self) -> str:
+        return "".join(self.code_rng.choices(CODE_CHARS, k=8))
+
+    def _seed_households(self, start: int, count: int) -> List[Household]:
+        rng = self.rng
+        members, recipes = self.members, self.recipes
+        users = self._bulk_create(
+            User,
+            [
+                User(
+                    username=f"{self.prefix}_{h:06d}_{m}",
+                    email=f"{self.prefix}_{h:06d}_{m}@example.com",
+                    password=self.password,
+                )
+                for h in range(start, start + count)
+                for m in range(members)
+            ],
+        )
+        users_by_household = [
+            users[i * members : (i + 1) * members] for i in range(count)
+        ]
+        households = self._bulk_create(
+            Household,
+            [
+                Household(
+                    name=f"{self.prefix.title()} Household {start + i}",
+                    code=self._code(),
+                    created_by=group[0],
+                )
+                for i, group in enumerate(users_by_household)
+            ],
+        )
+        self._bulk_create(
+            HouseholdMembership,
+            [
+                HouseholdMembership(user=user, household=household)
+                for household, group in zip(households, users_by_household)
+                for user in group
+            ],
+        )
+
+        recipe_rows = []
+        for group in users_by_household:
+            for _ in range(recipes):
+                title = " ".join(
+                    [rng.choice(ADJECTIVES), rng.choice(MAINS), rng.choice(DISHES)]
+                )
+                steps = [
+                    f"{rng.choice(STEP_VERBS)} the {rng.choice(INGREDIENTS)[0]}."
+                    for _ in range(rng.randint(3, 8))
+                ]
+                recipe_rows.append(
+                    Recipe(
+                        user=rng.choice(group),
+                        title=title,
+                        description=f"A {title.lower()} for busy weeknights.",
+                        steps="\n".join(steps),
+                        prep_time=rng.choice([5, 10, 15, 20, 30]),
+                        cook_time=rng.choice([10, 20, 30, 45, 60, 90]),
+                        servings=rng.choice([2, 4, 6]),
+                        difficulty=rng.choice(["easy", "medium", "hard"]),
+                        source=rng.choice(["manual", "ai", "url", "family"]),
+                        shared=rng.random() < 0.7,
+                    )
+                )
+        created_recipes = self._bulk_create(Recipe, recipe_rows)
+
+        lines = []
+        tag_links = []
+        Tagging = Recipe.tags.through
+        for recipe in created_recipes:
+            picks = rng.sample(
+                self.ingredients,
+                min(self.ingredients_per_recipe, len(self.ingredients)),
+            )
+            for order, ingredient in enumerate(picks):
+                lines.append(
+                    RecipeIngredient(
+                        recipe=recipe,
+                        ingredient=ingredient,
+                        quantity=Decimal(rng.choice([1, 2, 3, 4, 100, 200, 400])),
+                        unit=rng.choice(UNITS),
+                        order=order,
+                    )
+                )
+            for tag in rng.sample(self.tags, rng.randint(1, 3)):
+                tag_links.append(Tagging(recipe_id=recipe.pk, tag_id=tag.pk))
+        self._bulk_create(RecipeIngredient, lines)
+        self._bulk_create(Tagging, tag_links)
+
+        notes = []
+        recipes_by_household = [
+            created_recipes[i * recipes : (i + 1) * recipes] for i in range(count)
+        ]
+        for group, household_recipes in zip(users_by_household, recipes_by_household):
+            for recipe in household_recipes:
+                for _ in range(rng.randint(0, self.notes_per_recipe * 2)):
+                    notes.append(
+                        CookingNote(
+                            recipe=recipe,
+                            user=rng.choice(group),
+                            cooked_date=self.today
+                            - timedelta(days=rng.randint(1, 365)),
+                            rating=rng.choice([None, 3, 4, 4, 5, 5]),
+                            would_make_again=rng.random() < 0.85,
+                        )
+                    )
+        self._bulk_create(CookingNote, notes)
+
+        plans = []
+        templates = []
+        items = []
+        first_day = self.today - timedelta(days=self.plan_days // 2)
+        for household, group, household_recipes in zip(
+            households, users_by_household, recipes_by_household
+        ):
+            if not household_recipes:
+                continue
+            for day in range(self.plan_days):
+                for meal_type in ["dinner"] + (["lunch"] if rng.random() < 0.3 else []):
+                    plans.append(
+                        MealPlan(
+                            household=household,
+                            added_by=rng.choice(group),
+                            date=first_day + timedelta(days=day),
+                            meal_type=meal_type,
+                            recipe=rng.choice(household_recipes),
+                        )
+                    )
+            templates.append(
+                MealPlanTemplate(
+                    household=household, name="Usual week", created_by=group[0]
+                )
+            )
+            for _ in range(self.shopping_items):
+                name, category = rng.choice(INGREDIENTS)
+                items.append(
+                    ShoppingListItem(
+                        household=household,
+                        added_by=rng.choice(group),
+                        name=name,
+                        quantity=f"{rng.randint(1, 5)}",
+                        category=category,
+                        is_generated=rng.random() < 0.5,
+                        checked=rng.random() < 0.3,
+                    )
+                )
+        self._bulk_create(MealPlan, plans)
+        self._bulk_create(ShoppingListItem, items)
+
+        entries = []
+        created_templates = self._bulk_create(MealPlanTemplate, templates)
+        for template, household_recipes in zip(
+            created_templates, [r for r in recipes_by_household if r]
+        ):
+            for day in range(7):
+                entries.append(
+                    MealPlanTemplateEntry(
+                        template=template,
+                        day_of_week=day,
+                        meal_type="dinner",
+                        recipe=rng.choice(household_recipes),
+                    )
+                )
+        self._bulk_create(MealPlanTemplateEntry, entries)
+
+        recipe_ids = [recipe.pk for recipe in created_recipes]
+        for i in range(0, len(recipe_ids), self.batch_size):
+            refresh_search_documents(recipe_ids[i : i + self.batch_size])
+            refresh_household_recipes(recipe_ids[i : i + self.batch_size])
+        # bulk_create skips the signal that gives new households fresh versions
+        household_ids = [household.pk for household in households]
+        invalidate_fragments(household_ids)
+        invalidate_shopping(household_ids)
+        return households
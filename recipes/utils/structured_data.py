@@ -0,0 +1,405 @@
+"""Extract schema.org Recipe markup (JSON-LD or microdata) from web pages.
+
+Most recipe sites embed their recipe as structured data for search engines.
+extract_recipe() maps it to the same dict shape the AI import returns, so
+URL import only needs the LLM for pages without markup.
+"""
+
+import html
+import json
+import re
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from .units import normalize_unit
+
+UNICODE_FRACTIONS = {
+    "½": 0.5,
+    "⅓": 1 / 3,
+    "⅔": 2 / 3,
+    "¼": 0.25,
+    "¾": 0.75,
+    "⅕": 0.2,
+    "⅛": 0.125,
+    "⅜": 0.375,
+    "⅝": 0.625,
+    "⅞": 0.875,
+}
+
+DURATION_RE = re.compile(
+    r"^P(?:(?P<days>\d+(?:\.\d+)?)D)?"
+    r"(?:T(?:(?P<hours>\d+(?:\.\d+)?)H)?(?:(?P<minutes>\d+(?:\.\d+)?)M)?"
+    r"(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$",
+    re.IGNORECASE,
+)
+NUMBER_RE = re.compile(r"^(\d+(?:[.,]\d+)?)?([½⅓⅔¼¾⅕⅛⅜⅝⅞])?$")
+FRACTION_RE = re.compile(r"^(\d+)/(\d+)$")
+RANGE_RE = re.compile(r"^([^-–]+)[-–].+$")
+GLUED_UNIT_RE = re.compile(r"^(\d+(?:[.,]\d+)?)([a-zA-Z]+)$")
+
+# Elements whose text ends a line when collecting microdata values
+BLOCK_TAGS = {"br", "p", "li", "div", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+# Elements whose value is an attribute rather than their text
+VALUE_ATTRS = {"meta": "content", "time": "datetime", "data": "value"}
+VOID_TAGS = {"meta", "link", "img", "br", "hr", "input", "source"}
+# Elements whose text isn't part of the page's readable content
+SKIPPED_TAGS = {"script", "style", "nav", "footer", "header", "aside"}
+
+
+def parse_duration(value) -> Optional[int]:
+    """Convert an ISO 8601 duration ("PT1H30M") or a number to whole minutes."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = DURATION_RE.match(str(value).strip())
+    if not match or not any(match.groupdict().values()):
+        return None
+    parts = {k: float(v) for k, v in match.groupdict().items() if v}
+    minutes = (
+        parts.get("days", 0) * 1440
+        + parts.get("hours", 0) * 60
+        + parts.get("minutes", 0)
+        + parts.get("seconds", 0) / 60
+    )
+    return round(minutes) or None
+
+
+def parse_yield(value) -> Optional[int]:
+    """Return the first number in a recipeYield ("4 servings", ["6", "6 pies"])."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, (int, float)):
+        return int(value) or None
+    match = re.search(r"\d+", str(value or ""))
+    return int(match.group()) if match else None
+
+
+def _parse_number(token: str) -> Optional[float]:
+    """Parse "2", "1.5", "1/2", "½" or "1½"; None if the token isn't a number."""
+    token = token.replace(",", ".")
+    fraction = FRACTION_RE.match(token)
+    if fraction:
+        denominator = int(fraction.group(2))
+        return int(fraction.group(1)) / denominator if denominator else None
+    number = NUMBER_RE.match(token)
+    if not number or not any(number.groups()):
+        return None
+    whole, glyph = number.groups()
+    return float(whole or 0) + UNICODE_FRACTIONS.get(glyph, 0)
+
+
+def parse_ingredient_line(line: str) -> dict:
+    """
+    Split a free-text ingredient line into the structured ingredient shape.
+
+    "2 1/2 cups plain flour, sifted" becomes quantity 2.5, unit "cup",
+    name "plain flour" and preparation_notes "sifted". Ranges ("2-3") use
+    the lower bound; parentheticals move to the notes.
+    """
+    text = " ".join(html.unescape(line).split())
+    for glyph in UNICODE_FRACTIONS:
+        # "1½" and "1 ½" both read as one quantity token
+        text = re.sub(rf"(\d)\s*{glyph}", rf"\1{glyph}", text)
+    notes = []
+    text = re.sub(r"\(([^)]*)\)", lambda m: notes.append(m.group(1)) or " ", text)
+    tokens = text.split()
+    glued = GLUED_UNIT_RE.match(tokens[0]) if tokens else None
+    if glued and normalize_unit(glued.group(2)):
+        # "400g" -> "400", "g"
+        tokens[:1] = glued.groups()
+
+    quantity = None
+    while tokens:
+        token = tokens[0]
+        ranged = RANGE_RE.match(token)
+        number = _parse_number(ranged.group(1) if ranged else token)
+        if number is None:
+            break
+        quantity = number if quantity is None else quantity + number
+        tokens.pop(0)
+        if ranged or quantity != int(quantity):
+            break
+    if tokens and quantity is not None and tokens[0].lower() in ("-", "–", "to"):
+        # "2 - 3 cloves": skip the upper bound of the range
+        tokens = tokens[2:] if len(tokens) > 1 else []
+
+    unit = ""
+    if quantity is not None and tokens:
+        unit = normalize_unit(tokens[0].rstrip(".,"))
+        if unit:
+            tokens.pop(0)
+
+    rest = " ".join(tokens)
+    if rest.lower().startswith("of "):
+        rest = rest[3:]
+    name, _, note = rest.partition(",")
+    if note.strip():
+        notes.insert(0, note.strip())
+
+    if quantity is not None and quantity == int(quantity):
+        quantity = int(quantity)
+    return {
+        "name": name.strip().lower()[:100],
+        "quantity": round(quantity, 3) if isinstance(quantity, float) else quantity,
+        "unit": unit,
+        "category": "other",
+        "preparation_notes": ", ".join(n.strip() for n in notes if n.strip())[:100],
+    }
+
+
+def _text(value) -> str:
+    if isinstance(value, list):
+        value = " ".join(_text(v) for v in value)
+    elif isinstance(value, dict):
+        value = value.get("text") or value.get("name") or ""
+    text = " ".join(html.unescape(re.sub(r"<[^>]+>", " ", str(value or ""))).split())
+    # Tags replaced by spaces can leave "word ." behind
+    return re.sub(r" ([.,;:!?])", r"\1", text)
+
+
+def _instruction_steps(value) -> List[str]:
+    """Flatten recipeInstructions (text, HowToStep list or HowToSections) to steps."""
+    if isinstance(value, str):
+        lines = re.split(r"\n+|<br\s*/?>|</p>|</li>", value)
+        return [step for step in (_text(line) for line in lines) if step]
+    if isinstance(value, dict):
+        if "itemListElement" in value:
+            return _instruction_steps(value["itemListElement"])
+        step = _text(value)
+        return [step] if step else []
+    if isinstance(value, list):
+        return [step for item in value for step in _instruction_steps(item)]
+    return []
+
+
+def _is_recipe(node) -> bool:
+    node_type = node.get("@type", "")
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return any(str(t).rsplit("/", 1)[-1] == "Recipe" for t in types)
+
+
+def _find_recipe_node(data):
+    """Depth-first search of a JSON-LD document for a Recipe object."""
+    if isinstance(data, list):
+        for item in data:
+            found = _find_recipe_node(item)
+            if found:
+                return found
+    elif isinstance(data, dict):
+        if _is_recipe(data):
+            return data
+        for key in ("@graph", "mainEntity", "mainEntityOfPage"):
+            found = _find_recipe_node(data.get(key))
+            if found:
+                return found
+    return None
+
+
+def recipe_from_schema(node: dict) -> Optional[dict]:
+    """Map a schema.org Recipe object to the import dict, or None if it's empty."""
+    ingredients = node.get("recipeIngredient") or node.get("ingredients") or []
+    if isinstance(ingredients, str):
+        ingredients = [ingredients]
+    parsed = [parse_ingredient_line(_text(line)) for line in ingredients]
+    steps = _instruction_steps(node.get("recipeInstructions"))
+    title = _text(node.get("name"))
+    if not title or not (parsed or steps):
+        return None
+
+    prep_time = parse_duration(node.get("prepTime"))
+    cook_time = parse_duration(node.get("cookTime"))
+    if cook_time is None and node.get("totalTime"):
+        total = parse_duration(node.get("totalTime"))
+        cook_time = max(total - (prep_time or 0), 0) if total else None
+    return {
+        "title": title[:200],
+        "description": _text(node.get("description")),
+        "prep_time": prep_time,
+        "cook_time": cook_time or None,
+        "servings": parse_yield(node.get("recipeYield")) or 4,
+        "difficulty": "medium",
+        "ingredients": [i for i in parsed if i["name"]],
+        "steps": steps,
+    }
+
+
+class RecipeMarkupParser(HTMLParser):
+    """Collect JSON-LD blocks and schema.org/Recipe microdata properties in one pass."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld_recipe = None
+        self.microdata = {}
+        self._json_ld_buffer = None
+        self._recipe_depth = None
+        self._depth = 0
+        # Open itemprop elements: [name, depth, text parts]
+        self._props = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script":
+            if (attrs.get("type") or "").lower().strip() == "application/ld+json":
+                self._json_ld_buffer = []
+            return
+        if tag in BLOCK_TAGS:
+            for prop in self._props:
+                prop[2].append("\n")
+        if tag in VOID_TAGS:
+            self._void_prop(tag, attrs)
+            return
+
+        self._depth += 1
+        itemtype = attrs.get("itemtype") or ""
+        if (
+            self._recipe_depth is None
+            and "itemscope" in attrs
+            and itemtype.rstrip("/").rsplit("/", 1)[-1] == "Recipe"
+        ):
+            self._recipe_depth = self._depth
+        elif self._recipe_depth is not None and attrs.get("itemprop"):
+            value_attr = VALUE_ATTRS.get(tag)
+            if value_attr and attrs.get(value_attr):
+                self._add(attrs["itemprop"], attrs[value_attr])
+            else:
+                self._props.append([attrs["itemprop"], self._depth, []])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and tag != "script":
+            self.handle_endtag(tag)
+
+    def _void_prop(self, tag, attrs):
+        if self._recipe_depth is not None and attrs.get("itemprop"):
+            value = attrs.get(VALUE_ATTRS.get(tag, "content")) or attrs.get("content")
+            if value:
+                self._add(attrs["itemprop"], value)
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            if self._json_ld_buffer is not None:
+                self._parse_json_ld("".join(self._json_ld_buffer))
+                self._json_ld_buffer = None
+            return
+        if tag in VOID_TAGS:
+            return
+        while self._props and self._props[-1][1] >= self._depth:
+            name, _, parts = self._props.pop()
+            self._add(name, "".join(parts))
+        if self._recipe_depth is not None and self._depth <= self._recipe_depth:
+            self._recipe_depth = None
+        self._depth = max(0, self._depth - 1)
+
+    def handle_data(self, data):
+        if self._json_ld_buffer is not None:
+            self._json_ld_buffer.append(data)
+        for prop in self._props:
+            prop[2].append(data)
+
+    def close(self):
+        super().close()
+        while self._props:
+            name, _, parts = self._props.pop()
+            self._add(name, "".join(parts))
+
+    def _parse_json_ld(self, block):
+        if self.json_ld_recipe is not None:
+            return
+        try:
+            data = json.loads(block, strict=False)
+        except json.JSONDecodeError:
+            return
+        self.json_ld_recipe = _find_recipe_node(data)
+
+    def _add(self, names, value):
+        for name in names.split():
+            self.microdata.setdefault(name, []).append(value.strip())
+
+    def recipe(self) -> Optional[dict]:
+        """The page's recipe in the import dict shape, or None."""
+        node = self.recipe_node()
+        return recipe_from_schema(node) if node else None
+
+    def recipe_node(self) -> Optional[dict]:
+        """The first JSON-LD Recipe found, else one built from the microdata."""
+        if self.json_ld_recipe is not None:
+            return self.json_ld_recipe
+        if not self.microdata:
+            return None
+        values = self.microdata
+        first = {k: v[0] for k, v in values.items()}
+        steps = values.get("recipeInstructions") or values.get("text") or []
+        return {
+            "@type": "Recipe",
+            "name": first.get("name"),
+            "description": first.get("description"),
+            "prepTime": first.get("prepTime"),
+            "cookTime": first.get("cookTime"),
+            "totalTime": first.get("totalTime"),
+            "recipeYield": first.get("recipeYield"),
+            "recipeIngredient": values.get("recipeIngredient")
+            or values.get("ingredients")
+            or [],
+            "recipeInstructions": "\n".join(steps),
+        }
+
+
+class RecipePageParser(RecipeMarkupParser):
+    """RecipeMarkupParser that also collects the page's visible text.
+
+    Text inside SKIPPED_TAGS is ignored and collection stops at max_text
+    characters, so a page can be fed in streamed chunks and parsed once for
+    both its markup and the text sent to the AI fallback.
+    """
+
+    def __init__(self, max_text: int = 5000):
+        super().__init__()
+        self.max_text = max_text
+        self._text_parts = []
+        self._text_length = 0
+        self._skip_depth = 0
+
+    @property
+    def text_full(self) -> bool:
+        return self._text_length >= self.max_text
+
+    @property
+    def text(self) -> str:
+        return " ".join("".join(self._text_parts).split())[: self.max_text]
+
+    def handle_starttag(self, tag, attrs):
+        super().handle_starttag(tag, attrs)
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        if not self.text_full:
+            self._text_parts.append(" ")
+
+    def handle_endtag(self, tag):
+        super().handle_endtag(tag)
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        if not self.text_full:
+            self._text_parts.append(" ")
+
+    def handle_data(self, data):
+        # Text can arrive split across fed chunks, so parts are joined as-is
+        # and tag boundaries add the spaces
+        super().handle_data(data)
+        if self._skip_depth or self.text_full:
+            return
+        self._text_parts.append(data)
+        self._text_length += len(" ".join(data.split())) + 1
+
+
+def extract_recipe(page: str) -> Optional[dict]:
+    """
+    Return the page's schema.org Recipe in the import dict shape.
+
+    JSON-LD is preferred over microdata. Returns None when the page has no
+    usable recipe markup, so the caller can fall back to the AI parser.
+    """
+    parser = RecipeMarkupParser()
+    parser.feed(page)
+    parser.close()
+    return parser.recipe()
@@ -0,0 +1,126 @@
+"""Per-request phase timers for the Server-Timing header.
+
+A RequestTimer is active for the duration of one request (see
+ServerTimingMiddleware). Code that talks to something slow wraps the call
+in timed("<phase>"); the time is added to the active timer, or ignored
+outside a request, so background jobs and commands pay almost nothing.
+
+Phases may overlap: a lazy queryset evaluated while rendering counts
+towards both "template" and "db".
+"""
+
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as DjangoTemplate
+
+_current: ContextVar[Optional["RequestTimer"]] = ContextVar(
+    "request_timer", default=None
+)
+
+# Phase -> description shown in browser dev tools
+PHASES = {
+    "db": "Database",
+    "template": "Template rendering",
+    "household": "Household lookup",
+    "ai": "Anthropic API",
+    "http-out": "Outbound HTTP",
+}
+
+
+class RequestTimer:
+    """Accumulates the time one request spends in each phase.
+
+    Use as a context manager: while active, timed() calls on this thread
+    (or context) add to it and every database query counts towards "db".
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.total_ms = 0.0
+        self._open: Dict[str, int] = {}
+        self._start = None
+        self._stack = None
+        self._token = None
+
+    def __enter__(self) -> "RequestTimer":
+        self._token = _current.set(self)
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(
+                connections[alias].execute_wrapper(self._time_query)
+            )
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        self._stack.close()
+        _current.reset(self._token)
+
+    def _time_query(self, execute, sql, params, many, context):
+        with self.phase("db"):
+            return execute(sql, params, many, context)
+
+    @contextmanager
+    def phase(self, name: str):
+        # Only the outermost of nested same-phase blocks is counted
+        depth = self._open.get(name, 0)
+        self._open[name] = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._open[name] = depth
+            if not depth:
+                elapsed = (time.perf_counter() - start) * 1000
+                self.durations[name] = self.durations.get(name, 0.0) + elapsed
+                self.counts[name] = self.counts.get(name, 0) + 1
+
+    def header(self) -> str:
+        """Return the Server-Timing header value for the phases recorded."""
+        metrics = []
+        for name, duration in self.durations.items():
+            desc = PHASES.get(name, name)
+            if self.counts[name] > 1:
+                desc = f"{desc} ({self.counts[name]})"
+            metrics.append(f'{name};dur={duration:.1f};desc="{desc}"')
+        metrics.append(f'total;dur={self.total_ms:.1f};desc="Total"')
+        return ", ".join(metrics)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    """Return the timer of the request being handled, if any."""
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str):
+    """Count the time spent in the block towards a phase of the current request."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    with timer.phase(phase):
+        yield
+
+
+class TimedTemplate(DjangoTemplate):
+    def render(self, context=None, request=None):
+        with timed("template"):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with rendering counted as "template" time."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
@@ -1,6 +1,7 @@
 from .auth import offline_view, register_view
 from .cook import cook_done, cook_step, cook_view
-from .generate import generate_next, generate_preferences, generate_progress
+from .generate import generate_preferences, generate_progress, generate_status
+from .jobs import job_status
 from .legacy import (
     ai_generate_recipe,
     ai_surprise_me,
@@ -16,6 +17,7 @@ from .legacy import (
     smart_meal_planner,
     terms,
 )
+from .metrics import metrics_view
 from .push import push_subscribe, push_unsubscribe, vapid_public_key
 from .recipes import (
     ai_generate_recipe_api,
@@ -51,6 +53,8 @@ __all__ = [
     # Auth
     "offline_view",
     "register_view",
+    # Metrics
+    "metrics_view",
     # Push notifications
     "push_subscribe",
     "push_unsubscribe",
@@ -60,9 +64,11 @@ __all__ = [
     "cook_step",
     "cook_view",
     # Generate
-    "generate_next",
     "generate_preferences",
     "generate_progress",
+    "generate_status",
+    # Jobs
+    "job_status",
     # Legacy
     "ai_generate_recipe",
     "ai_surprise_me",
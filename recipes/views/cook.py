@@ -1,12 +1,10 @@
 from django.contrib import messages as django_messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
 from ..models import CookingNote, Recipe
-from ..models.household import get_household
 
 
 def _parse_cooking_steps(recipe):
@@ -51,14 +49,9 @@ def _parse_cooking_steps(recipe):
 @login_required
 def cook_view(request, pk):
     """Full-page cooking mode for a recipe."""
-    household = get_household(request.user)
-    access_filter = Q(user=request.user)
-    if household:
-        access_filter |= Q(shared=True, user__household_membership__household=household)
-        access_filter |= Q(mealplan__household=household)
+    household = request.household
     recipe = get_object_or_404(
-        Recipe.objects.filter(access_filter)
-        .distinct()
+        Recipe.objects.visible_to(request.user, household, include_planned=True)
         .select_related("user")
         .prefetch_related(
             "recipe_ingredients__ingredient",
@@ -0,0 +1,22 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+
+from ..models import Job
+
+
+@login_required
+def job_status(request, pk):
+    """JSON: poll a background job's status and, once finished, its result."""
+    job = get_object_or_404(Job, pk=pk, user=request.user)
+    return JsonResponse(
+        {
+            "job_id": job.pk,
+            "kind": job.kind,
+            "status": job.status,
+            "finished": job.is_finished,
+            "attempts": job.attempts,
+            "result": job.result if job.status == "succeeded" else None,
+            "error": job.error if job.status == "failed" else "",
+        }
+    )
@@ -0,0 +1,26 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.cache import never_cache
+
+from ..utils import metrics
+
+
+@never_cache
+def metrics_view(request):
+    """Prometheus scrape target: every process's metrics, in text format.
+
+    Not found while METRICS_DB is unset. With METRICS_TOKEN set, scrapers
+    must send it as a bearer token.
+    """
+    if not metrics.store.enabled():
+        raise Http404
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse("Unauthorized", status=401)
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,25 +1,21 @@
 import json
 import logging
-from decimal import Decimal, InvalidOperation
 
 import requests as http_requests
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import F, Max, Q
+from django.db.models import F
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 
-from ..models import (
-    UNIT_CHOICES,
-    Ingredient,
-    Recipe,
-    RecipeIngredient,
-    Tag,
-)
-from ..models.household import get_household
+from ..models import UNIT_CHOICES, Recipe, Tag
 from ..services.ai_service import AIService, AIServiceException
-from ..utils.units import normalize_unit
+from ..services.ingredient_service import IngredientService
+from ..services.job_service import JobService
+from ..utils.conditional import conditional_page, page_etag
+from ..utils.timing import timed
 
 logger = logging.getLogger(__name__)
 
@@ -27,17 +23,18 @@ logger = logging.getLogger(__name__)
 def _get_sorted_recipes(queryset, sort, user):
     """Apply sort ordering to a recipe queryset.
 
-    Expects queryset to already have avg_rating and note_count annotations
-    from with_stats().
+    Expects queryset to already have avg_rating, note_count and last_cooked
+    annotations from with_stats(), and search_rank from search() when sorting
+    by relevance.
     """
-    if sort == "rating":
+    if sort == "relevance" and "search_rank" in queryset.query.annotations:
+        return queryset.order_by("-search_rank", "-created_at")
+    elif sort == "rating":
         return queryset.order_by(F("avg_rating").desc(nulls_last=True), "-created_at")
     elif sort == "times_cooked":
         return queryset.order_by(F("note_count").desc(), "-created_at")
     elif sort == "recently_cooked":
-        return queryset.annotate(
-            last_cooked=Max("cooking_notes__cooked_date")
-        ).order_by(F("last_cooked").desc(nulls_last=True), "-created_at")
+        return queryset.order_by(F("last_cooked").desc(nulls_last=True), "-created_at")
     else:  # 'newest' or default
         return queryset.order_by("-created_at")
 
@@ -45,20 +42,14 @@ def _get_sorted_recipes(queryset, sort, user):
 @login_required
 def recipe_list_view(request):
     """Recipe Collection -- full page view with search, filter, sort."""
-    household = get_household(request.user)
+    household = request.household
     recipes = (
-        Recipe.objects.filter(
-            Q(user=request.user)
-            | Q(shared=True, user__household_membership__household=household)
-        )
-        .distinct()
-        .with_related()
-        .with_stats()
+        Recipe.objects.visible_to(request.user, household).with_related().with_stats()
     )
 
     query = request.GET.get("q", "").strip()
     tag_id = request.GET.get("tag", "")
-    sort = request.GET.get("sort", "newest")
+    sort = request.GET.get("sort") or ("relevance" if query else "newest")
     favourites_only = request.GET.get("favourites") == "1"
 
     if query:
@@ -96,20 +87,14 @@ def recipe_list_view(request):
 @login_required
 def recipe_search(request):
     """HTMX partial -- returns filtered recipe cards without page wrapper."""
-    household = get_household(request.user)
+    household = request.household
     recipes = (
-        Recipe.objects.filter(
-            Q(user=request.user)
-            | Q(shared=True, user__household_membership__household=household)
-        )
-        .distinct()
-        .with_related()
-        .with_stats()
+        Recipe.objects.visible_to(request.user, household).with_related().with_stats()
     )
 
     query = request.GET.get("q", "").strip()
     tag_id = request.GET.get("tag", "")
-    sort = request.GET.get("sort", "newest")
+    sort = request.GET.get("sort") or ("relevance" if query else "newest")
     favourites_only = request.GET.get("favourites") == "1"
 
     if query:
@@ -142,6 +127,7 @@ def recipe_search(request):
 
 
 @login_required
+@conditional_page(page_etag)
 def recipe_detail_view(request, pk):
     """Recipe Detail -- full page view with ingredients, steps, notes.
 
@@ -150,15 +136,10 @@ def recipe_detail_view(request, pk):
     - Recipe is shared and user is in the same household, OR
     - Recipe is assigned to the user's household meal plan
     """
-    household = get_household(request.user)
-    access_filter = Q(user=request.user)
-    if household:
-        access_filter |= Q(shared=True, user__household_membership__household=household)
-        access_filter |= Q(mealplan__household=household)
+    household = request.household
     recipe = get_object_or_404(
-        Recipe.objects.filter(access_filter)
-        .distinct()
-        .select_related("user")
+        Recipe.objects.visible_to(request.user, household, include_planned=True)
+        .select_related("user", "stats")
         .prefetch_related(
             "tags",
             "favourited_by",
@@ -185,31 +166,19 @@ def recipe_detail_view(request, pk):
 
 def _process_structured_ingredients(request, recipe):
     """Process dynamically named ingredient fields from the form POST."""
-    # Clear existing structured ingredients
-    recipe.recipe_ingredients.all().delete()
-
     count = int(request.POST.get("ingredient_count", 0))
-    for i in range(count):
-        name = request.POST.get(f"ing_name_{i}", "").strip()
-        if not name:
-            continue
-        ingredient, _ = Ingredient.objects.get_or_create(
-            name=name.lower(),
-            defaults={"category": "other"},
-        )
-        qty = request.POST.get(f"ing_qty_{i}", "").strip()
-        try:
-            quantity = Decimal(qty) if qty else None
-        except (InvalidOperation, ValueError):
-            quantity = None
-        RecipeIngredient.objects.create(
-            recipe=recipe,
-            ingredient=ingredient,
-            quantity=quantity,
-            unit=normalize_unit(request.POST.get(f"ing_unit_{i}", "")),
-            preparation_notes=request.POST.get(f"ing_notes_{i}", "").strip(),
-            order=i,
-        )
+    IngredientService.save_recipe_ingredients(
+        recipe,
+        (
+            {
+                "name": request.POST.get(f"ing_name_{i}", ""),
+                "quantity": request.POST.get(f"ing_qty_{i}", ""),
+                "unit": request.POST.get(f"ing_unit_{i}", ""),
+                "preparation_notes": request.POST.get(f"ing_notes_{i}", ""),
+            }
+            for i in range(count)
+        ),
+    )
 
 
 @login_required
@@ -382,7 +351,10 @@ def toggle_favourite_view(request, pk):
 
 @login_required
 def ai_generate_recipe_api(request):
-    """HTMX/JSON endpoint: generate a recipe from a prompt using AI."""
+    """JSON endpoint: queue AI generation of a recipe from a prompt.
+
+    Returns 202 with a status_url; the form polls it for the job's result.
+    """
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
 
@@ -393,15 +365,23 @@ def ai_generate_recipe_api(request):
         )
 
     try:
-        result = AIService.generate_structured_recipe(prompt)
-        return JsonResponse(result)
+        AIService.validate_api_key()
+        prompt = AIService.validate_prompt(prompt)
     except AIServiceException as e:
         return JsonResponse({"error": str(e)}, status=400)
 
+    job = JobService.enqueue(
+        "ai_generate_recipe", {"prompt": prompt}, user=request.user
+    )
+    return _job_accepted(job)
+
 
 @login_required
 def import_recipe_url(request):
-    """HTMX/JSON endpoint: import a recipe from a URL using AI."""
+    """JSON endpoint: queue import of a recipe from a URL using AI.
+
+    Returns 202 with a status_url; the form polls it for the job's result.
+    """
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
 
@@ -410,11 +390,26 @@ def import_recipe_url(request):
         return JsonResponse({"error": "Please provide a URL."}, status=400)
 
     try:
-        result = AIService.import_recipe_from_url(url)
-        return JsonResponse(result)
+        # No API key check: pages with recipe markup import without the AI
+        url = AIService.validate_url(url)
     except AIServiceException as e:
         return JsonResponse({"error": str(e)}, status=400)
 
+    job = JobService.enqueue("import_recipe_url", {"url": url}, user=request.user)
+    return _job_accepted(job)
+
+
+def _job_accepted(job):
+    """202 response pointing the client at the job's status endpoint."""
+    return JsonResponse(
+        {
+            "job_id": job.pk,
+            "status": job.status,
+            "status_url": reverse("job_status", args=[job.pk]),
+        },
+        status=202,
+    )
+
 
 @login_required
 def image_search(request, pk):
@@ -435,16 +430,17 @@ def image_search(request, pk):
         )
 
     try:
-        resp = http_requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={
-                "query": f"{query} food",
-                "per_page": 8,
-                "orientation": "landscape",
-            },
-            headers={"Authorization": f"Client-ID {access_key}"},
-            timeout=10,
-        )
+        with timed("http-out"):
+            resp = http_requests.get(
+                "https://api.unsplash.com/search/photos",
+                params={
+                    "query": f"{query} food",
+                    "per_page": 8,
+                    "orientation": "landscape",
+                },
+                headers={"Authorization": f"Client-ID {access_key}"},
+                timeout=10,
+            )
         resp.raise_for_status()
         data = resp.json()
         photos = [
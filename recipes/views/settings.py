@@ -4,7 +4,7 @@ from django.shortcuts import redirect, render
 
 from ..forms import MealPlannerPreferencesForm
 from ..models import MealPlannerPreferences
-from ..models.household import generate_household_code, get_household
+from ..models.household import generate_household_code
 from ..models.template import MealPlanTemplate
 
 
@@ -12,7 +12,7 @@ from ..models.template import MealPlanTemplate
 def settings_view(request):
     """User settings and preferences."""
     prefs, _ = MealPlannerPreferences.objects.get_or_create(user=request.user)
-    household = get_household(request.user)
+    household = request.household
 
     if request.method == "POST":
         action = request.POST.get("action", "")
@@ -9,8 +9,9 @@ from django.views.decorators.http import require_POST
 
 from ..models import INGREDIENT_CATEGORY_CHOICES, MealPlan, ShoppingListItem
 from ..models.recipe import VALID_CATEGORIES
-from ..models.household import get_household
-from ..services import RecipeService
+from ..services import ShoppingListService
+from ..utils.conditional import conditional_page, page_etag
+from ..utils.fragments import shopping_version
 
 CATEGORY_ICONS = {
     "meat": "basket2-fill",
@@ -44,60 +45,22 @@ def _get_shop_date_range():
     return monday, next_sunday
 
 
-def _generate_shopping_items(household, user, meal_ids=None):
-    """Generate ShoppingListItem records from selected meals.
-
-    Args:
-        household: The household to generate for
-        user: The user triggering the generation
-        meal_ids: List of MealPlan IDs to include. If None, includes today and future meals.
-    """
-    if meal_ids is not None:
-        meals = MealPlan.objects.filter(
-            household=household,
-            pk__in=meal_ids,
-        ).select_related("recipe")
-    else:
-        # Default: today through end of next week
-        shop_start, shop_end = _get_shop_date_range()
-        meals = MealPlan.objects.filter(
-            household=household,
-            date__range=[shop_start, shop_end],
-        ).select_related("recipe")
-
-    recipes = [m.recipe for m in meals]
-    if not recipes:
-        ShoppingListItem.objects.filter(household=household, is_generated=True).delete()
-        return
-
-    generated_items = RecipeService.generate_structured_shopping_list(recipes)
-
-    # Clear old generated items (keep manual ones)
-    ShoppingListItem.objects.filter(household=household, is_generated=True).delete()
-
-    for item in generated_items:
-        qty_parts = []
-        if item.get("total_quantity"):
-            qty_parts.append(f"{float(item['total_quantity']):g}")
-        if item.get("unit"):
-            qty_parts.append(item["unit"])
-        quantity_str = " ".join(qty_parts)
-
-        ShoppingListItem.objects.create(
-            household=household,
-            added_by=user,
-            name=item["ingredient_name"],
-            quantity=quantity_str,
-            category=item.get("category") or "other",
-            recipe_sources=", ".join(sorted(item.get("recipes", set()))),
-            is_generated=True,
-        )
+def _shop_etag(request):
+    household = getattr(request, "household", None)
+    if household is None:
+        return None
+    return page_etag(
+        request,
+        shopping=shopping_version(household.pk),
+        selection=request.session.get("shop_selected_meals"),
+    )
 
 
 @login_required
+@conditional_page(_shop_etag)
 def shop_view(request):
     """Full shopping list page."""
-    household = get_household(request.user)
+    household = request.household
     if not household:
         return render(request, "shop/shop.html", {"categories": [], "items": []})
 
@@ -108,7 +71,7 @@ def shop_view(request):
     # Check if we have a stored selection from a previous generate action
     selected_meal_ids = request.session.get("shop_selected_meals", None)
 
-    # Auto-generate from current meals (always regenerate to stay fresh)
+    # Auto-sync from current meals (a no-op when the plan hasn't changed)
     if selected_meal_ids is None:
         # No explicit selection — generate from all upcoming meals
         upcoming_meal_ids = list(
@@ -116,12 +79,9 @@ def shop_view(request):
                 household=household, date__range=[today, shop_end]
             ).values_list("pk", flat=True)
         )
-        if upcoming_meal_ids:
-            _generate_shopping_items(household, request.user, meal_ids=upcoming_meal_ids)
-        else:
-            ShoppingListItem.objects.filter(
-                household=household, is_generated=True
-            ).delete()
+        ShoppingListService.sync_generated_items(
+            household, request.user, meal_ids=upcoming_meal_ids
+        )
 
     # Get all items
     all_items = (
@@ -215,17 +175,16 @@ def shop_view(request):
 @require_POST
 def shop_generate(request):
     """Regenerate the shopping list from selected meals."""
-    household = get_household(request.user)
+    household = request.household
     if not household:
         return redirect("shop")
 
     meal_ids = request.POST.getlist("meals")
     selected_ids = [int(m) for m in meal_ids] if meal_ids else []
-    if selected_ids:
-        _generate_shopping_items(household, request.user, meal_ids=selected_ids)
-    else:
-        # No meals selected — clear generated items
-        ShoppingListItem.objects.filter(household=household, is_generated=True).delete()
+    # Explicit regenerate: always resync (no meals selected clears generated items)
+    ShoppingListService.sync_generated_items(
+        household, request.user, meal_ids=selected_ids, force=True
+    )
 
     # Store selected meal IDs in session so the page remembers the selection
     request.session["shop_selected_meals"] = selected_ids
@@ -238,7 +197,7 @@ def shop_generate(request):
 @require_POST
 def shop_toggle(request, pk):
     """Toggle a ShoppingListItem's checked state."""
-    household = get_household(request.user)
+    household = request.household
     item = get_object_or_404(ShoppingListItem, pk=pk, household=household)
     item.checked = not item.checked
     item.save()
@@ -263,7 +222,7 @@ def shop_toggle(request, pk):
 @require_POST
 def shop_update_qty(request, pk):
     """Update a ShoppingListItem's quantity."""
-    household = get_household(request.user)
+    household = request.household
     item = get_object_or_404(ShoppingListItem, pk=pk, household=household)
     quantity = request.POST.get("quantity", "").strip()
     item.quantity = quantity
@@ -275,7 +234,7 @@ def shop_update_qty(request, pk):
 @require_POST
 def shop_add(request):
     """Add a manual shopping list item."""
-    household = get_household(request.user)
+    household = request.household
     name = request.POST.get("name", "").strip()
     if name and household:
         item = ShoppingListItem.objects.create(
@@ -3,15 +3,16 @@ from datetime import date, timedelta
 
 from django.contrib import messages as django_messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
 from ..models import MealPlan, Recipe
-from ..models.household import DayComment, get_household
+from ..models.household import DayComment
 from ..models.template import MealPlanTemplate, MealPlanTemplateEntry
 from ..services.meal_planning_assistant import MealPlanningAssistantService
+from ..utils.conditional import conditional_page, page_etag
 
 
 def _get_week_dates(offset=0):
@@ -21,41 +22,78 @@ def _get_week_dates(offset=0):
     return [monday + timedelta(days=i) for i in range(7)]
 
 
-def _build_week_context(user, household, offset=0):
-    """Build template context for the weekly view."""
-    dates = _get_week_dates(offset)
-    start, end = dates[0], dates[-1]
+def _day_context(user, slot_date, meal_type, load_meal, load_comments):
+    """Build template context for one day card.
+
+    The meal and comments are only loaded when the card is rendered, so a
+    card served from the fragment cache costs no queries.
+    """
+    comments = SimpleLazyObject(load_comments)
+    return {
+        "date": slot_date,
+        "day_name": slot_date.strftime("%a"),
+        "day_num": slot_date.day,
+        "is_today": slot_date == timezone.localdate(),
+        "meal_type": meal_type,
+        "meal": SimpleLazyObject(load_meal),
+        "comments": comments,
+        "my_comment": SimpleLazyObject(
+            lambda: next((c.text for c in comments if c.user_id == user.pk), "")
+        ),
+    }
+
+
+def _slot_context(user, household, slot_date, meal_type="dinner"):
+    """Build template context for a single day card, e.g. after an HTMX swap."""
+
+    def load_meal():
+        return (
+            MealPlan.objects.with_related()
+            .for_household(household)
+            .filter(date=slot_date, meal_type=meal_type)
+            .first()
+        )
+
+    def load_comments():
+        return list(
+            DayComment.objects.filter(
+                household=household, date=slot_date
+            ).select_related("user")
+        )
+
+    return _day_context(user, slot_date, meal_type, load_meal, load_comments)
+
+
+def _load_week(household, start, end):
     meals = (
         MealPlan.objects.with_related()
         .for_household(household)
         .in_date_range(start, end)
     )
-    meal_lookup = {(m.date, m.meal_type): m for m in meals}
-
-    # Load DayComments for the week range
-    comments = DayComment.objects.filter(
+    comments = {}
+    for c in DayComment.objects.filter(
         household=household, date__range=[start, end]
-    ).select_related("user")
-    comment_lookup = {}
-    for c in comments:
-        comment_lookup.setdefault(c.date, []).append(c)
-
-    days = []
-    for d in dates:
-        meal = meal_lookup.get((d, "dinner"))
-        day_comments = comment_lookup.get(d, [])
-        my_comment_obj = next((c for c in day_comments if c.user == user), None)
-        days.append(
-            {
-                "date": d,
-                "day_name": d.strftime("%a"),
-                "day_num": d.day,
-                "is_today": d == timezone.localdate(),
-                "meal": meal,
-                "comments": day_comments,
-                "my_comment": my_comment_obj.text if my_comment_obj else "",
-            }
+    ).select_related("user"):
+        comments.setdefault(c.date, []).append(c)
+    return {"meals": {(m.date, m.meal_type): m for m in meals}, "comments": comments}
+
+
+def _build_week_context(user, household, offset=0):
+    """Build template context for the weekly view."""
+    dates = _get_week_dates(offset)
+    start, end = dates[0], dates[-1]
+    # Meals and comments for the whole week, loaded by the first uncached card
+    week = SimpleLazyObject(lambda: _load_week(household, start, end))
+    days = [
+        _day_context(
+            user,
+            d,
+            "dinner",
+            lambda d=d: week["meals"].get((d, "dinner")),
+            lambda d=d: week["comments"].get(d, []),
         )
+        for d in dates
+    ]
 
     return {
         "days": days,
@@ -66,9 +104,10 @@ def _build_week_context(user, household, offset=0):
 
 
 @login_required
+@conditional_page(page_etag)
 def week_view(request):
     """This Week -- full page weekly meal plan view."""
-    household = get_household(request.user)
+    household = request.household
     if not household:
         return render(
             request, "week/week.html", {"days": [], "error": "No household found."}
@@ -83,23 +122,8 @@ def week_slot(request, date_str, meal_type):
     """HTMX partial: return a single day card."""
     from datetime import datetime as dt
 
-    household = get_household(request.user)
     slot_date = dt.strptime(date_str, "%Y-%m-%d").date()
-
-    meal = (
-        MealPlan.objects.with_related()
-        .for_household(household)
-        .filter(date=slot_date, meal_type=meal_type)
-        .first()
-    )
-
-    day = {
-        "date": slot_date,
-        "day_name": slot_date.strftime("%a"),
-        "day_num": slot_date.day,
-        "is_today": slot_date == timezone.localdate(),
-        "meal": meal,
-    }
+    day = _slot_context(request.user, request.household, slot_date, meal_type)
     return render(request, "week/partials/meal_card.html", {"day": day})
 
 
@@ -108,7 +132,7 @@ def week_assign(request, date_str, meal_type):
     """HTMX partial: recipe picker (GET) or assign a recipe (POST)."""
     from datetime import datetime as dt
 
-    household = get_household(request.user)
+    household = request.household
     slot_date = dt.strptime(date_str, "%Y-%m-%d").date()
 
     if request.method == "POST":
@@ -122,31 +146,17 @@ def week_assign(request, date_str, meal_type):
             defaults={"recipe": recipe, "added_by": request.user},
         )
 
-        meal = (
-            MealPlan.objects.with_related()
-            .for_household(household)
-            .filter(date=slot_date, meal_type=meal_type)
-            .first()
-        )
-
-        day = {
-            "date": slot_date,
-            "day_name": slot_date.strftime("%a"),
-            "day_num": slot_date.day,
-            "is_today": slot_date == timezone.localdate(),
-            "meal": meal,
-        }
+        day = _slot_context(request.user, household, slot_date, meal_type)
         return render(request, "week/partials/meal_card.html", {"day": day})
 
     # GET -- show recipe picker (own recipes + shared household recipes)
     search_query = request.GET.get("q", "").strip()
-    recipes = Recipe.objects.filter(
-        Q(user=request.user)
-        | Q(shared=True, user__household_membership__household=household)
-    ).distinct()
+    recipes = Recipe.objects.visible_to(request.user, household)
     if search_query:
-        recipes = recipes.search(search_query)
-    recipes = recipes.order_by("title")
+        recipes = recipes.search(search_query).order_by("-search_rank", "title")
+    else:
+        recipes = recipes.order_by("title")
+    recipes = recipes.select_related("stats")
 
     return render(
         request,
@@ -164,7 +174,7 @@ def week_assign(request, date_str, meal_type):
 @login_required
 def week_suggest(request):
     """Suggest recipes for empty dinner slots in the current week."""
-    household = get_household(request.user)
+    household = request.household
     offset = int(request.GET.get("offset", 0))
     dates = _get_week_dates(offset)
     start, end = dates[0], dates[-1]
@@ -182,11 +192,8 @@ def week_suggest(request):
 
     # Get candidate recipes (own + shared household recipes)
     all_recipes = list(
-        Recipe.objects.filter(
-            Q(user=request.user)
-            | Q(shared=True, user__household_membership__household=household)
-        )
-        .distinct()
+        Recipe.objects.visible_to(request.user, household)
+        .select_related("stats")
         .prefetch_related("tags")
     )
     if not all_recipes:
@@ -219,14 +226,10 @@ def week_suggest(request):
         candidates = all_recipes
 
     # Score and rank candidates
-    scored = []
-    for recipe in candidates:
-        score = float(
-            MealPlanningAssistantService.calculate_recipe_happiness_score(
-                recipe, request.user
-            )
-        )
-        scored.append((recipe, score))
+    scores = MealPlanningAssistantService.calculate_recipe_happiness_scores(
+        candidates, request.user
+    )
+    scored = [(recipe, float(scores[recipe.id])) for recipe in candidates]
     scored.sort(key=lambda x: x[1], reverse=True)
 
     # Pick suggestions for each empty slot
@@ -272,7 +275,7 @@ def week_suggest(request):
 @login_required
 def week_accept_suggestion(request, date_str):
     """HTMX POST: accept a suggestion and assign the recipe to the slot."""
-    household = get_household(request.user)
+    household = request.household
     slot_date = date.fromisoformat(date_str)
     recipe_id = request.POST.get("recipe_id")
     recipe = get_object_or_404(Recipe, pk=recipe_id)
@@ -284,19 +287,7 @@ def week_accept_suggestion(request, date_str):
         defaults={"recipe": recipe, "added_by": request.user},
     )
 
-    meal = (
-        MealPlan.objects.with_related()
-        .for_household(household)
-        .filter(date=slot_date, meal_type="dinner")
-        .first()
-    )
-    day = {
-        "date": slot_date,
-        "day_name": slot_date.strftime("%a"),
-        "day_num": slot_date.day,
-        "is_today": slot_date == timezone.localdate(),
-        "meal": meal,
-    }
+    day = _slot_context(request.user, household, slot_date)
     return render(request, "week/partials/meal_card.html", {"day": day})
 
 
@@ -309,34 +300,20 @@ def week_skip_suggestion(request, date_str):
 @login_required
 def week_remove(request, date_str, meal_type):
     """HTMX POST: remove a meal from the planner (does not delete the recipe)."""
-    household = get_household(request.user)
+    household = request.household
     slot_date = date.fromisoformat(date_str)
     MealPlan.objects.filter(
         household=household, date=slot_date, meal_type=meal_type
     ).delete()
 
-    # Load comments for this day
-    comments = DayComment.objects.filter(
-        household=household, date=slot_date
-    ).select_related("user")
-    my_comment = next((c.text for c in comments if c.user == request.user), "")
-
-    day = {
-        "date": slot_date,
-        "day_name": slot_date.strftime("%a"),
-        "day_num": slot_date.day,
-        "is_today": slot_date == timezone.localdate(),
-        "meal": None,
-        "comments": list(comments),
-        "my_comment": my_comment,
-    }
+    day = _slot_context(request.user, household, slot_date, meal_type)
     return render(request, "week/partials/meal_card.html", {"day": day})
 
 
 @login_required
 def day_comment(request, date_str):
     """HTMX: add or update a day comment."""
-    household = get_household(request.user)
+    household = request.household
     comment_date = date.fromisoformat(date_str)
 
     if request.method == "POST":
@@ -371,7 +348,7 @@ def save_template(request):
     if request.method != "POST":
         return redirect("week")
 
-    household = get_household(request.user)
+    household = request.household
     name = request.POST.get("name", "").strip()
     offset = int(request.POST.get("offset", 0))
 
@@ -410,7 +387,7 @@ def save_template(request):
 @login_required
 def list_templates(request):
     """GET: HTMX partial showing template picker overlay."""
-    household = get_household(request.user)
+    household = request.household
     offset = request.GET.get("offset", 0)
     templates = MealPlanTemplate.objects.filter(household=household).prefetch_related(
         "entries__recipe"
@@ -429,7 +406,7 @@ def apply_template(request, pk):
     if request.method != "POST":
         return redirect("week")
 
-    household = get_household(request.user)
+    household = request.household
     template = get_object_or_404(MealPlanTemplate, pk=pk, household=household)
     offset = int(request.POST.get("offset", 0))
 
@@ -462,7 +439,7 @@ def delete_template(request, pk):
     if request.method != "POST":
         return redirect("settings")
 
-    household = get_household(request.user)
+    household = request.household
     template = get_object_or_404(MealPlanTemplate, pk=pk, household=household)
     template.delete()
     django_messages.success(request, "Template deleted.")